@@ -0,0 +1,90 @@
+"""
+Микробенчмарк DotDict: построение и обращение через атрибут в сравнении с прежней (жадной) реализацией
+- ленивое построение быстрее, теплое обращение через атрибут медленнее: регрессия выводится после результатов
+
+Запуск: python -m Benchmarks.DotDictBenchmark
+"""
+
+import json
+from os import path
+from timeit import repeat
+
+from Utils import LOCALES_PATH, PROJECT_PATH, read_file
+from Utils.DotDict import DotDict
+
+REPEAT = 5
+NUMBER = 10_000
+
+
+class EagerDotDict(dict):
+    """Прежняя реализация DotDict: полное копирование дерева при построении"""
+
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+    __delattr__ = dict.__delitem__
+
+    def __init__(self, ddict):
+        super().__init__()
+        for key, value in ddict.items():
+            if hasattr(value, 'keys'):
+                value = EagerDotDict(value)
+            self[key] = value
+
+
+def measure(statement, number: int = NUMBER) -> float:
+    """
+    Функция замера: лучшее время одного выполнения (мкс)
+    :param statement: callable: замеряемое действие
+    :param number: int: число выполнений в серии
+    :return: float: мкс
+    """
+    return min(repeat(statement, repeat=REPEAT, number=number)) / number * 1_000_000
+
+
+def main() -> dict:
+    """
+    Функция запуска сравнения на данных config.json и файла локализации
+    :return: dict: результаты (мкс на операцию)
+    """
+    config_data = read_file(path.join(PROJECT_PATH, 'Config', 'config.json'), 'json')
+    locale_data = read_file(path.join(LOCALES_PATH, 'ru', 'saymon_ru.yaml'), 'yaml')
+
+    eager, lazy = EagerDotDict(config_data), DotDict(config_data)
+    lazy_record = DotDict(config_data).freeze()
+    lazy.browser.selenoid.use_selenoid  # pylint: disable=pointless-statement
+
+    results = {
+        'construct_config': {
+            'eager': measure(lambda: EagerDotDict(config_data)),
+            'lazy': measure(lambda: DotDict(config_data)),
+        },
+        'construct_locale': {
+            'eager': measure(lambda: EagerDotDict(locale_data)),
+            'lazy': measure(lambda: DotDict(locale_data)),
+        },
+        'construct_and_read_one_key': {
+            'eager': measure(lambda: EagerDotDict(config_data).browser.selenoid.use_selenoid),
+            'lazy': measure(lambda: DotDict(config_data).browser.selenoid.use_selenoid),
+        },
+        'attribute_access': {
+            'eager': measure(lambda: eager.browser.selenoid.use_selenoid, NUMBER * 10),
+            'lazy': measure(lambda: lazy.browser.selenoid.use_selenoid, NUMBER * 10),
+            'frozen': measure(lambda: lazy_record.browser.selenoid.use_selenoid, NUMBER * 10),
+        },
+    }
+    print(
+        json.dumps(
+            {name: {key: round(value, 3) for key, value in row.items()} for name, row in results.items()}, indent=4
+        )
+    )
+    access = results['attribute_access']
+    print(
+        f"Регрессия: теплое обращение через атрибут медленнее прежней реализации"
+        f" в {access['lazy'] / access['eager']:.1f} раза (__getattr__ выполняется на Python);"
+        f" для частых обращений - DotDict.freeze() ({access['frozen']:.3f} мкс против {access['lazy']:.3f} мкс)"
+    )
+    return results
+
+
+if __name__ == '__main__':
+    main()
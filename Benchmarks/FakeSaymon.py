@@ -0,0 +1,247 @@
+"""
+Локальная подмена SAYMON UI для бенчмарков: страница авторизации и главная страница с верхним меню
+
+Разметка повторяет селекторы LoginScreen.SELECTORS, MainMenuToolbar.SELECTORS и PopupType.CREATE_OBJECT,
+тексты берутся из файлов локализации проекта (при пустом файле - английские).
+Задержка сервера и размер DOM настраиваются.
+Те же страницы регистрируются в модели DOM MockWebDriver (mock_saymon) для прогонов без браузера.
+"""
+
+import json
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from time import sleep
+from typing import Callable
+from urllib.parse import urlparse
+
+from Benchmarks.MockWebDriver import Document, MockWebDriver, Node
+from PageObject.PopUps.PopUp import PopupType
+from Utils import read_locale_file
+
+LANGUAGES = {'ru': 'русский', 'en': 'English', 'it': 'Italiano'}
+"""Языки интерфейса и их названия в переключателе языка"""
+LATENCY = 0.0
+"""Задержка ответа сервера и отрисовки в браузере (сек)"""
+DOM_SIZE = 200
+"""Число строк таблицы объектов на главной странице (объем DOM)"""
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>.hidden {{ display: none; }} .bounce {{ width: 10px; height: 10px; }}</style></head>
+<body>
+<div class="bounce"></div>
+<div class="modal-dialog">
+  <div class="modal-header"><button class="close">&times;</button><h4 class="modal-title"></h4></div>
+  <div class="alert hidden"><strong></strong></div>
+  <div class="lang">
+    <button class="dropdown-toggle"><span class="filter-option"><i class="flag"></i><span></span></span></button>
+    <ul class="lang-menu hidden">
+      <li><a class="flag-ru">русский</a></li>
+      <li><a class="flag-us">English</a></li>
+      <li><a class="flag-it">Italiano</a></li>
+    </ul>
+  </div>
+  <input id="user-login" type="text"><input id="user-password" type="password">
+  <button class="btn btn-primary js-submit"><span>OK</span></button>
+</div>
+{rows}
+<script>
+var TEXTS = {texts}, NAMES = {names}, LATENCY = {latency};
+function render(lang) {{
+  document.querySelector('.modal-title').textContent = TEXTS[lang].TEXT_TITLE_POPUP_LOGIN;
+  document.querySelector('.filter-option > span').textContent = NAMES[lang];
+  window.localStorage.setItem('lang', lang);
+}}
+render(window.localStorage.getItem('lang') || 'en');
+setTimeout(function () {{ document.querySelector('.bounce').remove(); }}, LATENCY * 1000);
+document.querySelector('.dropdown-toggle').onclick = function () {{
+  document.querySelector('.lang-menu').classList.toggle('hidden');
+}};
+[['flag-ru', 'ru'], ['flag-us', 'en'], ['flag-it', 'it']].forEach(function (item) {{
+  document.querySelector('.' + item[0]).onclick = function () {{
+    render(item[1]);
+    document.querySelector('.lang-menu').classList.add('hidden');
+  }};
+}});
+document.querySelector('.js-submit').onclick = function () {{
+  setTimeout(function () {{ window.location.href = '/main'; }}, LATENCY * 1000);
+}};
+</script>
+</body></html>
+"""
+"""Страница авторизации: параметры title, texts, names, latency, rows"""
+
+MAIN_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>.hidden {{ display: none; }}</style></head>
+<body>
+<div class="navbar">
+  <button id="js-create-object">+</button><button id="js-create-dropdown-toggle">&#9662;</button>
+  <div class="create-menu">
+    <span></span><span></span><span></span><span></span><span></span><span></span>
+    <ul class="dropdown-menu hidden"><li><a href="#">object</a></li></ul>
+  </div>
+  <div class="dropdown">
+    <button class="btn">admin</button>
+    <ul class="dropdown-menu hidden">
+      <li><a href="#">profile</a></li><li><a href="#">settings</a></li><li><a href="#">-</a></li>
+      <li><a href="#">-</a></li><li><a href="#">-</a></li><li><a href="/">exit</a></li>
+    </ul>
+  </div>
+</div>
+<div class="modal hidden">
+  <div class="{main_container}">
+    <div class="modal-header"><button class="close">&times;</button><h4 class="modal-title">{popup_name}</h4></div>
+    <div class="modal-body"><label>name</label><input class="form-control" type="text"></div>
+    <div class="modal-footer"><button class="btn js-submit">OK</button><button class="btn">Cancel</button></div>
+  </div>
+</div>
+{rows}
+<script>
+var LATENCY = {latency};
+function toggle(selector) {{ document.querySelector(selector).classList.toggle('hidden'); }}
+document.querySelector('.dropdown > button').onclick = function () {{ toggle('.dropdown > ul'); }};
+document.querySelector('#js-create-dropdown-toggle').onclick = function () {{ toggle('.create-menu > ul'); }};
+document.querySelector('#js-create-object').onclick = function () {{
+  setTimeout(function () {{ toggle('.modal'); }}, LATENCY * 1000);
+}};
+document.querySelectorAll('.modal .close, .modal-footer > .btn').forEach(function (el) {{
+  el.onclick = function () {{ document.querySelector('.modal').classList.add('hidden'); }};
+}});
+</script>
+</body></html>
+"""
+"""Главная страница: параметры title, main_container, popup_name, latency, rows"""
+
+
+def object_rows(count: int) -> str:
+    """
+    Функция формирования таблицы объектов заданного размера (нагрузка на DOM и page_source)
+    :param count: int: число строк
+    :return: str: html
+    """
+    rows = ''.join(f"<tr><td>object-{i}</td><td>OK</td><td>{i * 7 % 100}%</td></tr>" for i in range(count))
+    return f"<table class=\"objects\">{rows}</table>"
+
+
+def login_texts() -> dict[str, dict]:
+    """
+    Функция чтения текстов страницы авторизации по языкам (при пустом файле локализации - английские)
+    :return: dict: {язык: LoginScreen}
+    """
+    english = read_locale_file('en')
+    return {lang: read_locale_file(lang).get('LoginScreen') or english['LoginScreen'] for lang in LANGUAGES}
+
+
+def saymon_pages(latency: float = LATENCY, dom_size: int = DOM_SIZE) -> dict[str, str]:
+    """
+    Функция формирования страниц подменного SAYMON UI
+    :return: dict: {путь: html}
+    """
+    texts = login_texts()
+    rows = object_rows(dom_size)
+    return {
+        '/': LOGIN_PAGE.format(
+            title=escape(texts['en']['TEXT_TITLE_TAB_PAGE']),
+            texts=json.dumps(texts, ensure_ascii=False),
+            names=json.dumps(LANGUAGES, ensure_ascii=False),
+            latency=latency,
+            rows=rows,
+        ),
+        '/main': MAIN_PAGE.format(
+            title=escape(read_locale_file('en')['MainMenuToolbar']['TEXT_TITLE_TAB_PAGE']),
+            main_container=PopupType.CREATE_OBJECT['MAIN_CONTAINER'].lstrip('.'),
+            popup_name=escape(PopupType.CREATE_OBJECT['popup_name']),
+            latency=latency,
+            rows=rows,
+        ),
+    }
+
+
+def mock_saymon(mock: MockWebDriver, latency: float = LATENCY, dom_size: int = DOM_SIZE) -> MockWebDriver:
+    """
+    Функция регистрации подменного SAYMON UI в модели DOM MockWebDriver: те же страницы, а поведение скриптов
+    страниц (язык, индикатор загрузки, меню, модальное окно, вход и выход) воспроизводится обработчиками Python
+    :param mock: MockWebDriver
+    :return: MockWebDriver
+    """
+    texts = login_texts()
+
+    def _render(document: Document, lang: str) -> None:
+        document.first('.modal-title').set_text(texts[lang]['TEXT_TITLE_POPUP_LOGIN'])
+        document.first('.filter-option > span').set_text(LANGUAGES[lang])
+        mock.storage['local']['lang'] = lang
+
+    def _login_loaded(document: Document) -> None:
+        _render(document, mock.storage['local'].get('lang', 'en'))
+        document.later(latency, lambda loaded: loaded.first('.bounce').remove())
+
+    def _select_language(lang: str) -> Callable[[Document, Node], None]:
+        def _select(document: Document, _: Node) -> None:
+            _render(document, lang)
+            document.toggle('.lang-menu', state=True)
+
+        return _select
+
+    pages = saymon_pages(latency, dom_size)
+    mock.page('/', pages['/'], _login_loaded).page('/main', pages['/main'])
+    mock.on_click('.dropdown-toggle', lambda document, _: document.toggle('.lang-menu'), path='/')
+    for flag, lang in (('flag-ru', 'ru'), ('flag-us', 'en'), ('flag-it', 'it')):
+        mock.on_click(f".{flag}", _select_language(lang), path='/')
+    mock.on_click('.js-submit', lambda document, _: document.later(latency, lambda d: d.navigate('/main')), path='/')
+    mock.on_click('.dropdown > button', lambda document, _: document.toggle('.dropdown > ul'), path='/main')
+    mock.on_click('#js-create-dropdown-toggle', lambda document, _: document.toggle('.create-menu > ul'), path='/main')
+    mock.on_click(
+        '#js-create-object', lambda document, _: document.later(latency, lambda d: d.toggle('.modal')), path='/main'
+    )
+    mock.on_click(
+        '.modal .close, .modal-footer > .btn', lambda document, _: document.toggle('.modal', state=True), path='/main'
+    )
+    return mock
+
+
+class FakeSaymon:
+    """
+    HTTP сервер подменного SAYMON UI в фоновом потоке (контекстный менеджер)
+    - GET / - страница авторизации, GET /main - главная страница
+    """
+
+    def __init__(self, latency: float = LATENCY, dom_size: int = DOM_SIZE, host: str = '127.0.0.1', port: int = 0):
+        self.latency = latency
+        self.pages = {page: html.encode('utf-8') for page, html in saymon_pages(latency, dom_size).items()}
+        self.server = ThreadingHTTPServer((host, port), self.__handler())
+        self.__thread = Thread(target=self.server.serve_forever, name='FakeSaymon', daemon=True)
+
+    @property
+    def url(self) -> str:
+        """Адрес страницы авторизации"""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def __handler(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):  # pylint: disable=invalid-name
+                """Ответ страницей по пути (после задержки сервера)"""
+                sleep(fake.latency) if fake.latency else None
+                body = fake.pages.get(urlparse(self.path).path)
+                self.send_response(200 if body else 404)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body or b'')))
+                self.end_headers()
+                self.wfile.write(body or b'')
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                """Журнал запросов не выводится"""
+
+        return _Handler
+
+    def __enter__(self) -> 'FakeSaymon':
+        self.__thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,808 @@
+"""
+Встроенный (in-process) сервер протокола W3C WebDriver с моделью DOM для тестов и бенчмарков без браузера
+
+- страницы задаются разметкой html, поведение (клики, навигация, отложенные изменения DOM) - функциями Python
+- собственные скрипты фреймворка (Scripts.*) и атомы Selenium опознаются по метке `/* <имя> */` и исполняются моделью
+- каждая команда учитывается (commands), задержка ответа задается на команду (latency)
+WebDriver подключается к серверу в удаленном режиме (selenoid_url = MockWebDriver.url, см. MockWebDriver.config)
+"""
+
+import json
+import re
+from collections import Counter
+from html import escape
+from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import RLock, Thread
+from time import monotonic, sleep
+from typing import Any, Callable, Optional
+from urllib.parse import urlparse
+from uuid import uuid4
+
+from selenium.webdriver.common.keys import Keys
+
+from Config import Config, ConfigSection
+from WebDriver.Instrumentation import SCRIPT_TAG
+
+ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+"""Ключ ссылки на элемент в протоколе W3C WebDriver"""
+VOID_TAGS = frozenset({'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'wbr'})
+"""Элементы html без закрывающего тега"""
+HIDDEN_TAGS = frozenset({'head', 'title', 'script', 'style', 'template'})
+"""Элементы, которые никогда не отображаются"""
+BOOLEAN_ATTRIBUTES = frozenset({'checked', 'disabled', 'hidden', 'readonly', 'required', 'selected'})
+"""Атрибуты, для которых getAttribute (атом Selenium) возвращает 'true' | None"""
+PRIVATE_USE = ('\ue000', '\uf8ff')
+"""Диапазон символов служебных клавиш Selenium (Keys.*): в значение поля не попадают"""
+
+SIMPLE_SELECTORS = r'#[\w-]+|\.[\w-]+|\[[^\]]+\]|:nth-child\(\d+\)|:first-child|:last-child'
+"""Простые селекторы css, поддерживаемые моделью DOM"""
+COMPOUND = re.compile(rf'(?P<tag>\*|[a-zA-Z][\w-]*)?(?P<parts>(?:{SIMPLE_SELECTORS})*)$')
+"""Составной селектор css: тег и простые селекторы без комбинаторов"""
+PART = re.compile(
+    r'#([\w-]+)|\.([\w-]+)|\[([\w-]+)(?:=["\']?([^"\'\]]*)["\']?)?\]|:nth-child\((\d+)\)|:(first|last)-child'
+)
+"""Разбор простого селектора: id, class, атрибут и значение, номер :nth-child, :first/last-child"""
+
+
+class WebDriverError(Exception):
+    """Ошибка команды в терминах протокола W3C: HTTP статус и код ошибки"""
+
+    def __init__(self, status: int, error: str, message: str = '') -> None:
+        super().__init__(message or error)
+        self.status = status
+        self.error = error
+
+
+class Node:
+    """Элемент модели DOM"""
+
+    __slots__ = ('tag', 'attrs', 'children', 'parent', 'value', 'ref')
+
+    def __init__(self, tag: str, attrs: Optional[dict] = None, parent: Optional['Node'] = None) -> None:
+        self.tag = tag
+        self.attrs: dict[str, str] = attrs or {}
+        self.children: list['Node | str'] = []
+        self.parent = parent
+        self.value = self.attrs.get('value', '')
+        self.ref: Optional[str] = None
+
+    @property
+    def elements(self) -> list['Node']:
+        """Дочерние элементы (без текстовых узлов)"""
+        return [child for child in self.children if isinstance(child, Node)]
+
+    @property
+    def classes(self) -> list[str]:
+        """Классы элемента"""
+        return self.attrs.get('class', '').split()
+
+    def descendants(self):
+        """Генератор всех вложенных элементов в порядке документа"""
+        for child in self.elements:
+            yield child
+            yield from child.descendants()
+
+    def root(self) -> 'Node':
+        """Корень дерева, в котором находится элемент"""
+        node = self
+        while node.parent is not None:
+            node = node.parent
+        return node
+
+    def displayed(self) -> bool:
+        """Элемент отображается: ни он, ни его предки не скрыты (класс/атрибут hidden, display: none)"""
+        node = self
+        while node is not None:
+            style = node.attrs.get('style', '').replace(' ', '')
+            if node.tag in HIDDEN_TAGS or 'hidden' in node.attrs or 'hidden' in node.classes or 'display:none' in style:
+                return False
+            node = node.parent
+        return True
+
+    def text(self) -> str:
+        """Видимый текст элемента (как WebElement.text): пробелы схлопываются"""
+        if not self.displayed():
+            return ''
+
+        def _collect(node: 'Node') -> str:
+            parts = []
+            for child in node.children:
+                if isinstance(child, str):
+                    parts.append(child)
+                elif child.displayed():
+                    parts.append(_collect(child))
+            return ' '.join(parts)
+
+        return ' '.join(_collect(self).split())
+
+    def set_text(self, text: str) -> None:
+        """Заменить содержимое элемента текстом"""
+        self.children = [text]
+
+    def toggle_class(self, name: str, state: Optional[bool] = None) -> None:
+        """Добавить/удалить класс (state=None - переключить)"""
+        classes = self.classes
+        state = name not in classes if state is None else state
+        classes = [item for item in classes if item != name] + ([name] if state else [])
+        self.attrs['class'] = ' '.join(classes)
+
+    def remove(self) -> None:
+        """Удалить элемент из DOM"""
+        if self.parent is not None:
+            self.parent.children.remove(self)
+            self.parent = None
+
+    def outer_html(self) -> str:
+        """Разметка элемента"""
+        if self.tag == '#document':
+            return ''.join(child.outer_html() for child in self.elements)
+        attrs = ''.join(f' {key}="{escape(value)}"' for key, value in self.attrs.items())
+        if self.tag in VOID_TAGS:
+            return f"<{self.tag}{attrs}>"
+        inner = ''.join(escape(child) if isinstance(child, str) else child.outer_html() for child in self.children)
+        return f"<{self.tag}{attrs}>{inner}</{self.tag}>"
+
+
+class _Parser(HTMLParser):
+    """Построение модели DOM из разметки (незакрытые теги закрываются по ближайшему совпадающему закрывающему)"""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.document = Node('#document')
+        self.__current = self.document
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {key: value or '' for key, value in attrs}, self.__current)
+        self.__current.children.append(node)
+        if tag not in VOID_TAGS:
+            self.__current = node
+
+    def handle_startendtag(self, tag, attrs):
+        self.__current.children.append(Node(tag, {key: value or '' for key, value in attrs}, self.__current))
+
+    def handle_endtag(self, tag):
+        node = self.__current
+        while node is not None and node.tag != tag:
+            node = node.parent
+        if node is not None and node.parent is not None:
+            self.__current = node.parent
+
+    def handle_data(self, data):
+        if data.strip():
+            self.__current.children.append(data)
+
+
+def _compound(text: str) -> tuple[Optional[str], list[tuple]]:
+    match = COMPOUND.match(text)
+    if not match:
+        raise WebDriverError(400, 'invalid selector', f"Селектор `{text}` не поддерживается моделью DOM")
+    tag = match.group('tag')
+    return (None if tag in (None, '*') else tag.lower()), PART.findall(match.group('parts'))
+
+
+def _matches_compound(node: Node, compound: tuple[Optional[str], list[tuple]]) -> bool:
+    tag, parts = compound
+    if tag and node.tag != tag:
+        return False
+    for element_id, css_class, attribute, attribute_value, nth, edge in parts:
+        if element_id and node.attrs.get('id') != element_id:
+            return False
+        if css_class and css_class not in node.classes:
+            return False
+        if attribute and (
+            attribute not in node.attrs or (attribute_value and node.attrs[attribute] != attribute_value)
+        ):
+            return False
+        if nth or edge:
+            siblings = node.parent.elements if node.parent is not None else [node]
+            position = siblings.index(node) + 1
+            expected = int(nth) if nth else (1 if edge == 'first' else len(siblings))
+            if position != expected:
+                return False
+    return True
+
+
+def _matches(node: Node, chain: list, index: int) -> bool:
+    """Соответствие элемента цепочке [compound, комбинатор, compound, ...], проверяемой справа налево"""
+    if not _matches_compound(node, chain[index]):
+        return False
+    if index == 0:
+        return True
+    parent = node.parent
+    while parent is not None and parent.tag != '#document':
+        if _matches(parent, chain, index - 2):
+            return True
+        if chain[index - 1] == '>':
+            return False
+        parent = parent.parent
+    return False
+
+
+def _chain(group: str, selector: str) -> list:
+    tokens = [token for token in re.split(r'\s*(>)\s*|\s+', group.strip()) if token]
+    chain = []
+    for token in tokens:
+        if token != '>' and chain and chain[-1] != '>':
+            chain.append(' ')
+        chain.append(token if token == '>' else _compound(token))
+    if not chain or '>' in (chain[0], chain[-1]):
+        raise WebDriverError(400, 'invalid selector', f"Селектор `{selector}` не поддерживается моделью DOM")
+    return chain
+
+
+def select(root: Node, selector: str) -> list[Node]:
+    """
+    Поиск элементов по css-селектору как querySelectorAll (подмножество: тег, #id, .class, [attr], [attr=value],
+    :nth-child(n), :first-child, :last-child, комбинаторы ` ` и `>`, списки через запятую)
+    :param root: Node: элемент или документ, внутри которого выполняется поиск
+    :param selector: str: css-селектор
+    :return: list: элементы в порядке документа
+    """
+    chains = [_chain(group, selector) for group in selector.split(',')]
+    return [node for node in root.descendants() if any(_matches(node, chain, len(chain) - 1) for chain in chains)]
+
+
+class Document:
+    """Загруженная страница: дерево DOM, заголовок, отложенные изменения и счетчик версий DOM"""
+
+    def __init__(self, browser: 'MockWebDriver', url: str, html: str) -> None:
+        parser = _Parser()
+        parser.feed(html)
+        self.browser = browser
+        self.url = url
+        self.root = parser.document
+        self.beacon = None
+        self.installed = False
+        self.snapshot = False
+        self.version = 1
+        self.timers: list[tuple[float, Callable[['Document'], None]]] = []
+        self.table_index: dict[str, list] = {}
+
+    @property
+    def title(self) -> str:
+        """Текст элемента <title>"""
+        titles = [node for node in self.root.descendants() if node.tag == 'title']
+        return (
+            ' '.join(''.join(child for child in titles[0].children if isinstance(child, str)).split()) if titles else ''
+        )
+
+    def select(self, selector: str) -> list[Node]:
+        """Поиск элементов по css-селектору во всем документе"""
+        return select(self.root, selector)
+
+    def first(self, selector: str) -> Optional[Node]:
+        """Первый элемент по css-селектору"""
+        found = self.select(selector)
+        return found[0] if found else None
+
+    def changed(self) -> None:
+        """Отметить изменение DOM (MutationObserver на странице увеличивает версию)"""
+        self.version += 1
+        self.table_index = {}
+
+    def later(self, delay: float, action: Callable[['Document'], None]) -> None:
+        """Запланировать изменение DOM через delay сек (как setTimeout на странице)"""
+        self.timers.append((monotonic() + delay, action))
+
+    def tick(self) -> None:
+        """Выполнить наступившие отложенные изменения"""
+        now = monotonic()
+        due = [timer for timer in self.timers if timer[0] <= now]
+        self.timers = [timer for timer in self.timers if timer[0] > now]
+        for _, action in sorted(due, key=lambda timer: timer[0]):
+            if self.browser.document is self:
+                action(self)
+                self.changed()
+
+    def toggle(self, selector: str, name: str = 'hidden', state: Optional[bool] = None) -> None:
+        """Переключить класс у первого элемента по селектору"""
+        node = self.first(selector)
+        node.toggle_class(name, state) if node else None
+        self.changed()
+
+    @property
+    def path(self) -> str:
+        """Путь страницы"""
+        return urlparse(self.url).path or '/'
+
+    def navigate(self, url: str) -> None:
+        """Перейти на страницу (как location.href = url): путь `/...` - относительно текущего хоста"""
+        parsed = urlparse(self.url)
+        self.browser.load(f"{parsed.scheme}://{parsed.netloc}{url}" if url.startswith('/') else url)
+
+
+class MockWebDriver:
+    """
+    Сервер протокола W3C WebDriver с моделью DOM в фоновом потоке (контекстный менеджер)
+    - page(path, html, on_load) - страница, on_click(selector, action) - обработчик клика (всплывает по предкам)
+    - commands - счетчик выполненных команд: `POST /element/click`, `POST /execute/sync:pageObjectLookup`, ...
+    - latency - задержка ответа (сек): число для всех команд или словарь {команда: задержка, '*': по умолчанию}
+    """
+
+    def __init__(self, latency: float | dict[str, float] = 0.0, host: str = '127.0.0.1', port: int = 0) -> None:
+        self.latency = latency
+        self.pages: dict[str, tuple[str, Optional[Callable[[Document], None]]]] = {}
+        self.handlers: list[tuple[Optional[str], str, Callable[[Document, Node], None]]] = []
+        self.commands: Counter = Counter()
+        self.storage: dict[str, dict] = {'local': {}, 'session': {}}
+        self.document: Optional[Document] = None
+        self.__elements: dict[str, Node] = {}
+        self.__focused: Optional[Node] = None
+        self.__lock = RLock()
+        self.server = ThreadingHTTPServer((host, port), self.__handler())
+        self.server.daemon_threads = True
+        self.__thread = Thread(target=self.server.serve_forever, name='MockWebDriver', daemon=True)
+        self.load('about:blank')
+
+    # <editor-fold desc="Сценарий страниц">
+    @property
+    def url(self) -> str:
+        """Адрес сервера WebDriver"""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def page(self, path: str, html: str, on_load: Optional[Callable[[Document], None]] = None) -> 'MockWebDriver':
+        """
+        Метод регистрации страницы
+        :param path: str: путь страницы (url сравнивается без схемы и хоста)
+        :param html: str: разметка
+        :param on_load: callable: действие над документом после загрузки (как скрипт страницы)
+        """
+        self.pages[path] = (html, on_load)
+        return self
+
+    def on_click(
+        self, selector: str, action: Callable[[Document, Node], None], path: Optional[str] = None
+    ) -> 'MockWebDriver':
+        """
+        Метод регистрации обработчика клика по элементам, подходящим под селектор (в т.ч. по вложенным в них)
+        :param selector: str: css-селектор
+        :param action: callable: (документ, элемент) -> None
+        :param path: str: путь страницы, на которой действует обработчик (None - на всех страницах)
+        """
+        self.handlers.append((path, selector, action))
+        return self
+
+    def load(self, url: str) -> Document:
+        """Загрузить страницу по адресу (неизвестный путь - пустая страница)"""
+        with self.__lock:
+            html, on_load = self.pages.get(urlparse(url).path or '/', ('<html><head></head><body></body></html>', None))
+            self.document = Document(self, url, html)
+            self.__elements, self.__focused = {}, None
+            on_load(self.document) if on_load else None
+            return self.document
+
+    def config(self, browser_name: str = 'chrome') -> ConfigSection:
+        """
+        Метод формирования конфигурации WebDriver в удаленном режиме с подключением к серверу
+        :return: ConfigSection
+        """
+        data = json.loads(json.dumps(Config()))
+        data['browser']['browser_name'] = browser_name
+        data['browser']['selenoid'].update({'use_selenoid': True, 'selenoid_url': self.url, 'executor_id': None})
+        return ConfigSection(data)
+
+    def reset(self) -> None:
+        """Сбросить счетчик команд"""
+        self.commands.clear()
+
+    # </editor-fold desc="Сценарий страниц">
+
+    def __enter__(self) -> 'MockWebDriver':
+        self.__thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __handler(self) -> type[BaseHTTPRequestHandler]:
+        mock = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def __respond(self, method: str) -> None:
+                length = int(self.headers.get('Content-Length') or 0)
+                payload = json.loads(self.rfile.read(length) or b'{}') if length else {}
+                try:
+                    status, value = 200, mock.dispatch(method, self.path, payload)
+                except WebDriverError as e:
+                    status, value = e.status, {'error': e.error, 'message': str(e), 'stacktrace': ''}
+                body = json.dumps({'value': value}).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """Команда GET"""
+                self.__respond('GET')
+
+            def do_POST(self):  # pylint: disable=invalid-name
+                """Команда POST"""
+                self.__respond('POST')
+
+            def do_DELETE(self):  # pylint: disable=invalid-name
+                """Команда DELETE"""
+                self.__respond('DELETE')
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                """Журнал запросов не выводится"""
+
+        return _Handler
+
+    # <editor-fold desc="Протокол">
+    def dispatch(self, method: str, path: str, payload: dict) -> Any:
+        """
+        Метод выполнения команды протокола
+        :param method: str: HTTP метод
+        :param path: str: путь команды
+        :param payload: dict: параметры команды
+        :return: значение `value` ответа
+        """
+        parts = path.strip('/').split('/')
+        if parts == ['session'] and method == 'POST':
+            return self.__count('POST /session', self.__new_session)
+        if parts[:1] != ['session'] or len(parts) < 2:
+            raise WebDriverError(404, 'unknown command', path)
+
+        command = parts[2:]
+        element = None
+        if command[:1] == ['element'] and len(command) > 2:
+            element, command = command[1], ['element'] + command[2:]
+        name = f"{method} /{'/'.join(command)}"
+        if command in (['execute', 'sync'], ['execute', 'async']):
+            tag = SCRIPT_TAG.match(payload.get('script', ''))
+            name = f"{name}:{tag.group(1) if tag else 'script'}"
+        return self.__count(name, lambda: self.__execute(method, command, element, payload, name))
+
+    def __count(self, name: str, action: Callable[[], Any]) -> Any:
+        latency = self.latency.get(name, self.latency.get('*', 0.0)) if isinstance(self.latency, dict) else self.latency
+        sleep(latency) if latency else None
+        with self.__lock:
+            self.commands[name] += 1
+            self.document.tick()
+            return action()
+
+    def __new_session(self) -> dict:
+        """Новая сессия - новый профиль браузера: пустые localStorage/sessionStorage и пустая страница"""
+        self.storage = {'local': {}, 'session': {}}
+        self.load('about:blank')
+        return {'sessionId': uuid4().hex, 'capabilities': {}}
+
+    def __node(self, ref: str) -> Node:
+        node = self.__elements.get(ref)
+        if node is None or node.root() is not self.document.root:
+            raise WebDriverError(404, 'stale element reference', f"Элемент {ref} отсутствует в DOM")
+        return node
+
+    def __ref(self, node: Node) -> dict:
+        if node.ref is None:
+            node.ref = uuid4().hex
+            self.__elements[node.ref] = node
+        return {ELEMENT_KEY: node.ref}
+
+    def __unwrap(self, value: Any) -> Any:
+        if isinstance(value, dict) and ELEMENT_KEY in value:
+            return self.__node(value[ELEMENT_KEY])
+        if isinstance(value, list):
+            return [self.__unwrap(item) for item in value]
+        return value
+
+    def __wrap(self, value: Any) -> Any:
+        if isinstance(value, Node):
+            return self.__ref(value)
+        if isinstance(value, (list, tuple)):
+            return [self.__wrap(item) for item in value]
+        return value
+
+    def __find(self, root: Node, using: str, value: str) -> list[Node]:
+        if using == 'css selector':
+            return select(root, value)
+        if using == 'link text':
+            return [node for node in root.descendants() if node.tag == 'a' and node.text() == value]
+        if using == 'tag name':
+            return [node for node in root.descendants() if node.tag == value.lower()]
+        raise WebDriverError(400, 'invalid selector', f"Стратегия `{using}` не поддерживается моделью DOM")
+
+    def __execute(  # pylint: disable=too-many-return-statements,too-many-branches
+        self, method: str, command: list[str], element: Optional[str], payload: dict, name: str
+    ) -> Any:
+        document = self.document
+        if not command:
+            return None
+        if command == ['url']:
+            if method == 'POST':
+                self.load(payload['url'])
+                return None
+            return document.url
+        if command == ['title']:
+            return document.title
+        if command == ['source']:
+            return document.root.outer_html()
+        if command == ['refresh']:
+            self.load(document.url)
+            return None
+        if command in (['execute', 'sync'], ['execute', 'async']):
+            return self.__wrap(self.__script(payload.get('script', ''), self.__unwrap(payload.get('args', []))))
+        if command in (['element'], ['elements']):
+            found = self.__find(document.root, payload['using'], payload['value'])
+            return self.__found(command[0], found, payload)
+        if command[0] == 'element':
+            return self.__element_command(method, command[1:], self.__node(element), payload)
+        if command == ['actions'] and method == 'POST':
+            return self.__actions(payload.get('actions', []))
+        if command == ['window', 'rect']:
+            return {'x': 0, 'y': 0, 'width': payload.get('width', 1920), 'height': payload.get('height', 1080)}
+        if command == ['window']:
+            return 'mock-window'
+        if command == ['window', 'handles']:
+            return ['mock-window']
+        if command == ['cookie'] and method == 'GET':
+            return []
+        if method in ('POST', 'DELETE') or command[0] in ('timeouts', 'cookie', 'window'):
+            return None
+        raise WebDriverError(404, 'unknown command', name)
+
+    def __found(self, kind: str, found: list[Node], payload: dict) -> Any:
+        if kind == 'elements':
+            return [self.__ref(node) for node in found]
+        if not found:
+            raise WebDriverError(404, 'no such element', f"Элемент `{payload['value']}` не найден")
+        return self.__ref(found[0])
+
+    def __element_command(self, method: str, command: list[str], node: Node, payload: dict) -> Any:
+        action = command[0] if command else ''
+        if action in ('element', 'elements'):
+            return self.__found(action, self.__find(node, payload['using'], payload['value']), payload)
+        if action == 'click':
+            return self.click(node)
+        if action == 'clear':
+            node.value = ''
+            self.document.changed()
+            return None
+        if action == 'value':
+            self.__focused = node
+            self.__type(node, payload.get('text', ''.join(payload.get('value', []))))
+            return None
+        if action == 'text':
+            return node.text()
+        if action == 'name':
+            return node.tag
+        if action == 'attribute':
+            return self.__attribute(node, command[1])
+        if action == 'property':
+            return node.value if command[1] == 'value' else node.attrs.get(command[1])
+        if action == 'displayed':
+            return node.displayed()
+        if action == 'enabled':
+            return 'disabled' not in node.attrs
+        if action == 'selected':
+            return 'checked' in node.attrs or 'selected' in node.attrs
+        if action == 'rect':
+            return {'x': 0, 'y': 0, 'width': 100, 'height': 20}
+        raise WebDriverError(404, 'unknown command', f"{method} element/{action}")
+
+    @staticmethod
+    def __attribute(node: Node, name: str) -> Optional[str]:
+        if name == 'value' and node.tag in ('input', 'textarea', 'select'):
+            return node.value
+        if name in BOOLEAN_ATTRIBUTES:
+            return 'true' if name in node.attrs else None
+        return node.attrs.get(name)
+
+    def click(self, node: Node) -> None:
+        """
+        Клик по элементу: обработчики on_click по элементу и его предкам, переход по ссылке <a href>
+        """
+        if not node.displayed():
+            raise WebDriverError(400, 'element not interactable', f"Элемент <{node.tag}> не отображается")
+        document = self.document
+        self.__focused = node if node.tag in ('input', 'textarea') else self.__focused
+        target = node
+        while target is not None and target.tag != '#document':
+            for path, selector, action in self.handlers:
+                if path in (None, document.path) and target in select(document.root, selector):
+                    action(document, target)
+                    document.changed()
+                    if self.document is not document:
+                        return
+            href = target.attrs.get('href', '#')
+            if target.tag == 'a' and not href.startswith('#') and self.document is document:
+                document.navigate(href)
+                return
+            target = target.parent
+
+    def __type(self, node: Node, text: str) -> None:
+        control = select_all = False
+        for char in text:
+            if char == Keys.CONTROL:
+                control = True
+            elif char == Keys.NULL:
+                control = False
+            elif control and char.lower() == 'a':
+                select_all = True
+            elif char in (Keys.DELETE, Keys.BACKSPACE):
+                node.value = '' if select_all else node.value[:-1]
+                select_all = False
+            elif PRIVATE_USE[0] <= char <= PRIVATE_USE[1]:
+                continue
+            else:
+                node.value = char if select_all else node.value + char
+                select_all = False
+        self.document.changed()
+
+    def __actions(self, sources: list[dict]) -> None:
+        """
+        Цепочки Actions: клик указателем по элементу, затем ввод клавиш в элемент с фокусом
+        (отпускание модификатора CONTROL - Keys.NULL, как в send_keys)
+        """
+        for source in sorted(sources, key=lambda item: item.get('type') != 'pointer'):
+            target, keys = None, []
+            for action in source.get('actions', []):
+                if action.get('type') == 'pointerMove' and isinstance(action.get('origin'), dict):
+                    target = self.__node(action['origin'][ELEMENT_KEY])
+                elif action.get('type') == 'pointerUp' and target is not None:
+                    self.click(target)
+                elif action.get('type') == 'keyDown':
+                    keys.append(action['value'])
+                elif action.get('type') == 'keyUp' and action['value'] == Keys.CONTROL:
+                    keys.append(Keys.NULL)
+            if keys and self.__focused is not None:
+                self.__type(self.__focused, ''.join(keys))
+
+    # </editor-fold desc="Протокол">
+
+    # <editor-fold desc="Скрипты">
+    def __visible(self, nodes: list[Node]) -> list[Node]:
+        return [node for node in nodes if node.displayed()]
+
+    def __script(self, script: str, args: list) -> Any:  # pylint: disable=too-many-return-statements,too-many-branches
+        """Исполнение скрипта по метке: собственные скрипты фреймворка и атомы Selenium"""
+        tag = SCRIPT_TAG.match(script)
+        tag = tag.group(1) if tag else None
+        document = self.document
+        if tag == 'isDisplayed':
+            return args[0].displayed()
+        if tag == 'getAttribute':
+            return self.__attribute(args[0], args[1])
+        if tag == 'pageObjectInstall':
+            document.installed = True
+            return None
+        if tag == 'pageObjectReadyState':
+            document.beacon = args[0] if args and args[0] is not None else document.beacon
+            return True
+        if tag == 'pageObjectBeacon':
+            return document.beacon == args[0]
+        if tag == 'pageObjectLookup':
+            by_method, value, root, visible, single, not_installed = args
+            if not document.installed:
+                return not_installed
+            return self.__lookup(self.__find(root or document.root, by_method, value), visible, single)
+        if tag == 'pageObjectWait':
+            return self.__wait(*args)
+        if tag == 'pageObjectFill':
+            return self.__fill(*args)
+        if tag == 'pageObjectBatch':
+            return self.__batch(*args)
+        if tag == 'pageObjectTableSearch':
+            return self.__table_search(*args)
+        if tag == 'pageObjectSnapshot':
+            document.snapshot = True
+            return [document.version, document.root.outer_html()]
+        if tag == 'pageObjectSnapshotVersion':
+            return document.version if document.snapshot else None
+        if tag == 'pageObjectReset':
+            self.storage = {'local': {}, 'session': {}}
+            return None
+        if tag == 'pageObjectCaptureStorage':
+            return json.loads(json.dumps(self.storage))
+        if tag == 'pageObjectRestoreStorage':
+            self.storage['local'].update(args[0] or {})
+            self.storage['session'].update(args[1] or {})
+            return None
+        return None
+
+    @staticmethod
+    def __lookup(found: list[Node], visible: bool, single: bool) -> Optional[list[Node]]:
+        """Scripts.LOOKUP: фильтр видимости (видимый элемент перед скрытыми - как в скрипте)"""
+        result = []
+        for node in found:
+            if node.displayed() or not visible:
+                if single:
+                    return [node]
+                result.append(node)
+            elif not single and not result:
+                return None
+        return result or None
+
+    def __wait(self, by_method, value, state, element, timeout, not_installed, root=None, beacon=None) -> Any:
+        """Scripts.WAIT: проверка состояния с ожиданием отложенных изменений DOM до timeout (мс)"""
+        document = self.document
+        if not document.installed and state in ('visible', 'invisible'):
+            return not_installed
+        deadline = monotonic() + timeout / 1000
+
+        def _check() -> bool:
+            if state == 'ready':
+                return True
+            if state == 'detached':
+                return element is None or element.root() is not self.document.root
+            found = self.__find(root or self.document.root, by_method, value) if value is not None else []
+            if state == 'present':
+                return bool(found)
+            if state == 'invisible':
+                return not found or not found[0].displayed()
+            return bool(self.__visible(found))
+
+        while True:
+            if _check():
+                document.beacon = beacon if state == 'ready' and beacon is not None else document.beacon
+                return True
+            pending = [timer[0] for timer in self.document.timers]
+            if not pending or min(pending) > deadline:
+                sleep(max(0.0, deadline - monotonic()))
+                return _check()
+            self.__lock.release()
+            try:
+                sleep(max(0.0, min(pending) - monotonic()))
+            finally:
+                self.__lock.acquire()
+            self.document.tick()
+
+    def __fill(self, node: Node, text: str, clear: bool) -> bool:
+        """Scripts.FILL / setValue"""
+        if node.tag not in ('input', 'textarea') or 'readonly' in node.attrs or 'disabled' in node.attrs:
+            return False
+        node.value = text if clear else node.value + text
+        self.document.changed()
+        return True
+
+    def __batch(self, steps: list, not_installed: str) -> Any:
+        """Scripts.BATCH"""
+        if not self.document.installed:
+            return not_installed
+        for index, (action, selector, text, clear) in enumerate(steps):
+            found = self.__visible(self.document.select(selector))
+            if not found:
+                return [index, None]
+            node = found[0]
+            if action == 'fill':
+                ok = self.__fill(node, text, clear)
+            elif action == 'text':
+                ok = node.text() == text
+            elif action in ('enabled', 'disabled'):
+                disabled = 'disabled' in node.attrs or 'disabled' in node.attrs.get('class', '')
+                ok = disabled == (action == 'disabled')
+            else:
+                return [index, node]
+            if not ok:
+                return [index, None]
+        return [len(steps), None]
+
+    def __table_search(self, selector, needle, match_case, match_words, root, use_index, not_installed) -> Any:
+        """Scripts.TABLE_SEARCH"""
+        if not self.document.installed:
+            return not_installed
+        if use_index and root is None:
+            # Индекс строк по селектору - до первого изменения DOM (Document.changed), как MutationObserver скрипта
+            entry = self.document.table_index.get(selector)
+            if entry is None:
+                rows = select(self.document.root, selector)
+                entry = self.document.table_index[selector] = [rows, [node.text() for node in rows]]
+            rows, texts = entry
+        else:
+            rows = select(root or self.document.root, selector)
+            texts = [node.text() for node in rows]
+        needle = needle if match_case else needle.lower()
+        for node, text in zip(rows, texts):
+            text = text if match_case else text.lower()
+            if (text == needle if match_words else needle in text) and node.displayed():
+                return node
+        return None
+
+    # </editor-fold desc="Скрипты">
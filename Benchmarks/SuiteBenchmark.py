@@ -0,0 +1,190 @@
+"""
+Бенчмарк сценариев PageObject на локальной подмене SAYMON UI (Benchmarks.FakeSaymon) в headless браузере:
+время и число команд WebDriver по операциям, сравнение с сохраненным базовым замером
+
+Запуск: python -m Benchmarks.SuiteBenchmark [--repeat 5] [--latency 0.05] [--dom-size 2000] [--update-baseline]
+        [--native-fill]
+Ввод текста - блочный скриптом (WebElement.FAST_FILL), --native-fill - с клавиатуры (отдельный профиль замера)
+Браузер и драйвер берутся из Config (browser.browser_name, driver_path), headless включается принудительно
+"""
+
+import argparse
+import json
+import sys
+from os import path
+from time import perf_counter, thread_time
+from typing import Callable
+
+from Benchmarks.FakeSaymon import DOM_SIZE, LATENCY, FakeSaymon
+from Config import Config, ConfigSection
+from Locales import Locale
+from PageObject import PageObject
+from PageObject.PopUps.PopUp import PopUp, PopupType
+from Utils import PROJECT_PATH, read_file
+from WebDriver import WebElement
+from WebDriver.Instrumentation import RECORDER, Recorder
+from WebDriver.WebDriver import WebDriver, logs_path
+
+REPEAT = 5
+"""Число прогонов сценария"""
+THRESHOLD = 1.25
+"""Регрессия: медиана операции больше базовой в THRESHOLD раз"""
+MIN_DELTA_MS = 20
+"""Регрессия по времени учитывается, только если медиана выросла больше чем на MIN_DELTA_MS (шум браузера)"""
+BASELINE_PATH = path.join(PROJECT_PATH, 'Benchmarks', 'baseline.json')
+"""Базовые замеры по профилям (браузер, задержка, размер DOM)"""
+
+
+def benchmark_config(browser_name: str = None) -> ConfigSection:
+    """
+    Функция формирования конфигурации бенчмарка: локальный headless браузер
+    :param browser_name: str: браузер (по умолчанию - из Config)
+    :return: ConfigSection
+    """
+    data = json.loads(json.dumps(Config()))
+    data['browser']['headless'] = True
+    data['browser']['selenoid']['use_selenoid'] = False
+    data['browser']['browser_name'] = browser_name or data['browser']['browser_name']
+    return ConfigSection(data)
+
+
+def create_object_popup(driver: WebDriver, page_object: PageObject) -> None:
+    """
+    Сценарий модального окна создания объекта: открыть, ввести имя, закрыть
+    """
+    toolbar = page_object.main_menu_toolbar
+    toolbar.click_on_element(toolbar.SELECTORS['BUTTON_OBJECT_CREATE'])
+    popup = PopUp(driver, PopupType.CREATE_OBJECT)
+    assert popup.is_exist, f"PopUp `{popup.popup_name}` не открылся"
+    popup.fill_input_field('benchmark')
+    driver.find_element_by_css_selector(popup.CANCEL_BTN).click()
+    assert driver.wait_for_element_to_disappear(popup.MAIN_CONTAINER), f"PopUp `{popup.popup_name}` не закрылся"
+
+
+def operations(driver: WebDriver, page_object: PageObject, url: str, language: str) -> list[tuple[str, Callable]]:
+    """
+    Функция формирования сценария: операции PageObject в порядке выполнения
+    :return: list: (имя операции, действие)
+    """
+    login = page_object.login_screen
+    return [
+        ('open_page', lambda: driver.open_page(url)),
+        ('set_ui_language', lambda: login.set_ui_language(language)),
+        ('login', lambda: login.login(Config().saymon_admin_user)),
+        ('create_object_popup', lambda: create_object_popup(driver, page_object)),
+        ('logout', page_object.main_menu_toolbar.logout),
+    ]
+
+
+def run(config: ConfigSection, url: str, language: str, repeat: int) -> dict:
+    """
+    Функция прогона сценария repeat раз в одной сессии браузера
+    :return: dict: {операция: гистограмма времени (мс), среднее число команд WebDriver и время CPU клиента (мс)}
+    """
+    Locale(language).update_locale(language)
+    driver = WebDriver(config)
+    page_object = PageObject(driver)
+    timings: dict[str, list[float]] = {}
+    cpu: dict[str, float] = {}
+    enabled, RECORDER.enabled = RECORDER.enabled, True
+    RECORDER.records.clear()
+    try:
+        for _ in range(repeat):
+            for name, action in operations(driver, page_object, url, language):
+                RECORDER.test = name
+                started, cpu_started = perf_counter(), thread_time()
+                action()
+                timings.setdefault(name, []).append(perf_counter() - started)
+                cpu[name] = cpu.get(name, 0.0) + thread_time() - cpu_started
+    finally:
+        RECORDER.test = '<session>'
+        RECORDER.enabled = enabled
+        driver.quit()
+
+    commands: dict[str, int] = {}
+    for record in RECORDER.records:
+        if record.kind == 'command':
+            commands[record.test] = commands.get(record.test, 0) + 1
+    RECORDER.records.clear()
+    return {
+        name: Recorder.histogram(values)
+        | {'commands': round(commands.get(name, 0) / repeat, 1), 'cpu_ms': round(cpu[name] / repeat * 1000, 2)}
+        for name, values in timings.items()
+    }
+
+
+def regressions(report: dict, baseline: dict, threshold: float = THRESHOLD) -> list[str]:
+    """
+    Функция сравнения замера с базовым: рост медианы времени (с учетом шума) и рост числа команд WebDriver
+    :return: list: описания регрессий
+    """
+    found = []
+    for name, current in report.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        slower = current['p50_ms'] > base['p50_ms'] * threshold and current['p50_ms'] - base['p50_ms'] > MIN_DELTA_MS
+        if slower:
+            found.append(f"{name}: p50 {base['p50_ms']} -> {current['p50_ms']} мс")
+        if current['commands'] > base['commands']:
+            found.append(f"{name}: команд WebDriver {base['commands']} -> {current['commands']}")
+    return found
+
+
+def compare_with_baseline(
+    profile: str, report: dict, report_name: str, threshold: float = THRESHOLD, update_baseline: bool = False
+) -> int:
+    """
+    Функция сравнения замера с базовым по профилю: вывод и запись отчета в Logs, при update_baseline - сохранение
+    замера как базового (Benchmarks/baseline.json)
+    :param profile: str: профиль замера (браузер | mock, задержка, размер DOM, язык)
+    :param report: dict: замер по операциям
+    :param report_name: str: имя файла отчета в Logs
+    :param threshold: float: порог регрессии по времени
+    :param update_baseline: bool: сохранить замер как базовый
+    :return: int: код завершения (1 - есть регрессии относительно базового замера)
+    """
+    baselines = read_file(BASELINE_PATH, 'json') if path.exists(BASELINE_PATH) else {}
+    found = regressions(report, baselines.get(profile, {}), threshold)
+    result = {'profile': profile, 'operations': report, 'regressions': found}
+    print(json.dumps(result, indent=4, ensure_ascii=False))
+    with open(path.join(logs_path(), report_name), 'w', encoding='UTF-8') as file:
+        file.write(json.dumps(result, indent=4, ensure_ascii=False))
+
+    if update_baseline:
+        baselines[profile] = report
+        with open(BASELINE_PATH, 'w', encoding='UTF-8') as file:
+            file.write(json.dumps(baselines, indent=4, ensure_ascii=False, sort_keys=True))
+    elif profile not in baselines:
+        print(f"INFO:\tБазовый замер для профиля `{profile}` отсутствует: запустите с --update-baseline")
+    return 1 if found and not update_baseline else 0
+
+
+def main(argv: list[str] = None) -> int:
+    """
+    Функция запуска бенчмарка
+    :return: int: код завершения (1 - есть регрессии относительно базового замера)
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    parser.add_argument('--latency', type=float, default=LATENCY, help='задержка сервера и отрисовки (сек)')
+    parser.add_argument('--dom-size', type=int, default=DOM_SIZE, help='число строк таблицы объектов')
+    parser.add_argument('--language', default='en', choices=('ru', 'en'))
+    parser.add_argument('--browser', default=None, help='chrome | firefox (по умолчанию - из Config)')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    parser.add_argument('--update-baseline', action='store_true', help='сохранить замер как базовый')
+    parser.add_argument('--native-fill', action='store_true', help='ввод текста с клавиатуры вместо скрипта')
+    args = parser.parse_args(argv)
+    WebElement.FAST_FILL = not args.native_fill
+
+    config = benchmark_config(args.browser)
+    profile = f"{config.browser.browser_name}/latency={args.latency}/dom={args.dom_size}/{args.language}"
+    profile += '/native-fill' if args.native_fill else ''
+    with FakeSaymon(latency=args.latency, dom_size=args.dom_size) as fake:
+        report = run(config, fake.url, args.language, args.repeat)
+
+    return compare_with_baseline(profile, report, 'benchmark_report.json', args.threshold, args.update_baseline)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
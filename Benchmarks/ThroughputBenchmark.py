@@ -0,0 +1,88 @@
+"""
+Бенчмарк пропускной способности PageObject без браузера: сценарий SuiteBenchmark на модели DOM
+(Benchmarks.MockWebDriver + FakeSaymon.mock_saymon) - число команд WebDriver (round trip) на операцию,
+время CPU клиента и число команд в секунду; задержка ответа на команду имитирует сеть до selenoid
+
+Запуск: python -m Benchmarks.ThroughputBenchmark [--repeat 5] [--command-latency 0.002] [--finds 200]
+        [--update-baseline] [--native-fill]
+Регрессии (рост числа команд или времени операции) сравниваются с Benchmarks/baseline.json по профилю `mock/...`
+"""
+
+import argparse
+import sys
+from time import perf_counter, thread_time
+
+from Benchmarks.FakeSaymon import DOM_SIZE, mock_saymon
+from Benchmarks.MockWebDriver import MockWebDriver
+from Benchmarks.SuiteBenchmark import REPEAT, THRESHOLD, compare_with_baseline, run
+from PageObject.Login import LoginScreen
+from WebDriver import WebElement
+from WebDriver.Instrumentation import Recorder
+from WebDriver.WebDriver import WebDriver
+
+FINDS = 200
+"""Число поисков элемента в замере команд в секунду"""
+COMMAND_LATENCY = 0.0
+"""Задержка ответа MockWebDriver на каждую команду (сек)"""
+BASE_URL = 'http://saymon.mock/'
+"""Адрес страницы авторизации в модели DOM (сеть не используется)"""
+
+
+def find_throughput(mock: MockWebDriver, count: int = FINDS) -> dict:
+    """
+    Функция замера поиска элемента (WebBase.__custom_find_by) на загруженной странице
+    :param mock: MockWebDriver: сервер с зарегистрированным SAYMON UI
+    :param count: int: число поисков
+    :return: dict: гистограмма времени поиска (мс), команд на поиск, время CPU клиента на поиск (мс), команд в секунду
+    """
+    driver = WebDriver(mock.config())
+    selector = LoginScreen.SELECTORS['INPUT_FIELD_LOGIN']
+    timings = []
+    try:
+        driver.open_page(BASE_URL)
+        driver.find_element_by_css_selector(selector)
+        mock.reset()
+        cpu_started = thread_time()
+        for _ in range(count):
+            started = perf_counter()
+            driver.find_element_by_css_selector(selector)
+            timings.append(perf_counter() - started)
+        cpu = thread_time() - cpu_started
+        commands = sum(mock.commands.values())
+    finally:
+        driver.quit()
+    return Recorder.histogram(timings) | {
+        'commands': round(commands / count, 2),
+        'cpu_ms': round(cpu / count * 1000, 3),
+        'commands_per_sec': round(commands / sum(timings), 1),
+    }
+
+
+def main(argv: list[str] = None) -> int:
+    """
+    Функция запуска бенчмарка
+    :return: int: код завершения (1 - есть регрессии относительно базового замера)
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    parser.add_argument('--command-latency', type=float, default=COMMAND_LATENCY, help='задержка на команду (сек)')
+    parser.add_argument('--dom-size', type=int, default=DOM_SIZE, help='число строк таблицы объектов')
+    parser.add_argument('--finds', type=int, default=FINDS, help='число поисков в замере команд в секунду')
+    parser.add_argument('--language', default='en', choices=('ru', 'en'))
+    parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    parser.add_argument('--update-baseline', action='store_true', help='сохранить замер как базовый')
+    parser.add_argument('--native-fill', action='store_true', help='ввод текста с клавиатуры вместо скрипта')
+    args = parser.parse_args(argv)
+    WebElement.FAST_FILL = not args.native_fill
+
+    profile = f"mock/latency={args.command_latency}/dom={args.dom_size}/{args.language}"
+    profile += '/native-fill' if args.native_fill else ''
+    with mock_saymon(MockWebDriver(latency=args.command_latency), dom_size=args.dom_size) as mock:
+        report = run(mock.config(), BASE_URL, args.language, args.repeat)
+        report['find_element'] = find_throughput(mock, args.finds)
+
+    return compare_with_baseline(profile, report, 'throughput_report.json', args.threshold, args.update_baseline)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
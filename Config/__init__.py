@@ -1,24 +1,69 @@
 import json
 import os
+from threading import Lock
 
-from Utils import os_locale, read_file
+from Utils import file_lock, os_locale, read_file
 from Utils.DotDict import DotDict
 
 
-class Config(DotDict):
-    """Класс конфигурационных данных в DotDict нотации"""
+class ConfigSection(DotDict):
+    """
+    Неизменяемый раздел Config в DotDict нотации
+    - вложенные разделы материализуются при первом обращении к ним (см. DotDict)
+    """
 
-    def __init__(self, update_file=False) -> None:
+    __slots__ = ()
+
+    def _wrap(self, value) -> 'ConfigSection':
+        return ConfigSection(value)
+
+    def __read_only(self, *args, **kwargs):
+        raise TypeError(f"Config: данные конфигурации доступны только для чтения (`{self.__class__.__name__}`)")
+
+    __setitem__ = __setattr__ = __delitem__ = __delattr__ = __read_only
+    update = pop = popitem = setdefault = clear = __read_only
+
+
+class Config(ConfigSection):
+    """
+    Класс конфигурационных данных в DotDict нотации
+    - неизменяемый снимок файла конфигурации, общий для процесса: файл читается повторно только при его изменении
+    - `update_file=True` записывает в файл язык ОС только если он изменился (под межпроцессной блокировкой)
+    """
+
+    __slots__ = ('__config_path',)
+
+    __snapshots: dict[str, tuple[int, 'Config']] = {}
+    __lock = Lock()
+
+    def __new__(cls, update_file=False) -> 'Config':
+        config_path = cls.__locate()
+        if update_file:
+            cls.__update_os_locale(config_path)
+
+        with cls.__lock:
+            version = os.stat(config_path).st_mtime_ns
+            snapshot = cls.__snapshots.get(config_path)
+            if not snapshot or snapshot[0] != version:
+                config = dict.__new__(cls)
+                DotDict.__init__(config, read_file(config_path, 'json'))
+                object.__setattr__(config, '_Config__config_path', config_path)
+                snapshot = cls.__snapshots[config_path] = (version, config)
+        return snapshot[1]
+
+    def __init__(self, update_file=False) -> None:  # pylint: disable=super-init-not-called,unused-argument
+        """Данные загружаются в __new__ (снимок общий для процесса)"""
+
+    @staticmethod
+    def __locate() -> str:
+        """
+        Путь к используемому файлу конфигурации: config.local.json (если есть) или config.json
+        """
         config_dir = os.path.dirname(os.path.abspath(__file__))
-        self.__config_path = os.path.join(config_dir, 'config.json')
         local_config_path = os.path.join(config_dir, 'config.local.json')
         if os.path.exists(local_config_path):
-            self.__config_path = local_config_path
-        config_data = read_file(self.__config_path, 'json')
-        super().__init__(DotDict(config_data))
-        if update_file:
-            self.locale.os_locale = os_locale()
-            self.__rewrite_config()
+            return local_config_path
+        return os.path.join(config_dir, 'config.json')
 
     @property
     def config_path(self) -> str:
@@ -44,10 +89,6 @@ class Config(DotDict):
         """
         return self.locale.os_locale
 
-    @os_language.setter
-    def os_language(self, value: str) -> None:
-        self.locale.os_locale = value
-
     @property
     def allow_yaml_tags(self) -> bool:
         """
@@ -56,9 +97,29 @@ class Config(DotDict):
         """
         return self.locale.allow_yaml_tags
 
-    def __rewrite_config(self) -> None:
+    @classmethod
+    def __update_os_locale(cls, config_path: str) -> None:
         """
-        Метод перезаписывает содержимое конфига в json файл определяющий конфиг
+        Метод записывает язык ОС в файл конфигурации, если он отличается от записанного
+        - файл перечитывается под межпроцессной блокировкой и подменяется атомарно (параллельный запуск)
         """
-        with open(self.__config_path, 'w', encoding='UTF-8') as file:
-            file.write(json.dumps(self, indent=4, sort_keys=True))
+        language = os_locale()
+        with cls.__lock:
+            snapshot = cls.__snapshots.get(config_path)
+        if (
+            snapshot
+            and snapshot[0] == os.stat(config_path).st_mtime_ns
+            and snapshot[1].locale.get('os_locale') == language
+        ):
+            return
+
+        with file_lock(config_path):
+            config_data = read_file(config_path, 'json')
+            if config_data['locale'].get('os_locale') == language:
+                return
+            config_data['locale']['os_locale'] = language
+            tmp_path = f"{config_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='UTF-8') as file:
+                file.write(json.dumps(config_data, indent=4, sort_keys=True))
+            os.chmod(tmp_path, os.stat(config_path).st_mode)
+            os.replace(tmp_path, config_path)
@@ -1,3 +1,4 @@
+import hashlib
 import json
 from os import linesep, path
 
@@ -19,6 +20,9 @@ class Locale(DotDict):
     - в случае консистентности указателей текстовки копируются в объекты PageObject и в файл _backup (отсортированными)
     """
 
+    __backup_digest = None
+    """sha256 содержимого, уже записанного в файлы _backup в текущем процессе"""
+
     def __init__(self, lang: str, allow_tags=False):
         if allow_tags is not None:
             locale_data = read_locale_file(lang, allow_tags)
@@ -27,13 +31,25 @@ class Locale(DotDict):
     def __write_locale(self) -> None:
         """
         Метод записывает содержимое locale, определяющей локализацию текущей сессии в JSON и YAML файлы
+        - файлы перезаписываются только при изменении содержимого
         """
         json_path = path.join(LOCALES_PATH, "locale_backup.json")
         yaml_path = path.join(LOCALES_PATH, "locale_backup.yaml")
+        content = json.dumps(self, indent=4, sort_keys=True, ensure_ascii=False)
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        if digest == Locale.__backup_digest:
+            return
+        if path.exists(json_path) and path.exists(yaml_path):
+            with open(json_path, 'rt', encoding='UTF-8') as file:
+                if file.read() == content:
+                    Locale.__backup_digest = digest
+                    return
+
         with open(json_path, 'w', encoding='UTF-8') as file:
-            file.write(json.dumps(self, indent=4, sort_keys=True, ensure_ascii=False))
+            file.write(content)
         with open(yaml_path, 'w', encoding='UTF-8') as file:
             file.write(yaml.dump(self, indent=4, sort_keys=True, allow_unicode=True, default_flow_style=False))
+        Locale.__backup_digest = digest
 
     def update_locale(self, lang: str) -> None:
         """
@@ -70,6 +86,7 @@ class Locale(DotDict):
                         print(prefix)
                         raise KeyError(prefix, lookup_report())
             page.locale = self.get(page.__name__)
+            page.build_selector_index() if page.locale else None
 
         print(
             f"OS Locale:\t{Config(update_file=True).os_language}{linesep}" f"UI Locale:\t{lang}{linesep * 2}{'*' * 80}"
@@ -0,0 +1,165 @@
+from os import linesep
+from typing import NamedTuple, Optional
+
+from selenium.common.exceptions import JavascriptException, StaleElementReferenceException
+from selenium.webdriver.common.by import By
+
+from Utils import lookup_report
+from WebDriver import Scripts
+from WebDriver.Instrumentation import instrumented
+from WebDriver.WebElement import WebElement, fast_fill
+
+
+class Step(NamedTuple):
+    """Шаг пакета действий над элементом страницы"""
+
+    action: str
+    selector: str
+    text: Optional[str] = None
+    clear: bool = True
+    typing_speed_delay: None | int | float | str | bool = None
+
+
+class ActionBatch:
+    """
+    Пакет шагов PageObject (ввод, проверка текста и доступности, клик), выполняемый за минимум команд WebDriver
+    - подряд идущие шаги без навигации выполняются в браузере одним скриптом (Scripts.BATCH)
+    - клик и ввод с клавиатуры (посимвольный или при выключенном WebElement.FAST_FILL) выполняются командами
+      WebDriver над элементом, найденным тем же скриптом
+    - шаг, не выполненный скриптом (элемент еще не появился, текст не совпал), повторяется методом BaseMethods
+      с его ожиданиями и сообщением об ошибке (alert), после чего пакет продолжается со следующего шага
+    Использование:
+        with page.batch() as batch:
+            batch.fill(selector, text).verify_text(selector, text).click(selector)
+    """
+
+    def __init__(self, page, driver) -> None:
+        self.__page = page
+        """:type PageObject.BaseMethods.BaseMethods"""
+        self.__driver = driver
+        """:type WebDriver.WebDriver.WebDriver"""
+        self.__steps: list[Step] = []
+
+    def __enter__(self) -> 'ActionBatch':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        __tracebackhide__ = True  # pylint: disable=unused-variable
+        if exc_type is None:
+            self.run()
+
+    def fill(
+        self, selector: str, text: str, clear=True, typing_speed_delay=None, fast: Optional[bool] = None
+    ) -> 'ActionBatch':
+        """
+        Шаг заполнения поля ввода текстом (см. BaseMethods.fill_text_input_field): блочный ввод скриптом выполняется
+        в пакете, ввод с клавиатуры - командами WebDriver
+        """
+        action = 'fill' if fast_fill(fast) and not typing_speed_delay else 'type'
+        self.__steps.append(Step(action, selector, str(text), clear, typing_speed_delay))
+        return self
+
+    def verify_text(self, selector: str, text: str) -> 'ActionBatch':
+        """
+        Шаг проверки текста в наименовании элемента (см. BaseMethods.check_element_label_text)
+        """
+        self.__steps.append(Step('text', selector, text))
+        return self
+
+    def verify_availability(self, selector: str, enabled=False, disabled=False) -> 'ActionBatch':
+        """
+        Шаг проверки доступности элемента (см. BaseMethods.verify_element_availability)
+        """
+        if enabled == disabled:
+            raise LookupError(
+                lookup_report(
+                    f"{linesep}* ActionBatch: шаг проверки доступности `{selector}` предусматривает ОДНО и только ОДНО "
+                    f"правило валидации.{linesep}* Получено же: (enabled={enabled}, disabled={disabled})"
+                )
+            )
+        self.__steps.append(Step('enabled' if enabled else 'disabled', selector))
+        return self
+
+    def click(self, selector: str) -> 'ActionBatch':
+        """
+        Шаг клика по элементу (см. BaseMethods.click_on_element)
+        """
+        self.__steps.append(Step('click', selector))
+        return self
+
+    @instrumented
+    def run(self) -> None:
+        """
+        Метод выполнения накопленных шагов (при использовании как контекстного менеджера вызывается на выходе)
+        """
+        __tracebackhide__ = True  # pylint: disable=unused-variable
+        steps, self.__steps = self.__steps, []
+        index = 0
+        while index < len(steps):
+            done, element = self.__execute(steps[index:])
+            index += done
+            if index == len(steps):
+                break
+            if element is None or not self.__perform(steps[index], element):
+                self.__fallback(steps[index])
+            index += 1
+
+    def __execute(self, steps: list[Step]) -> tuple[int, Optional[WebElement]]:
+        """
+        Выполнение шагов скриптом до первого шага, требующего команды WebDriver, или до первой неудачи
+        :return: tuple: (число выполненных шагов, элемент для следующего шага | None)
+        """
+        self.__driver.wait_interactive_ready_state()
+        payload = [[step.action, step.selector, step.text, step.clear] for step in steps]
+        try:
+            result = self.__driver.execute_script(Scripts.BATCH, payload, Scripts.NOT_INSTALLED)
+            if result == Scripts.NOT_INSTALLED:
+                self.__driver.execute_script(Scripts.install_helpers())
+                result = self.__driver.execute_script(Scripts.BATCH, payload, Scripts.NOT_INSTALLED)
+        except JavascriptException:
+            return 0, None
+        if result == Scripts.NOT_INSTALLED:
+            return 0, None
+
+        done, found = result
+        if found is None:
+            return done, None
+        locator = (self.__driver, By.CSS_SELECTOR, steps[done].selector, True)
+        return done, WebElement(found, self.__driver.driver, locator=locator)
+
+    def __perform(self, step: Step, element: WebElement) -> bool:
+        """
+        Выполнение шага командой WebDriver над элементом, найденным скриптом
+        :return: bool: False - шаг нужно выполнить методом BaseMethods
+        """
+        try:
+            if step.action == 'click':
+                element.click()
+            else:
+                element.fill(step.text, clear=step.clear, typing_speed_delay=step.typing_speed_delay, fast=False)
+        except StaleElementReferenceException:
+            return False
+        return True
+
+    def __fallback(self, step: Step) -> None:
+        """
+        Выполнение шага методом BaseMethods: ожидание элемента/условия и сообщение об ошибке (alert)
+        """
+        __tracebackhide__ = True  # pylint: disable=unused-variable
+        page = self.__page
+        if step.action in ('fill', 'type'):
+            page.fill_text_input_field(
+                step.selector,
+                step.text,
+                clear=step.clear,
+                typing_speed_delay=step.typing_speed_delay,
+                fast=step.action == 'fill',
+            )
+        elif step.action == 'text':
+            page.check_element_label_text(step.selector, step.text)
+        elif step.action == 'click':
+            page.click_on_element(step.selector)
+        else:
+            page.verify_element_availability(
+                step.selector, enabled=step.action == 'enabled', disabled=step.action == 'disabled'
+            )
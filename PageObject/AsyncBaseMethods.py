@@ -0,0 +1,168 @@
+from os import linesep
+from typing import Optional
+
+from PageObject.BaseMethods import BaseMethods
+from Utils import ErrorContext, lookup_report
+from Utils.DotDict import DotDict
+from WebDriver.AsyncWebDriver import AsyncWebDriver, AsyncWebElement
+
+
+class AsyncBaseMethods:
+    """
+    Класс, содержащий асинхронные варианты методов BaseMethods для страниц PageObject
+    - селекторы, локализация и имена ключей берутся у синхронного PageObject, указанного в PAGE
+    - действия выполняются через AsyncWebDriver: несколько страниц (сессий) обрабатываются в одном event loop
+    """
+
+    # <editor-fold desc="CONSTANTS">
+    MAX_WAIT_TIME = BaseMethods.MAX_WAIT_TIME
+    PAGE: type[BaseMethods]
+
+    # </editor-fold desc="Constants">
+
+    def __new__(cls, *args, **kwargs):
+        if cls is AsyncBaseMethods:
+            raise TypeError(f"Класс `{cls.__name__}` не предусматривает создание экземпляра")
+        return object.__new__(cls)
+
+    def __init__(self, driver: AsyncWebDriver):
+        self.__driver = driver
+        self.__page = self.PAGE(None)
+
+    @property
+    def SELECTORS(self) -> dict:  # pylint: disable=invalid-name
+        """
+        Свойство возвращает селекторы синхронного PageObject
+        :return: dict
+        """
+        return self.__page.SELECTORS
+
+    @property
+    def locale(self) -> DotDict:
+        """
+        Свойство возвращает словарь с текстами элементов синхронного PageObject на выбранном языке
+        :return: dict: DotDict
+        """
+        return self.__page.locale
+
+    def get_name(self, val: str) -> str:
+        """
+        Метод поиска имени ключа по значению (см. BaseMethods.get_name)
+        """
+        __tracebackhide__ = True  # pylint: disable=unused-variable
+        return self.__page.get_name(val)
+
+    async def alert(self, **kwargs: dict | str | int | bool) -> ErrorContext:
+        """
+        Метод формирования текста сообщения об ошибке (см. BaseMethods.alert)
+        """
+        __tracebackhide__ = True  # pylint: disable=unused-variable
+        return self.__page.alert(await self.__driver.current_url(), **kwargs)
+
+    async def find_element(self, selector: str, timeout=MAX_WAIT_TIME) -> Optional[AsyncWebElement]:
+        """
+        Метод поиска WebElement в DOM по css-селектору
+        :param selector: str: значение селектора для выполнения действия
+        :param timeout: таймер ожидания
+        :return: AsyncWebElement or None
+        """
+        return await self.__driver.find_element_by_css_selector(selector, timeout=timeout)
+
+    async def click_on_element(self, selector: str) -> None:
+        """
+        Метод для клика по элементу
+        :param selector: str: значение селектора для выполнения действия
+        """
+        selector_name = self.get_name(selector)
+        element = await self.__driver.find_element_by_css_selector(selector)
+
+        assert element, str(await self.alert(name=selector_name, selector=selector))
+        await element.click()
+
+    async def fill_text_input_field(self, selector: str, text: str, clear=True) -> None:
+        """
+        Метод заполнения поля ввода текстом (текст вводится блоком)
+        :param selector: str: значение селектора для выполнения действия
+        :param text: str: текст для ввода
+        :param clear: bool: очистить поле перед вводом
+        """
+        selector_name = self.get_name(selector)
+        input_field = await self.__driver.find_element_by_css_selector(selector)
+
+        assert input_field, str(await self.alert(name=selector_name, selector=selector))
+        await input_field.fill(text, clear=clear)
+
+    async def check_element_label_text(self, selector: str, text: str) -> AsyncWebElement:
+        """
+        Метод проверки текста в наименовании элемента
+        :param selector: str: значение селектора для выполнения действия
+        :param text: str: текст для проверки
+        """
+        selector_name = self.get_name(selector)
+        text_name = self.get_name(text)
+        element = await self.__driver.find_element_by_css_selector(selector, timeout=self.MAX_WAIT_TIME)
+
+        assert element, str(await self.alert(name=selector_name, selector=selector))
+        assert await element.text() == text, str(await self.alert(name=text_name, text=text))
+
+        return element
+
+    async def wait_until_element_disappeared(self, selector: str, timeout=MAX_WAIT_TIME) -> bool:
+        """
+        Метод проверки, что WebElement, существующий на странице исчезнет за определенное время
+        :param selector: str: значение селектора для выполнения действия
+        :param timeout: int: ограничение времени ожидания
+        :return: True или AssertionError
+        """
+        selector_name = self.get_name(selector)
+        result = await self.__driver.wait_for_element_to_disappear(selector, timeout=timeout)
+
+        assert result, str(await self.alert(name=selector_name, selector=selector, timeout=timeout))
+        return result
+
+    async def check_page_title_exists(
+        self, contains_text: str, timeout=MAX_WAIT_TIME, message: Optional[str] = None, alert: bool = True
+    ) -> bool:
+        """
+        Метод проверки `PageTitle` заголовка закладки страницы браузера на `ContainsText`
+         (или ждать его появления по `Timeout`)
+        :param contains_text: str: значение поисковой фразы
+        :param timeout: int | float: время ожидания появления заголовка (сек)
+        :param message: str: текст сообщения при отсутствии совпадения (не зависит от :param alert)
+        :param alert: bool: вызывать/не вызывать AssertionError при отсутствии совпадения
+        :return: result: bool или AssertionError
+        """
+        result = await self.__driver.wait_title_contains(contains_text, timeout=timeout)
+        if not result:
+            print(
+                message
+                or f"{linesep}INFO:\tОжидание страницы по адресу {await self.__driver.current_url()}"
+                f" с PageTitle: `{contains_text}` превысило отведенное время: {timeout} сек"
+            )
+        if alert:
+            text_name = self.get_name(contains_text)
+            assert result, str(await self.alert(name=text_name, text=contains_text))
+
+        return result
+
+    async def verify_element_availability(self, selector: str, enabled=False, disabled=False) -> bool:
+        """
+        Метод проверки WebElement на возможность с ним взаимодействовать (см. BaseMethods.verify_element_availability)
+        :return: True или AssertionError
+        """
+        if all([enabled, disabled]) or all([not enabled, not disabled]):
+            raise LookupError(
+                lookup_report(
+                    f"{linesep}* PageObject: `{self.__class__.__name__}`: "
+                    f"Вызываемый метод предусматривает обязательное наличие на входе ОДНОГО и только ОДНОГО правила "
+                    f"валидации.{linesep}* Получено же в параметрах вызова: (enabled={enabled}, disabled={disabled})"
+                )
+            )
+        selector_name = self.get_name(selector)
+        element = await self.__driver.find_element_by_css_selector(selector)
+        assert element, str(await self.alert(name=selector_name, selector=selector))
+
+        is_disabled = await element.is_disabled()
+        result = not is_disabled if enabled else is_disabled
+        assert result, str(await self.alert(name=selector_name, selector=selector, enabled=enabled, disabled=disabled))
+        return result
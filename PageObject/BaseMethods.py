@@ -1,16 +1,20 @@
 from os import linesep, path
-from time import sleep
-from typing import Optional
+from time import perf_counter, sleep
+from typing import Any, Callable, Optional
 
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver import ActionChains
 from selenium.webdriver.support import expected_conditions as ec
 from selenium.webdriver.support.ui import WebDriverWait
 
-import Locales
 import WebDriver.WebDriver
-from Utils import lookup_report
+import WebDriver.WebElement
+from PageObject.ActionBatch import ActionBatch
+from Utils import LOCALES_PATH, ErrorContext, lookup_report
 from Utils.DotDict import DotDict
+from WebDriver.Instrumentation import instrumented
+from WebDriver.WaitHistory import WAIT_HISTORY
+from WebDriver.WebBase import ABSENCE_WINDOW, TIMEOUT_STEP
 
 
 class BaseMethods:
@@ -32,6 +36,9 @@ class BaseMethods:
         """:type WebDriver.WebDriver.WebDriver"""
         self.__locale = None
         """:type Locales.Locale"""
+        self.__handles: dict[str, WebDriver.WebElement.WebElement] = {}
+        """Кэш найденных элементов страницы по селектору (действителен в пределах одного WebDriver.generation)"""
+        self.__handles_generation = None
 
     @classmethod
     def get_all_subclasses(cls) -> iter:
@@ -61,28 +68,85 @@ class BaseMethods:
         :param val: str: значение ключа в словаре селекторов класса
         :return: key: str: имя ключа
         """
-        prefix = f"{linesep}{' ! ОШИБКА В СЕЛЕКТОРЕ ! ':*^145}" f"{linesep}* PageObject `{self.__class__.__name__}`: "
         if not isinstance(val, str):
             raise TypeError(
-                f"{prefix}При вызове метода задано значение `{val}` для поиска имени селектора в словаре: "
-                f"{linesep}* {self.SELECTORS.items()}{lookup_report()}"
+                lookup_report(
+                    f"{self.__selector_error_prefix()}При вызове метода задано значение `{val}` для поиска имени "
+                    f"селектора в словаре: {linesep}* {self.SELECTORS.items()}"
+                )
             )
         if self.locale:
-            for key, value in dict(self.SELECTORS | self.locale).items():
-                if val == value:
-                    return key
+            key = self.selector_index().get(val)
+            if key is not None:
+                return key
         else:
             raise FileExistsError(
-                f"{linesep}Файл локализации для требуемого тестом языка `{path.relpath(Locales.LOCALES_PATH)}"
-                f"/<language>/saymon_<language>.yml` пуст, проверьте содержимое файла!{lookup_report()}"
+                lookup_report(
+                    f"{linesep}Файл локализации для требуемого тестом языка `{path.relpath(LOCALES_PATH)}"
+                    f"/<language>/saymon_<language>.yml` пуст, проверьте содержимое файла!"
+                )
+            )
+        raise KeyError(
+            lookup_report(
+                f"{self.__selector_error_prefix()}Ключ для значения `{val}` отсутствует в словаре {self.SELECTORS}"
+            )
+        )
+
+    @classmethod
+    def build_selector_index(cls) -> dict[str, str]:
+        """
+        Метод построения обратного индекса (значение -> имя ключа) по селекторам и текстам локализации страницы
+        - строится один раз при назначении `locale` странице (Locale.update_locale)
+        - перестраивается при смене locale страницы
+        - значения, соответствующие нескольким ключам, выявляются при построении (неоднозначный get_name)
+        :return: dict: обратный индекс
+        """
+        locales = getattr(cls, 'LOCALES', [])
+        merged = dict(cls.SELECTORS | dict(zip(locales, locales)) | cls.locale)
+        index: dict[str, str] = {}
+        ambiguous: dict[str, list[str]] = {}
+        for key, value in merged.items():
+            if not isinstance(value, str):
+                continue
+            if value in index:
+                ambiguous.setdefault(value, [index[value]]).append(key)
+                continue
+            index[value] = key
+        if ambiguous:
+            raise KeyError(
+                lookup_report(
+                    f"{linesep}{' ! ОШИБКА В СЕЛЕКТОРЕ ! ':*^145}{linesep}* PageObject `{cls.__name__}`: "
+                    f"Одинаковые значения у разных ключей селекторов/локализации - поиск имени ключа неоднозначен: "
+                    f"{linesep}* {ambiguous}"
+                )
             )
-        raise KeyError(f"{prefix}Ключ для значения `{val}` отсутствует в словаре {self.SELECTORS}{lookup_report()}")
+        cls._selector_index = (cls.locale, index)
+        return index
+
+    def selector_index(self) -> dict[str, str]:
+        """
+        Метод возвращает обратный индекс страницы для текущей locale (см. build_selector_index)
+        :return: dict: обратный индекс
+        """
+        built = vars(self.__class__).get('_selector_index')
+        if built and built[0] is self.locale:
+            return built[1]
+        return self.build_selector_index()
+
+    def __selector_error_prefix(self) -> str:
+        """
+        Заголовок сообщения об ошибке в селекторе (строится только при ошибке)
+        """
+        return f"{linesep}{' ! ОШИБКА В СЕЛЕКТОРЕ ! ':*^145}{linesep}* PageObject `{self.__class__.__name__}`: "
 
-    def alert(self, **kwargs: dict | str | int | bool) -> str:
+    def alert(self, url: Optional[str] = None, **kwargs: dict | str | int | bool) -> ErrorContext:
         """
-        Метод формирования текста сообщения об ошибке при поиске WebElement на странице и оценки его атрибутов
+        Метод формирования сообщения об ошибке при поиске WebElement на странице и оценки его атрибутов
+        - отчет об ошибке (см. lookup_report) формируется и печатается только при выводе сообщения; в assert
+          передается str(...): pytest обрезает repr сообщений, не являющихся строкой
+        :param url: str: адрес страницы (по умолчанию - текущий адрес в браузере)
         :param kwargs: dict: ограниченный набор ключевых слов для составления фразы
-        :return: alert: str: фраза с детализацией по ошибке
+        :return: alert: ErrorContext: фраза с детализацией по ошибке (str-совместимый объект)
         """
         page = self.__class__.__name__
         prefix1 = prefix2 = ''
@@ -115,28 +179,121 @@ class BaseMethods:
                 prefix2 = f"-\tне исчез за {value} секунд"
             else:
                 raise NameError(
-                    f"{linesep}{' ! ОШИБКА В ПАРАМЕТРЕ ! ':*^145}{linesep}* PageObject `{page}`: "
-                    f"Проверьте имена параметров в {kwargs.keys()} - какой-то из них не предусмотрен для обработки "
-                    f"вызываемым методом{lookup_report()}"
+                    lookup_report(
+                        f"{linesep}{' ! ОШИБКА В ПАРАМЕТРЕ ! ':*^145}{linesep}* PageObject `{page}`: "
+                        f"Проверьте имена параметров в {kwargs.keys()} - какой-то из них не предусмотрен для "
+                        f"обработки вызываемым методом"
+                    )
                 )
 
-        return (
+        return lookup_report(
             f"{linesep}{' ! ОШИБКА В ЛОКАТОРЕ ! ':*^145}{linesep}* PageObject `{page}` по адресу "
-            f"{self.__driver.current_url}{linesep}*\tWebElement:\t`{params['name']}`\t"
-            f"{prefix1}:\t`{kwargs[params['param']]}`\t{prefix2} !{lookup_report()}"
+            f"{url or self.__driver.current_url}{linesep}*\tWebElement:\t`{params['name']}`\t"
+            f"{prefix1}:\t`{kwargs[params['param']]}`\t{prefix2} !"
         )
 
-    def find_element(self, selector: str, timeout=MAX_WAIT_TIME) -> Optional[WebDriver.WebDriver.WebDriver]:
+    def batch(self) -> ActionBatch:
+        """
+        Метод создания пакета шагов (ввод, проверки текста и доступности, клики), выполняемого за минимум команд
+        WebDriver; ошибки шагов формируются методами BaseMethods (см. ActionBatch)
+        :return: ActionBatch
+        """
+        return ActionBatch(self, self.__driver)
+
+    def __element(self, selector: str, timeout=MAX_WAIT_TIME) -> Optional[WebDriver.WebElement.WebElement]:
+        """
+        Поиск WebElement по css-селектору через кэш страницы: пока в браузере не было действий, способных изменить DOM
+        (WebDriver.generation не изменился), повторный поиск селектора возвращает найденный ранее элемент без команд
+        WebDriver; устаревший элемент ищется заново по локатору (см. WebElement.relocate)
+        :param selector: str: значение селектора
+        :param timeout: таймер ожидания
+        :return: WebElement or None
+        """
+        generation = getattr(self.__driver, 'generation', None)
+        if generation != self.__handles_generation:
+            self.__handles = {}
+            self.__handles_generation = generation
+
+        element = self.__handles.get(selector)
+        if element is None:
+            element = self.__timed_wait(
+                selector,
+                timeout,
+                lambda limit, poll: self.__driver.find_element_by_css_selector(
+                    selector, timeout=limit, poll_frequency=poll
+                ),
+            )
+            if element is not None and generation is not None:
+                self.__handles[selector] = element
+        return element
+
+    @instrumented
+    def find_element(
+        self, selector: str, timeout=MAX_WAIT_TIME, observer=False
+    ) -> Optional[WebDriver.WebDriver.WebDriver]:
         """
         Метод поиска WebElement в DOM по css-селектору
         :param selector: str: значение селектора для выполнения действия
         :param timeout: таймер ожидания
+        :param observer: bool: событийное ожидание появления элемента вместо поллинга
         :return: WebElement or None
         """
-        element = self.__driver.find_element_by_css_selector(selector, timeout=timeout)
+        element = self.__timed_wait(
+            selector,
+            timeout,
+            lambda limit, poll: self.__driver.find_element_by_css_selector(
+                selector, timeout=limit, observer=observer, poll_frequency=poll
+            ),
+        )
 
         return element
 
+    @instrumented
+    def exists_now(self, selector: str) -> Optional[WebDriver.WebElement.WebElement]:
+        """
+        Метод проверки наличия видимого WebElement без ожидания (одна команда WebDriver, см. WebBase.exists_now)
+        :param selector: str: значение селектора
+        :return: WebElement or None
+        """
+        return self.__driver.exists_now(selector)
+
+    @instrumented
+    def absent_within(self, selector: str, window=ABSENCE_WINDOW) -> bool:
+        """
+        Метод проверки, что видимый WebElement не появится на странице за окно стабильности (см. WebBase.absent_within)
+        :param selector: str: значение селектора
+        :param window: int | float: окно стабильности (сек)
+        :return: bool: True - элемента нет, False - элемент появился
+        """
+        return self.__driver.absent_within(selector, window)
+
+    def __timed_wait(
+        self, target: str, timeout: float | int, wait: Callable[[float | int, float], Any], probe: bool = False
+    ) -> Any:
+        """
+        Ожидание с интервалом поллинга по истории длительности ожиданий (PageObject, target) и записью его
+        длительности (config: waits, см. WaitHistory): ожидание идет до таймаута вызова, превышение ожидаемого
+        порога из p99 не прерывает его, а отмечается в истории; проба прерывается на ожидаемом пороге
+        :param target: str: селектор или условие ожидания
+        :param timeout: float | int: таймаут, заданный в вызове
+        :param wait: callable: (таймаут, интервал поллинга) -> результат (None | False - не дождались)
+        :param probe: bool: отрицательный исход допустим и обрабатывается вызывающим (ранний отказ по порогу)
+        :return: результат ожидания
+        """
+        if not WAIT_HISTORY.enabled:
+            return wait(timeout, TIMEOUT_STEP)
+
+        key = WAIT_HISTORY.key(self.__class__.__name__, target)
+        limit, poll = WAIT_HISTORY.limits(key, timeout, probe)
+        started = perf_counter()
+        result = None
+        try:
+            result = wait(limit, poll)
+        finally:
+            WAIT_HISTORY.record(key, perf_counter() - started, bool(result), cutoff=limit < timeout)
+        return result
+
+    @instrumented
     def click_on_element(self, selector: str) -> None:
         """
         Метод для клика по элементу
@@ -144,12 +301,15 @@ class BaseMethods:
         """
         selector_name = self.get_name(selector)
 
-        element = self.__driver.find_element_by_css_selector(selector)
+        element = self.__element(selector)
 
-        assert element, self.alert(name=selector_name, selector=selector)
+        assert element, str(self.alert(name=selector_name, selector=selector))
         element.click()
 
-    def fill_text_input_field(self, selector: str, text: str, clear=True, typing_speed_delay=None) -> None:
+    @instrumented
+    def fill_text_input_field(
+        self, selector: str, text: str, clear=True, typing_speed_delay=None, fast: Optional[bool] = None
+    ) -> None:
         """
         Метод заполнения поля ввода текстом
         :param selector: str: значение селектора для выполнения действия
@@ -159,14 +319,16 @@ class BaseMethods:
             - None: ввод текста блоком
             - int/float: ввод текста посимвольно с заданной фиксированной задержкой в секундах
             - str/bool: ввод текста посимвольно с переменной задержкой (см. метод:fill)
+        :param fast: bool: блочный ввод скриптом вместо ввода с клавиатуры (None - по умолчанию WebElement.FAST_FILL)
         """
         selector_name: str = self.get_name(selector)
 
-        input_field = self.__driver.find_element_by_css_selector(selector)
+        input_field = self.__element(selector)
 
-        assert input_field, self.alert(name=selector_name, selector=selector)
-        input_field.fill(text, clear=clear, typing_speed_delay=typing_speed_delay)
+        assert input_field, str(self.alert(name=selector_name, selector=selector))
+        input_field.fill(text, clear=clear, typing_speed_delay=typing_speed_delay, fast=fast)
 
+    @instrumented
     def check_element_label_text(self, selector: str, text: str) -> WebDriver:
         """
         Метод проверки текста в наименовании элемента
@@ -177,13 +339,33 @@ class BaseMethods:
         text_name = self.get_name(text)
 
         self.wait_for_element_is_visible(selector_name=selector_name, selector_value=selector)
-        element = self.__driver.find_element_by_css_selector(selector)
+        element = self.__element(selector)
 
-        assert element, self.alert(name=selector_name, selector=selector)
-        assert element.text == text, self.alert(name=text_name, text=text)
+        assert element, str(self.alert(name=selector_name, selector=selector))
+        assert element.text == text, str(self.alert(name=text_name, text=text))
 
         return element
 
+    @instrumented
+    def verify_element_state(
+        self, selector: str, condition: str, expected=None, attribute: Optional[str] = None, timeout=MAX_WAIT_TIME
+    ) -> WebDriver:
+        """
+        Метод проверки состояния WebElement с ожиданием: возврат сразу, как только условие выполнено
+        :param selector: str: значение селектора для выполнения действия
+        :param condition: str: 'value' | 'text' | 'attribute' | 'class' | 'enabled' | 'disabled'
+        :param expected: ожидаемое значение ('value', 'text', 'attribute') или имя класса ('class')
+        :param attribute: str: имя атрибута для condition='attribute'
+        :param timeout: int | float: время ожидания выполнения условия (сек)
+        :return: element или AssertionError
+        """
+        selector_name = self.get_name(selector)
+        element = self.__element(selector, timeout=timeout)
+
+        assert element, str(self.alert(name=selector_name, selector=selector))
+        return element.verify_condition(condition, expected, attribute=attribute, timeout=timeout)
+
+    @instrumented
     def dropdown_item_select(self, item_selector: str) -> None:
         """
         Метод выбора пункта из выпадающего списка 'DropdownList' по селектору
@@ -192,11 +374,12 @@ class BaseMethods:
         """
         selector_name: str = self.get_name(item_selector)
 
-        item = self.__driver.find_element_by_css_selector(item_selector)
+        item = self.__element(item_selector)
 
-        assert item, self.alert(name=selector_name, selector=item_selector)
+        assert item, str(self.alert(name=selector_name, selector=item_selector))
         item.click()
 
+    @instrumented
     def wait_for_tooltip_is_visible(
         self,
         tooltip_selector: str,
@@ -231,6 +414,7 @@ class BaseMethods:
         actions.move_by_offset((element.rect['width'] / 2 + 10) * -1, 0).perform()
         actions.click().perform()
 
+    @instrumented
     def wait_for_element_is_visible(
         self, element=None, selector_name=None, selector_value=None, obj=None, timeout=MAX_WAIT_TIME
     ) -> WebDriver:
@@ -241,13 +425,17 @@ class BaseMethods:
         """
         selector_name = self.get_name(selector_value) if not selector_name else selector_name
         selector_value = self.SELECTORS[selector_name] if not selector_value else selector_value
-        driver = obj if obj else self.__driver
         if not element:
-            element = driver.find_element_by_css_selector(selector_value, timeout=timeout)
-        assert element, self.alert(name=selector_name, selector=selector_value)
+            element = (
+                obj.find_element_by_css_selector(selector_value, timeout=timeout)
+                if obj
+                else self.__element(selector_value, timeout=timeout)
+            )
+        assert element, str(self.alert(name=selector_name, selector=selector_value))
 
         return element
 
+    @instrumented
     def wait_for_element_is_not_visible(
         self, element=None, element_selector=None, element_name=None, obj=None, timeout=MAX_WAIT_TIME
     ) -> None:
@@ -262,23 +450,39 @@ class BaseMethods:
             element_name if element_name else element_selector
         )
 
-    def wait_until_element_disappeared(self, selector: str, timeout=MAX_WAIT_TIME) -> bool:
+    @instrumented
+    def wait_until_element_disappeared(self, selector: str, timeout=MAX_WAIT_TIME, observer=False) -> bool:
         """
         Метод проверки, что WebElement, существующий на странице исчезнет за определенное время
         :param selector: str: значение селектора для выполнения действия
         :param timeout: int: ограничение времени ожидания
+        :param observer: bool: событийное ожидание удаления элемента из DOM вместо поллинга WebDriverWait
         :return: result:
             - True: - требование удовлетворено - bool:
             - AssertionError: - требование не удовлетворено
         """
         selector_name: str = self.get_name(selector)
         element = self.__driver.find_element_by_css_selector(selector, timeout=timeout)
+        # Ожидание идет по исходной ссылке selenium: WebElement-обертка нашла бы устаревший элемент заново по локатору
+        element = getattr(element, 'elem', element)
 
-        result = WebDriverWait(self.__driver, timeout).until(
-            ec.staleness_of(element), message=self.alert(name=selector_name, selector=selector, timeout=timeout)
-        )
+        if observer:
+            result = self.__driver.wait_for_dom_state(selector, 'detached', timeout, element=element)
+            if result is not None:
+                assert result, str(self.alert(name=selector_name, selector=selector, timeout=timeout))
+                return result
+
+        try:
+            result = self.__timed_wait(
+                f"{selector} detached",
+                timeout,
+                lambda limit, poll: WebDriverWait(self.__driver, limit, poll).until(ec.staleness_of(element)),
+            )
+        except TimeoutException as error:
+            raise TimeoutException(self.alert(name=selector_name, selector=selector, timeout=timeout)) from error
         return result
 
+    @instrumented
     def select_checkbox_by_text(self, label_selector: str, checkbox_selector: str, text: str) -> None:
         """
         Найти чекбокс по имени и выбрать его
@@ -292,6 +496,7 @@ class BaseMethods:
             if text in item.text:
                 checkbox.click()
 
+    @instrumented
     def check_page_title_exists(
         self,
         contains_text: str,
@@ -322,15 +527,23 @@ class BaseMethods:
         sleep(delay) if delay else None
 
         try:
-            result = WebDriverWait(self.__driver, timeout).until(ec.title_contains(contains_text), message=message)
+            result = self.__timed_wait(
+                f"title:{contains_text}",
+                timeout,
+                lambda limit, poll: WebDriverWait(self.__driver, limit, poll).until(
+                    ec.title_contains(contains_text), message=message
+                ),
+                probe=not alert,
+            )
         except TimeoutException as e:
             print(str(e))
         if alert:
             text_name = self.get_name(contains_text)
-            assert result, self.alert(name=text_name, text=contains_text)
+            assert result, str(self.alert(name=text_name, text=contains_text))
 
         return result
 
+    @instrumented
     def verify_element_availability(self, selector: str, enabled=False, disabled=False) -> bool:
         """
         Метод проверки WebElement на возможность с ним взаимодействовать:
@@ -346,20 +559,21 @@ class BaseMethods:
             - AssertionError: - правило не удовлетворено
         """
         selector_name: str = self.get_name(selector)
-        element = self.__driver.find_element_by_css_selector(selector)
-        assert element, self.alert(name=selector_name, selector=selector)
+        element = self.__element(selector)
+        assert element, str(self.alert(name=selector_name, selector=selector))
 
         result: Optional[bool] = None
         if all([enabled, disabled]) or all([not enabled, not disabled]):
             raise LookupError(
-                f"{linesep}* PageObject: `{self.__class__.__name__}`: "
-                f"Вызываемый метод предусматривает обязательное наличие на входе ОДНОГО и только ОДНОГО правила "
-                f"валидации.{linesep}* Получено же в параметрах вызова: (enabled={enabled}, disabled={disabled})"
-                f"{lookup_report()}"
+                lookup_report(
+                    f"{linesep}* PageObject: `{self.__class__.__name__}`: "
+                    f"Вызываемый метод предусматривает обязательное наличие на входе ОДНОГО и только ОДНОГО правила "
+                    f"валидации.{linesep}* Получено же в параметрах вызова: (enabled={enabled}, disabled={disabled})"
+                )
             )
         if enabled:
             result = not element.is_disabled()
         elif disabled:
             result = element.is_disabled()
-        assert result, self.alert(name=selector_name, selector=selector, enabled=enabled, disabled=disabled)
+        assert result, str(self.alert(name=selector_name, selector=selector, enabled=enabled, disabled=disabled))
         return result
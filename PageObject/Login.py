@@ -1,3 +1,6 @@
+import asyncio
+
+from PageObject.AsyncBaseMethods import AsyncBaseMethods
 from PageObject.BaseMethods import BaseMethods
 from Utils.DotDict import DotDict
 
@@ -50,11 +53,12 @@ class LoginScreen(BaseMethods):
         :param language: str: язык интерфейса SAYMON UI
         """
         load_time = 60
-        loading = self.find_element(self.SELECTORS['LOADING_DOTS'], timeout=0.5)
+        loading = self.exists_now(self.SELECTORS['LOADING_DOTS'])
         self.wait_until_element_disappeared(self.SELECTORS['LOADING_DOTS'], timeout=load_time) if loading else None
-        if self.find_element(self.SELECTORS['SUPPORT'], timeout=0.5):
+        support = self.exists_now(self.SELECTORS['SUPPORT'])
+        if support:
             raise ConnectionRefusedError(
-                f"Сервер по адресу {loading.driver.current_url} не отвечал на ping в течение {load_time} сек"
+                f"Сервер по адресу {support.driver.current_url} не отвечал на ping в течение {load_time} сек"
             )
         self.verify_element_availability(self.SELECTORS['TOGGLE_DROPDOWN_LANG'], enabled=True)
         self.click_on_element(self.SELECTORS['TOGGLE_DROPDOWN_LANG'])
@@ -75,12 +79,13 @@ class LoginScreen(BaseMethods):
         - Осуществляет `ВХОД` в SAYMON UI как администратор с учетными данными из config.json
         """
         self.check_page_title_exists(self.locale[self.SELECTORS['TEXT_TITLE_TAB_PAGE']])
-        self.check_element_label_text(
-            self.SELECTORS['TITLE_POPUP_LOGIN'], self.locale[self.SELECTORS['TEXT_TITLE_POPUP_LOGIN']]
-        )
-        self.fill_text_input_field(self.SELECTORS['INPUT_FIELD_LOGIN'], user.login)
-        self.fill_text_input_field(self.SELECTORS['INPUT_FIELD_PASSWORD'], user.password)
-        self.click_on_element(self.SELECTORS['BUTTON_LOGIN'])
+        with self.batch() as batch:
+            batch.verify_text(
+                self.SELECTORS['TITLE_POPUP_LOGIN'], self.locale[self.SELECTORS['TEXT_TITLE_POPUP_LOGIN']]
+            )
+            batch.fill(self.SELECTORS['INPUT_FIELD_LOGIN'], user.login)
+            batch.fill(self.SELECTORS['INPUT_FIELD_PASSWORD'], user.password)
+            batch.click(self.SELECTORS['BUTTON_LOGIN'])
         if self.check_page_title_exists(
             self.locale[self.SELECTORS['TEXT_TITLE_TAB_PAGE']], timeout=0.5, delay=0.5, message=' ', alert=False
         ):
@@ -92,30 +97,87 @@ class LoginScreen(BaseMethods):
         - начальное условие: на странице авторизации имеется ошибка `Invalid login or password`
         :param password: str: новый пароль (из файла config)
         """
-        self.check_element_label_text(
+        with self.batch() as batch:
+            batch.verify_text(
+                self.SELECTORS['TITLE_ERROR_LABEL'], self.locale[self.SELECTORS['TEXT_TITLE_ERROR_LABEL']]
+            )
+            batch.verify_text(
+                self.SELECTORS['MESSAGE_ERROR_LOGIN_INVALID'], self.locale[self.SELECTORS['TEXT_ERROR_LOGIN_INVALID']]
+            )
+            batch.click(self.SELECTORS['BUTTON_CANCEL'])
+            batch.fill(self.SELECTORS['INPUT_FIELD_PASSWORD'], "saymon")
+            batch.click(self.SELECTORS['BUTTON_LOGIN'])
+            batch.verify_text(
+                self.SELECTORS['TITLE_POPUP_LOGIN'], self.locale[self.SELECTORS['TEXT_TITLE_POPUP_NEW_PSW']]
+            )
+            batch.verify_text(
+                self.SELECTORS['TITLE_ERROR_LABEL'], f"{self.locale[self.SELECTORS['TEXT_TITLE_WARNING']]}"
+            )
+            batch.verify_text(
+                self.SELECTORS['MESSAGE_ERROR_LOGIN_INVALID'], self.locale[self.SELECTORS['TEXT_WARNING_PASSWORD_NEW']]
+            )
+            batch.fill(self.SELECTORS['INPUT_FIELD_NEW_PSW'], password)
+            batch.fill(self.SELECTORS['INPUT_FIELD_CONFIRM_PSW'], ' ')
+            batch.verify_availability(self.SELECTORS['BUTTON_SAVE'], disabled=True)
+            batch.verify_text(
+                self.SELECTORS['MESSAGE_WARNING_PSW_MISMATCH'], self.locale[self.SELECTORS['TEXT_WARNING_PSW_MISMATCH']]
+            )
+            batch.fill(self.SELECTORS['INPUT_FIELD_CONFIRM_PSW'], password, typing_speed_delay=False)
+            batch.verify_availability(self.SELECTORS['BUTTON_SAVE'], enabled=True)
+        # self.click_on_element(self.SELECTORS['BUTTON_SAVE'])
+
+
+class AsyncLoginScreen(AsyncBaseMethods):
+    """Асинхронный вариант LoginScreen: селекторы и локализация - у LoginScreen"""
+
+    PAGE = LoginScreen
+
+    async def login(self, user: DotDict) -> None:
+        """
+        Метод обеспечивает тестовую сессию от имени администратора на WEB портале SAYMON UI (см. LoginScreen.login)
+        """
+        await self.check_page_title_exists(self.locale[self.SELECTORS['TEXT_TITLE_TAB_PAGE']])
+        await self.check_element_label_text(
+            self.SELECTORS['TITLE_POPUP_LOGIN'], self.locale[self.SELECTORS['TEXT_TITLE_POPUP_LOGIN']]
+        )
+        await self.fill_text_input_field(self.SELECTORS['INPUT_FIELD_LOGIN'], user.login)
+        await self.fill_text_input_field(self.SELECTORS['INPUT_FIELD_PASSWORD'], user.password)
+        await self.click_on_element(self.SELECTORS['BUTTON_LOGIN'])
+        await asyncio.sleep(0.5)
+        if await self.check_page_title_exists(
+            self.locale[self.SELECTORS['TEXT_TITLE_TAB_PAGE']], timeout=0.5, message=' ', alert=False
+        ):
+            await self.new_installation_setup(user.password)
+
+    async def new_installation_setup(self, password: str) -> None:
+        """
+        Метод смены пароля пользователя `admin` в SAYMON UI при новой установке SAYMON Server
+        (см. LoginScreen.new_installation_setup)
+        :param password: str: новый пароль (из файла config)
+        """
+        await self.check_element_label_text(
             self.SELECTORS['TITLE_ERROR_LABEL'], self.locale[self.SELECTORS['TEXT_TITLE_ERROR_LABEL']]
         )
-        self.check_element_label_text(
+        await self.check_element_label_text(
             self.SELECTORS['MESSAGE_ERROR_LOGIN_INVALID'], self.locale[self.SELECTORS['TEXT_ERROR_LOGIN_INVALID']]
         )
-        self.click_on_element(self.SELECTORS['BUTTON_CANCEL'])
-        self.fill_text_input_field(self.SELECTORS['INPUT_FIELD_PASSWORD'], "saymon")
-        self.click_on_element(self.SELECTORS['BUTTON_LOGIN'])
-        self.check_element_label_text(
+        await self.click_on_element(self.SELECTORS['BUTTON_CANCEL'])
+        await self.fill_text_input_field(self.SELECTORS['INPUT_FIELD_PASSWORD'], "saymon")
+        await self.click_on_element(self.SELECTORS['BUTTON_LOGIN'])
+        await self.check_element_label_text(
             self.SELECTORS['TITLE_POPUP_LOGIN'], self.locale[self.SELECTORS['TEXT_TITLE_POPUP_NEW_PSW']]
         )
-        self.check_element_label_text(
+        await self.check_element_label_text(
             self.SELECTORS['TITLE_ERROR_LABEL'], f"{self.locale[self.SELECTORS['TEXT_TITLE_WARNING']]}"
         )
-        self.check_element_label_text(
+        await self.check_element_label_text(
             self.SELECTORS['MESSAGE_ERROR_LOGIN_INVALID'], self.locale[self.SELECTORS['TEXT_WARNING_PASSWORD_NEW']]
         )
-        self.fill_text_input_field(self.SELECTORS['INPUT_FIELD_NEW_PSW'], password)
-        self.fill_text_input_field(self.SELECTORS['INPUT_FIELD_CONFIRM_PSW'], ' ')
-        self.verify_element_availability(self.SELECTORS['BUTTON_SAVE'], disabled=True)
-        self.check_element_label_text(
+        await self.fill_text_input_field(self.SELECTORS['INPUT_FIELD_NEW_PSW'], password)
+        await self.fill_text_input_field(self.SELECTORS['INPUT_FIELD_CONFIRM_PSW'], ' ')
+        await self.verify_element_availability(self.SELECTORS['BUTTON_SAVE'], disabled=True)
+        await self.check_element_label_text(
             self.SELECTORS['MESSAGE_WARNING_PSW_MISMATCH'], self.locale[self.SELECTORS['TEXT_WARNING_PSW_MISMATCH']]
         )
-        self.fill_text_input_field(self.SELECTORS['INPUT_FIELD_CONFIRM_PSW'], password, typing_speed_delay=False)
-        self.verify_element_availability(self.SELECTORS['BUTTON_SAVE'], enabled=True)
-        # self.click_on_element(self.SELECTORS['BUTTON_SAVE'])
+        await self.fill_text_input_field(self.SELECTORS['INPUT_FIELD_CONFIRM_PSW'], password)
+        await self.verify_element_availability(self.SELECTORS['BUTTON_SAVE'], enabled=True)
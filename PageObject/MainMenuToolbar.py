@@ -41,12 +41,11 @@ class MainMenuToolbar(BaseMethods):
         Метод выхода пользователя и завершения сессии
         """
         url = self.__driver.current_url.replace('/', '').split(':')[-1]
-        if any(text in self.__driver.page_source for text in [url, 'care@saymon.info']):
+        snapshot = self.__driver.snapshot
+        if snapshot.contains(url, 'care@saymon.info'):
             return
         logout = self.to_login_screen()
-        if logout.check_page_title_exists(
-            logout.locale[logout.SELECTORS['TEXT_TITLE_TAB_PAGE']], timeout=0.5, alert=False, message=' '
-        ):
+        if logout.locale[logout.SELECTORS['TEXT_TITLE_TAB_PAGE']] in snapshot.title():
             return
         self.click_on_element(self.SELECTORS['TOGGLE_DROPDOWN_USER'])
         self.dropdown_item_select(self.SELECTORS['ITEM_USER_EXIT'])
@@ -60,7 +60,7 @@ class PopUp:
         """
         input_field = self.__driver.find_element_by_css_selector(self.INPUT_FIELD)
         input_field.send_keys(name)
-        assert not self.__driver.find_element_by_css_selector(
+        assert self.__driver.absent_within(
             self.INPUT_FIELD_ERROR
         ), f"{self.popup_name} не позволяет вставить полученное имя: {name} в поле ввода {self.INPUT_FIELD}"
 
@@ -0,0 +1,101 @@
+import hashlib
+import json
+from typing import Optional
+
+from selenium.common.exceptions import WebDriverException
+
+from PageObject.MainMenuToolbar import MainMenuToolbar
+from Utils.DotDict import DotDict
+from WebDriver import Scripts
+
+
+class SessionState:
+    """
+    Класс кэша авторизованного состояния браузера в SAYMON UI (cookies + localStorage + sessionStorage)
+    - состояние снимается после первого успешного `LoginScreen.login` для пары (пользователь, язык)
+    - последующие тесты внедряют состояние напрямую и проверяют его валидность, при невалидности - вход через UI
+    - ключ кэша содержит отпечаток учетных данных `Config.saymon_admin_user`: при их изменении состояние сбрасывается
+    - кэш хранится только в памяти процесса (на диск учетные данные сессии не попадают)
+    """
+
+    # <editor-fold desc="CONSTANTS">
+    PROBE_TIMEOUT = 5
+
+    # </editor-fold desc="Constants">
+
+    __states: dict[tuple[str, str, str], dict] = {}
+
+    def __init__(self, driver, base_url: str) -> None:
+        self.__driver = driver
+        """:type WebDriver.WebDriver.WebDriver"""
+        self.__base_url = base_url
+
+    @staticmethod
+    def fingerprint(user: DotDict) -> str:
+        """
+        Метод вычисления отпечатка учетных данных пользователя
+        :param user: DotDict: учетные данные (Config.saymon_admin_user)
+        :return: str: sha256
+        """
+        return hashlib.sha256(json.dumps(dict(user), sort_keys=True).encode('utf-8')).hexdigest()
+
+    def is_authorized(self) -> bool:
+        """
+        Метод проверки валидности сессии: открыт основной интерфейс SAYMON UI (меню пользователя в `HeaderMenu`)
+        :return: bool
+        """
+        selector = MainMenuToolbar.SELECTORS['TOGGLE_DROPDOWN_USER']
+        return bool(self.__driver.find_element_by_css_selector(selector, timeout=self.PROBE_TIMEOUT))
+
+    def capture(self, user: DotDict, language: str) -> bool:
+        """
+        Метод снятия авторизованного состояния браузера после входа через UI
+        :param user: DotDict: учетные данные пользователя
+        :param language: str: язык интерфейса SAYMON UI
+        :return: bool: состояние сохранено (сессия валидна)
+        """
+        if not self.is_authorized():
+            return False
+        storage = self.__driver.execute_script(Scripts.CAPTURE_STORAGE)
+        self.__states[self.__key(user, language)] = {
+            'fingerprint': self.fingerprint(user),
+            'cookies': self.__driver.get_cookies(),
+            'local': storage['local'],
+            'session': storage['session'],
+        }
+        return True
+
+    def restore(self, user: DotDict, language: str) -> bool:
+        """
+        Метод внедрения сохраненного авторизованного состояния вместо входа через UI
+        :param user: DotDict: учетные данные пользователя
+        :param language: str: язык интерфейса SAYMON UI
+        :return: bool: True - сессия восстановлена и валидна, False - нужен вход через UI
+        """
+        key = self.__key(user, language)
+        state: Optional[dict] = self.__states.get(key)
+        if not state:
+            return False
+        if state['fingerprint'] != self.fingerprint(user):
+            self.__states.pop(key)
+            return False
+
+        try:
+            self.__driver.open_page(self.__base_url)
+            for cookie in state['cookies']:
+                cookie = {name: value for name, value in cookie.items() if name != 'domain'}
+                self.__driver.add_cookie(cookie)
+            self.__driver.execute_script(Scripts.RESTORE_STORAGE, state['local'], state['session'])
+            self.__driver.open_page(self.__base_url)
+            if self.is_authorized():
+                return True
+        except (TimeoutError, WebDriverException):
+            pass
+
+        self.__states.pop(key, None)
+        self.__driver.reset_state()
+        return False
+
+    def __key(self, user: DotDict, language: str) -> tuple[str, str, str]:
+        """Ключ кэша: (адрес SAYMON UI, логин, язык)"""
+        return self.__base_url, user.login, language
@@ -1,26 +1,93 @@
+from collections import namedtuple
+from collections.abc import ItemsView, ValuesView
+from keyword import iskeyword
 from os import linesep
 
 from Utils import lookup_report
 
 
+class DotDictAttributeError(AttributeError, KeyError):
+    """Отсутствующий ключ при обращении через атрибут: AttributeError для hasattr/getattr, KeyError для совместимости"""
+
+
 class DotDict(dict):
-    """Using dot "." notation to access dictionary keys in Python"""
+    """
+    Using dot "." notation to access dictionary keys in Python
+    - nested mappings (objects with `keys`) are wrapped lazily on first access and cached in place
+    - values() / items() are live views that wrap nested mappings while iterating
+    - warm attribute access runs through Python-level __getattr__ and is slower than plain dict access
+      (see Benchmarks/DotDictBenchmark.py); freeze() returns a read-only namedtuple record for hot lookups
+    """
+
+    __slots__ = ()
+    __records: dict[tuple[str, ...], type] = {}
 
-    __getattr__ = dict.__getitem__
     __setattr__ = dict.__setitem__
     __delattr__ = dict.__delitem__
 
-    def __init__(self, ddict):
-        super().__init__()
+    def __init__(self, ddict):  # pylint: disable=super-init-not-called
         if isinstance(ddict, dict):
-            for key, value in ddict.items():
-                if hasattr(value, 'keys'):
-                    value = DotDict(value)
-                self[key] = value
+            dict.__init__(self, ddict)
         else:
             prefix = (
                 f"{linesep}{'*' * 145}{linesep}* На входе Инициализатора класса DotDict: '{ddict}':\t"
                 f"Проверьте содержимое источника данных (файла)"
             )
             print(prefix, end='')
-            raise TypeError(f"{prefix}{lookup_report()})")
+            raise TypeError(lookup_report(prefix))
+
+    def _wrap(self, value) -> 'DotDict':
+        """
+        Метод обертки вложенного словаря (переопределяется в наследниках, например в разделах Config)
+        :param value: dict: вложенный словарь
+        :return: DotDict
+        """
+        return DotDict(value)
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if not isinstance(value, DotDict) and hasattr(value, 'keys'):
+            value = self._wrap(value)
+            dict.__setitem__(self, key, value)
+        return value
+
+    def __getattr__(self, key):
+        # __getitem__ inlined: attribute access is the hot path
+        try:
+            value = dict.__getitem__(self, key)
+        except KeyError:
+            raise DotDictAttributeError(key) from None
+        if not isinstance(value, DotDict) and hasattr(value, 'keys'):
+            value = self._wrap(value)
+            dict.__setitem__(self, key, value)
+        return value
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def values(self) -> ValuesView:
+        return ValuesView(self)
+
+    def items(self) -> ItemsView:
+        return ItemsView(self)
+
+    def freeze(self) -> tuple:
+        """
+        Метод преобразования в неизменяемую запись (namedtuple) для частых обращений через атрибут
+        - вложенные словари преобразуются рекурсивно, классы записей кэшируются по набору ключей
+        :return: namedtuple: запись DotRecord
+        """
+        fields = tuple(self)
+        invalid = [key for key in fields if not isinstance(key, str) or not key.isidentifier() or iskeyword(key)]
+        invalid += [key for key in fields if isinstance(key, str) and key.startswith('_')]
+        if invalid:
+            prefix = (
+                f"{linesep}{'*' * 145}{linesep}* DotDict.freeze: ключи {invalid} не могут быть именами полей записи"
+            )
+            print(prefix, end='')
+            raise TypeError(lookup_report(prefix))
+
+        record = self.__records.get(fields)
+        if record is None:
+            record = self.__records[fields] = namedtuple('DotRecord', fields)
+        return record(*(value.freeze() if isinstance(value, DotDict) else value for value in self.values()))
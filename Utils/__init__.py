@@ -1,9 +1,14 @@
 import ctypes
-import inspect
+import hashlib
 import json
+import linecache
 import locale
-from os import curdir, getenv, linesep, listdir, name, path, remove, rmdir
-from typing import Literal, Optional
+import sys
+from contextlib import contextmanager
+from copy import deepcopy
+from os import curdir, getenv, getpid, linesep, listdir, makedirs, name, path, remove, replace, rmdir, stat
+from types import FrameType
+from typing import Iterator, Literal, Optional
 
 import yaml
 
@@ -11,6 +16,8 @@ Decode = Literal['yaml', 'json']
 PROJECT_PATH = path.split(path.dirname(__file__))[0]
 TMP_PATH = path.join(PROJECT_PATH, 'share')
 LOCALES_PATH = path.join(PROJECT_PATH, 'Locales')
+CATALOG_PATH = path.join(TMP_PATH, 'locale_catalog')
+"""Каталог скомпилированных (JSON) файлов локализации"""
 for _ in (TMP_PATH,):
     pass  # mkdir(_) if not path.exists(_) else None
 
@@ -58,7 +65,7 @@ def read_locale_file(lang: property | str, allow_tags: Optional[property | bool]
                 file_name = f"{file_name}.{ext}"
                 locale_file_path = path.join(LOCALES_PATH, lang, file_name)
         if locale_file_path:
-            locale_data = read_file(locale_file_path, 'yaml', yaml_tags=allow_tags)
+            locale_data = read_compiled_locale(locale_file_path, allow_tags)
         else:
             prefix = (
                 f"{linesep}\t* Отсутствует файл локализации текстов для языка `{lang}`{linesep}\t* "
@@ -70,6 +77,60 @@ def read_locale_file(lang: property | str, allow_tags: Optional[property | bool]
     return locale_data
 
 
+_catalog: dict[tuple[str, bool], tuple[tuple[int, int], str | dict]] = {}
+
+
+def read_compiled_locale(file_path: str, allow_tags: Optional[bool] = None) -> dict:
+    """
+    Функция чтения файла локализации через скомпилированный каталог
+    - файл .yaml без tags разбирается один раз: результат сохраняется в JSON (CATALOG_PATH) с заголовком
+      `<sha256 файла .yaml>`; устаревший или поврежденный файл каталога компилируется заново. Каталог содержит
+      только данные (str/list/dict), подмена его файла не может привести к выполнению кода
+    - файл с разрешенными tags на диск не компилируется (объекты tags не представимы в JSON)
+    - в пределах процесса каталог хранится в памяти и проверяется только по mtime и размеру файла
+    - каждый вызов возвращает независимую копию данных
+    :param file_path: str: путь к файлу локализации
+    :param allow_tags: bool: запрет/разрешение наличия tags в yaml файле (потенциальная уязвимость)
+    :return: locale_data: dict:
+    """
+    key = (file_path, bool(allow_tags))
+    file_stat = stat(file_path)
+    version = (file_stat.st_mtime_ns, file_stat.st_size)
+    cached = _catalog.get(key)
+    if cached and cached[0] == version:
+        return json.loads(cached[1]) if isinstance(cached[1], str) else deepcopy(cached[1])
+
+    if allow_tags:
+        locale_data = read_file(file_path, 'yaml', yaml_tags=True)
+        _catalog[key] = (version, deepcopy(locale_data))
+        return locale_data
+
+    with open(file_path, 'rb') as file:
+        digest = hashlib.sha256(file.read()).hexdigest()
+    compiled_path = path.join(CATALOG_PATH, f"{path.basename(file_path)}.json")
+    compiled = locale_data = None
+    if path.exists(compiled_path):
+        try:
+            with open(compiled_path, 'rt', encoding='utf-8') as file:
+                header, payload = file.readline().strip(), file.read()
+            if header == digest:
+                locale_data, compiled = json.loads(payload), payload
+        except (OSError, ValueError):
+            compiled = None
+
+    if compiled is None:
+        locale_data = read_file(file_path, 'yaml')
+        compiled = json.dumps(locale_data, ensure_ascii=False)
+        makedirs(CATALOG_PATH, exist_ok=True)
+        tmp_path = f"{compiled_path}.{getpid()}.tmp"
+        with open(tmp_path, 'wt', encoding='utf-8') as file:
+            file.write(f"{digest}\n{compiled}")
+        replace(tmp_path, compiled_path)
+
+    _catalog[key] = (version, compiled)
+    return locale_data
+
+
 def read_file(file_path: path, decoder: Decode = 'yaml', yaml_tags: Optional[bool] = None, params: dict = None) -> dict:
     """
     Функция чтения данных из файла в словарь
@@ -91,6 +152,36 @@ def read_file(file_path: path, decoder: Decode = 'yaml', yaml_tags: Optional[boo
     return data
 
 
+@contextmanager
+def file_lock(file_path: str) -> Iterator[None]:
+    """
+    Межпроцессная блокировка на время работы с общим файлом (реестр сессий, конфиг) при параллельном запуске
+    - блокируется соседний файл `<file_path>.lock`, сам файл можно атомарно подменять
+    :param file_path: str: путь к защищаемому файлу
+    """
+    lock_path = f"{file_path}.lock"
+    makedirs(path.dirname(lock_path), exist_ok=True)
+    with open(lock_path, 'a+', encoding='utf-8') as lock:
+        if name == 'posix':
+            import fcntl  # pylint: disable=import-outside-toplevel
+
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+        else:
+            import msvcrt  # pylint: disable=import-outside-toplevel
+
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
 def remove_local_dir(dir_path: str | bytes) -> None:
     """
     Функция рекурсивного удаления директории на локальном хосте
@@ -115,49 +206,90 @@ def remove_local_dir(dir_path: str | bytes) -> None:
         rmdir(dir_path)  # remove directory
 
 
-def lookup_report() -> str:
+class ErrorContext:
     """
-    Функция сбора метрик вызываемого и вызывающего методов с помощью inspect
-    Ex: frame, filename, line_number, function_name, lines, index = inspect.stack()[<stack_frame_depth>]
-    :return: str: данные о методе, из которого был вызван текущий метод
+    Ленивый контекст ошибки (см. lookup_report)
+    - кадры стека фиксируются один раз через sys._getframe: хранятся только файл, номер строки и имя функции
+    - текст отчета формируется (и печатается) только при первом рендере: str / format / repr,
+      строки исходного кода читаются через кэш linecache
     """
-    stack_frame_depth = (
-        2
-        if (
-            inspect.stack()[1][3] == 'alert'
-            or 'lookup_report()' in inspect.stack()[1][4][0]
-            or 'raise' in inspect.stack()[1][4][0]
+
+    __slots__ = ('__prefix', '__trace', '__report')
+
+    TRACE_DEPTH = 5
+
+    def __init__(self, frame: Optional[FrameType], prefix: str = '') -> None:
+        trace = []
+        while frame is not None and len(trace) < self.TRACE_DEPTH:
+            # Служебные обертки (декораторы) помечаются как в pytest: локальной переменной `__tracebackhide__`
+            if '__tracebackhide__' not in frame.f_code.co_varnames:
+                trace.append((frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name))
+            frame = frame.f_back
+        self.__trace = trace
+        self.__prefix = prefix
+        self.__report: Optional[str] = None
+
+    def __str__(self) -> str:
+        if self.__report is None:
+            report = self.__render()
+            print(report, end='')
+            self.__report = f"{self.__prefix}{report}"
+        return self.__report
+
+    def __format__(self, format_spec: str) -> str:
+        return format(str(self), format_spec)
+
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+    def __source(self, index: int) -> tuple[str, str, int, str]:
+        """
+        Данные кадра стека: имя функции, относительный путь к файлу, номер строки, текст строки
+        """
+        if index >= len(self.__trace):
+            return '<unknown>', '<unknown>', 0, linesep
+        file_path, line_nbr, function_name = self.__trace[index]
+        line_text = linecache.getline(file_path, line_nbr) or linesep
+        return function_name, path.relpath(file_path, start=curdir), line_nbr, line_text
+
+    def __render(self) -> str:
+        """
+        Формирование текста отчета о вызываемом и вызывающих методах
+        """
+        function_name, _, _, line_text = self.__source(0)
+        stack_frame_depth = (
+            1 if (function_name == 'alert' or 'lookup_report(' in line_text or 'raise' in line_text) else 0
+        )
+        lookup = {}
+        for offset, item in enumerate(['called', 'caller', 'caller-1', 'caller-2']):
+            source = self.__source(stack_frame_depth + offset)
+            lookup[item + '_name'], lookup[item + '_file_path'] = source[0], source[1]
+            lookup[item + '_line_nbr'], lookup[item + '_line_text'] = source[2], source[3]
+
+        return (
+            f"{linesep}{' ! ДАННЫЕ ОБ ОШИБКЕ ! ':*^145}{linesep}"
+            f"* Вызываемый (Current Method):{'\t' * 3}`{lookup['called_name']}`\tв\t{lookup['called_file_path']}:"
+            f"{lookup['called_line_nbr']}{linesep}*\tСтрока с ошибкой:\t{lookup['called_line_nbr']}"
+            f"{lookup['called_line_text']}{'*' * 145}{linesep}"
+            f"* Вызывающий (Caller Method):{'\t' * 3}`{lookup['caller_name']}`\tиз\t{lookup['caller_file_path']}:"
+            f"{lookup['caller_line_nbr']}{linesep}*\t Строка вызова:{'\t' * 2}{lookup['caller_line_nbr']}"
+            f"{lookup['caller_line_text']}{'*' * 145}{linesep}"
+            f"* Вызывающий-1 (Predecessor Method):\t`{lookup['caller-1_name']}`\tиз\t{lookup['caller-1_file_path']}:"
+            f"{lookup['caller-1_line_nbr']}{linesep}*\t Строка вызова:{'\t' * 2}{lookup['caller-1_line_nbr']}"
+            f"{lookup['caller-1_line_text']}{'*' * 145}{linesep}"
+            f"* Вызывающий-2 (Forerunner Method):\t\t`{lookup['caller-2_name']}`\tиз\t{lookup['caller-2_file_path']}:"
+            f"{lookup['caller-2_line_nbr']}{linesep}*\t Строка вызова:{'\t' * 2}{lookup['caller-2_line_nbr']}"
+            f"{lookup['caller-2_line_text']}{'*' * 145}{linesep}"
         )
-        else 1
-    )
-    trace_source = {
-        'called': inspect.stack()[stack_frame_depth],
-        'caller': inspect.stack()[stack_frame_depth + 1],
-        'caller-1': inspect.stack()[stack_frame_depth + 2],
-        'caller-2': inspect.stack()[stack_frame_depth + 3],
-    }
-    lookup = {}
-    for item, source in trace_source.items():
-        lookup[item + '_name'] = source[3]
-        lookup[item + '_file_path'] = path.relpath(source[1], start=curdir)
-        lookup[item + '_line_nbr'] = source[2]
-        lookup[item + '_line_text'] = source[4][0]
-
-    report = (
-        f"{linesep}{' ! ДАННЫЕ ОБ ОШИБКЕ ! ':*^145}{linesep}"
-        f"* Вызываемый (Current Method):{'\t' * 3}`{lookup['called_name']}`\tв\t{lookup['called_file_path']}:"
-        f"{lookup['called_line_nbr']}{linesep}*\tСтрока с ошибкой:\t{lookup['called_line_nbr']}"
-        f"{lookup['called_line_text']}{'*' * 145}{linesep}"
-        f"* Вызывающий (Caller Method):{'\t' * 3}`{lookup['caller_name']}`\tиз\t{lookup['caller_file_path']}:"
-        f"{lookup['caller_line_nbr']}{linesep}*\t Строка вызова:{'\t' * 2}{lookup['caller_line_nbr']}"
-        f"{lookup['caller_line_text']}{'*' * 145}{linesep}"
-        f"* Вызывающий-1 (Predecessor Method):\t`{lookup['caller-1_name']}`\tиз\t{lookup['caller-1_file_path']}:"
-        f"{lookup['caller-1_line_nbr']}{linesep}*\t Строка вызова:{'\t' * 2}{lookup['caller-1_line_nbr']}"
-        f"{lookup['caller-1_line_text']}{'*' * 145}{linesep}"
-        f"* Вызывающий-2 (Forerunner Method):\t\t`{lookup['caller-2_name']}`\tиз\t{lookup['caller-2_file_path']}:"
-        f"{lookup['caller-2_line_nbr']}{linesep}*\t Строка вызова:{'\t' * 2}{lookup['caller-2_line_nbr']}"
-        f"{lookup['caller-2_line_text']}{'*' * 145}{linesep}"
-    )
-
-    print(report, end='')
-    return report
+
+
+def lookup_report(prefix: str = '') -> ErrorContext:
+    """
+    Функция сбора метрик вызываемого и вызывающего методов
+    - стек фиксируется в момент вызова, а отчет формируется только при выводе ошибки (см. ErrorContext)
+    - при передаче в исключение: `raise KeyError(lookup_report(message))` - отчет не строится, если ошибка
+      перехвачена и не выводилась
+    :param prefix: str: текст сообщения об ошибке перед отчетом
+    :return: ErrorContext: данные о методе, из которого был вызван текущий метод (str-совместимый объект)
+    """
+    return ErrorContext(sys._getframe(1), prefix)  # pylint: disable=protected-access
@@ -0,0 +1,295 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from time import monotonic
+from typing import Any, Optional
+
+import urllib3
+from selenium.common.exceptions import JavascriptException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.errorhandler import ErrorHandler
+
+from WebDriver import Scripts
+from WebDriver.WebBase import MAX_TIMEOUT, TIMEOUT_STEP
+
+ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+"""Ключ ссылки на элемент в протоколе W3C WebDriver"""
+MAX_CONNECTIONS = 32
+"""Размер пула HTTP соединений на хост WebDriver и число потоков, выполняющих запросы"""
+COMMAND_TIMEOUT = 120
+"""Таймаут одного HTTP запроса к WebDriver (сек), как у selenium RemoteConnection"""
+
+
+class AsyncWebElement:
+    """Класс асинхронных методов взаимодействия с WebElement (ссылка на элемент в сессии AsyncWebDriver)"""
+
+    def __init__(self, driver: 'AsyncWebDriver', element_id: str) -> None:
+        self.driver = driver
+        self.id = element_id
+
+    def __path(self, command: str = '') -> str:
+        return f"/element/{self.id}{command}"
+
+    async def click(self) -> None:
+        """Клик по элементу"""
+        await self.driver.execute('POST', self.__path('/click'))
+
+    async def clear(self) -> None:
+        """Очистить поле ввода"""
+        await self.driver.execute('POST', self.__path('/clear'))
+
+    async def send_keys(self, text: str) -> None:
+        """Ввести текст в элемент"""
+        await self.driver.execute('POST', self.__path('/value'), {'text': str(text)})
+
+    async def fill(self, text: str, clear=True) -> 'AsyncWebElement':
+        """
+        Ввести в текстовое поле значение (текст вводится блоком)
+        :param text: str: текст для ввода
+        :param clear: bool: очистить поле перед вводом
+        """
+        await self.click()
+        if clear:
+            await self.clear()
+        await self.send_keys(text)
+        return self
+
+    async def text(self) -> str:
+        """Видимый текст элемента"""
+        return await self.driver.execute('GET', self.__path('/text'))
+
+    async def get_attribute(self, name: str) -> Optional[str]:
+        """Значение атрибута или свойства элемента"""
+        return await self.driver.execute('GET', self.__path(f"/attribute/{name}"))
+
+    async def is_displayed(self) -> bool:
+        """Элемент видим на странице"""
+        return await self.driver.execute('GET', self.__path('/displayed'))
+
+    async def is_disabled(self) -> bool:
+        """
+        Проверить:
+         - наличие атрибута элемента 'disabled'
+         - атрибут элемента `class` на наличие класса с текстом 'disabled'
+        :return: bool
+        """
+        disabled, css_class = await asyncio.gather(self.get_attribute('disabled'), self.get_attribute('class'))
+        return bool(disabled or 'disabled' in (css_class or ''))
+
+
+class AsyncWebDriver:
+    """
+    Асинхронный фасад сессии WebDriver (протокол W3C) для параллельной работы с несколькими сессиями в одном процессе
+    - HTTP запросы выполняются через общий пул соединений urllib3 в пуле потоков: event loop не блокируется
+    - ожидания реализованы поллингом с asyncio.sleep: пока сессия ждет, поток и соединение свободны для других сессий
+    - поиск элементов выполняется скриптом Scripts.LOOKUP (поиск и фильтр видимости одной командой), как в WebBase
+    """
+
+    __pool: Optional[urllib3.PoolManager] = None
+    __executor: Optional[ThreadPoolExecutor] = None
+
+    def __init__(self, command_executor: str, session_id: str) -> None:
+        self.command_executor = command_executor.rstrip('/')
+        self.session_id = session_id
+
+    @classmethod
+    def attach(cls, driver) -> 'AsyncWebDriver':
+        """
+        Метод подключения к сессии уже запущенного (синхронного) WebDriver
+        :param driver: WebDriver.WebDriver.WebDriver | selenium WebDriver
+        :return: AsyncWebDriver
+        """
+        # Адрес сервера доступен только в приватном RemoteConnection._url: проверено на selenium 4.15 (requirements.txt)
+        executor = driver.command_executor._url  # pylint: disable=protected-access
+        return cls(executor, driver.session_id)
+
+    @classmethod
+    async def new_session(cls, command_executor: str, capabilities: dict) -> 'AsyncWebDriver':
+        """
+        Метод создания новой сессии браузера (например, в selenoid)
+        :param command_executor: str: адрес WebDriver / selenoid
+        :param capabilities: dict: capabilities новой сессии
+        :return: AsyncWebDriver
+        """
+        url = f"{command_executor.rstrip('/')}/session"
+        value = await cls.__request('POST', url, {'capabilities': {'firstMatch': [{}], 'alwaysMatch': capabilities}})
+        return cls(command_executor, value['sessionId'])
+
+    async def quit(self) -> None:
+        """Закрыть сессию браузера"""
+        await self.__request('DELETE', f"{self.command_executor}/session/{self.session_id}")
+
+    async def execute(self, method: str, command: str, payload: Optional[dict] = None) -> Any:
+        """
+        Метод выполнения команды WebDriver в текущей сессии
+        :param method: str: HTTP метод
+        :param command: str: путь команды относительно сессии (например, '/url')
+        :param payload: dict: параметры команды
+        :return: значение `value` ответа (ссылки на элементы заменяются на AsyncWebElement)
+        """
+        url = f"{self.command_executor}/session/{self.session_id}{command}"
+        return self.__unwrap(await self.__request(method, url, payload))
+
+    @classmethod
+    async def __request(cls, method: str, url: str, payload: Optional[dict] = None) -> Any:
+        """Выполнить HTTP запрос в пуле потоков и проверить ответ (ошибки -> исключения selenium)"""
+        if cls.__pool is None:
+            cls.__pool = urllib3.PoolManager(maxsize=MAX_CONNECTIONS, block=True)
+            cls.__executor = ThreadPoolExecutor(max_workers=MAX_CONNECTIONS, thread_name_prefix='AsyncWebDriver')
+        body = json.dumps(payload) if payload is not None else ('{}' if method == 'POST' else None)
+        headers = {'Content-Type': 'application/json;charset=UTF-8', 'Accept': 'application/json'}
+        request = partial(
+            cls.__pool.request, method, url, body=body, headers=headers, timeout=COMMAND_TIMEOUT, retries=False
+        )
+        response = await asyncio.get_running_loop().run_in_executor(cls.__executor, request)
+        data = response.data.decode('utf-8')
+        if response.status >= 400:
+            ErrorHandler().check_response({'status': response.status, 'value': data})
+        return json.loads(data)['value'] if data else None
+
+    def __wrap(self, value: Any) -> Any:
+        """Аргументы скрипта: AsyncWebElement -> ссылка на элемент W3C"""
+        if isinstance(value, AsyncWebElement):
+            return {ELEMENT_KEY: value.id}
+        if isinstance(value, (list, tuple)):
+            return [self.__wrap(item) for item in value]
+        return value
+
+    def __unwrap(self, value: Any) -> Any:
+        """Результат команды: ссылка на элемент W3C -> AsyncWebElement"""
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return AsyncWebElement(self, value[ELEMENT_KEY])
+            return {key: self.__unwrap(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.__unwrap(item) for item in value]
+        return value
+
+    async def execute_script(self, script: str, *args) -> Any:
+        """Выполнить синхронный скрипт на странице"""
+        return await self.execute('POST', '/execute/sync', {'script': script, 'args': self.__wrap(args)})
+
+    async def open_page(self, url: str) -> None:
+        """
+        Метод открытия страницы и ожидания ее загрузки
+        """
+        try:
+            await self.execute('POST', '/url', {'url': url})
+            await self.wait_interactive_ready_state()
+        except Exception as e:
+            raise TimeoutError(f"Страница {url} не загрузилась!") from e
+
+    async def title(self) -> str:
+        """Заголовок текущей страницы"""
+        return await self.execute('GET', '/title')
+
+    async def current_url(self) -> str:
+        """Адрес текущей страницы"""
+        return await self.execute('GET', '/url')
+
+    async def wait_interactive_ready_state(self, timeout=MAX_TIMEOUT) -> bool:
+        """
+        Ждет пока у страницы document.readyState станет interactive
+        :return: bool: True - готовность документа подтверждена
+        """
+        deadline = monotonic() + timeout
+        while True:
+            if await self.execute_script(Scripts.READY_STATE, None):
+                return True
+            if monotonic() >= deadline:
+                return False
+            await asyncio.sleep(TIMEOUT_STEP)
+
+    async def __lookup(self, by_method: str, value: str, wait_element_visibility: bool, single: bool) -> list:
+        """
+        Поиск элементов одной командой (Scripts.LOOKUP), при запрете скриптов - штатным поиском WebDriver
+        :return: list: найденные AsyncWebElement (пустой, если подходящих нет)
+        """
+        args = (by_method, value, None, wait_element_visibility, single, Scripts.NOT_INSTALLED)
+        try:
+            found = await self.execute_script(Scripts.LOOKUP, *args)
+            if found == Scripts.NOT_INSTALLED:
+                await self.execute_script(Scripts.install_helpers())
+                found = await self.execute_script(Scripts.LOOKUP, *args)
+            return found if isinstance(found, list) else []
+        except JavascriptException:
+            found = await self.execute('POST', '/elements', {'using': by_method, 'value': value})
+            if not wait_element_visibility:
+                return found[:1] if single else found
+            displayed = await asyncio.gather(*(element.is_displayed() for element in found))
+            visible = [element for element, shown in zip(found, displayed) if shown]
+            return visible[:1] if single else visible
+
+    async def find_elements_by_css_selector(
+        self, value: str, timeout=MAX_TIMEOUT, wait_element_visibility=True, single=False
+    ) -> list[AsyncWebElement]:
+        """
+        Поиск элементов по css-селектору с ожиданием их появления
+        :param value: str: css-селектор
+        :param timeout: максимальное время ожидания
+        :param wait_element_visibility: bool: искать только видимые элементы
+        :param single: bool: вернуть только первый подходящий элемент
+        :return: list: найденные AsyncWebElement (пустой, если не найдены за timeout)
+        """
+        deadline = monotonic() + timeout
+        while True:
+            found = await self.__lookup(By.CSS_SELECTOR, value, wait_element_visibility, single)
+            if found:
+                return found
+            if monotonic() >= deadline:
+                print(f"INFO:\tWebElement с селектором `{value}` не найден за {timeout} сек")
+                return []
+            await asyncio.sleep(TIMEOUT_STEP)
+
+    async def find_element_by_css_selector(
+        self, value: str, timeout=MAX_TIMEOUT, wait_element_visibility=True
+    ) -> Optional[AsyncWebElement]:
+        """
+        Поиск первого подходящего элемента по css-селектору с ожиданием его появления
+        :return: AsyncWebElement | None
+        """
+        found = await self.find_elements_by_css_selector(value, timeout, wait_element_visibility, single=True)
+        return found[0] if found else None
+
+    async def wait_for_element_to_disappear(self, selector: str, timeout=MAX_TIMEOUT) -> bool:
+        """
+        Ждать, когда элементы с указанным селектором станут невидимыми или исчезнут из DOM
+        :return: bool: True - элементы исчезли за timeout
+        """
+        deadline = monotonic() + timeout
+        while await self.__lookup(By.CSS_SELECTOR, selector, True, True):
+            if monotonic() >= deadline:
+                return False
+            await asyncio.sleep(TIMEOUT_STEP)
+        return True
+
+    async def wait_title_contains(self, text: str, timeout=MAX_TIMEOUT) -> bool:
+        """
+        Ждать, когда заголовок страницы будет содержать текст
+        :return: bool: True - заголовок содержит текст
+        """
+        deadline = monotonic() + timeout
+        while text not in await self.title():
+            if monotonic() >= deadline:
+                return False
+            await asyncio.sleep(TIMEOUT_STEP)
+        return True
+
+    async def click(self, selector: str, timeout=MAX_TIMEOUT) -> Optional[AsyncWebElement]:
+        """
+        Найти элемент по css-селектору и кликнуть по нему
+        :return: AsyncWebElement | None (элемент не найден)
+        """
+        element = await self.find_element_by_css_selector(selector, timeout)
+        await element.click() if element else None
+        return element
+
+    async def fill(self, selector: str, text: str, clear=True, timeout=MAX_TIMEOUT) -> Optional[AsyncWebElement]:
+        """
+        Найти поле ввода по css-селектору и ввести в него текст
+        :return: AsyncWebElement | None (элемент не найден)
+        """
+        element = await self.find_element_by_css_selector(selector, timeout)
+        await element.fill(text, clear=clear) if element else None
+        return element
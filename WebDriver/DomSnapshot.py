@@ -0,0 +1,103 @@
+import re
+import zlib
+from html import unescape
+from typing import Any, Optional
+
+from selenium.common.exceptions import JavascriptException, WebDriverException
+
+from WebDriver import Scripts
+
+COMPRESSION_LEVEL = 1
+"""Уровень сжатия zlib снимка DOM: быстрый, исходный текст страницы сжимается в разы"""
+TITLE = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+
+
+class DomSnapshot:
+    """
+    Кэш снимка DOM текущей страницы (page source) для проверок "есть ли на странице X"
+    - снимок снимается одной командой (Scripts.SNAPSHOT) и хранится в памяти сжатым (zlib)
+    - снимок актуален, пока не сменилась эпоха навигации WebDriver и версия DOM на странице (MutationObserver):
+      проверка актуальности - одна команда с ответом в несколько байт вместо повторной передачи всей страницы
+    - результаты поиска подстрок и регулярных выражений индексируются до смены снимка
+    """
+
+    def __init__(self, driver) -> None:
+        self.__driver = driver
+        """:type WebDriver.WebDriver.WebDriver"""
+        self.__key: Optional[tuple] = None
+        self.__data = b''
+        self.__index: dict[tuple, Any] = {}
+
+    def __current_version(self) -> Optional[int]:
+        """Версия DOM на странице (None - снимок на этой странице не снимался или страница недоступна)"""
+        try:
+            return self.__driver.execute_script(Scripts.SNAPSHOT_VERSION)
+        except WebDriverException:
+            return None
+
+    def __refresh(self) -> None:
+        """Проверить актуальность снимка и при необходимости снять новый"""
+        if self.__key is not None:
+            version = self.__current_version()
+            if version is not None and self.__key == (self.__driver.epoch, version):
+                return
+
+        try:
+            version, source = self.__driver.execute_script(Scripts.SNAPSHOT)
+            key = (self.__driver.epoch, version)
+        except JavascriptException:
+            # скрипты на странице запрещены: без счетчика изменений DOM снимок не кэшируется
+            source, key = self.__driver.page_source, None
+        self.__key = key
+        self.__data = zlib.compress(source.encode('utf-8'), COMPRESSION_LEVEL)
+        self.__index = {}
+
+    def invalidate(self) -> None:
+        """Сбросить снимок: следующая проверка снимет его заново"""
+        self.__key = None
+        self.__index = {}
+
+    def source(self) -> str:
+        """
+        Метод возвращает актуальный исходный текст страницы (аналог WebDriver.page_source)
+        :return: str
+        """
+        self.__refresh()
+        return zlib.decompress(self.__data).decode('utf-8')
+
+    def __lookup(self, key: tuple, func) -> Any:
+        """Результат поиска из индекса снимка (при промахе - поиск по распакованному тексту)"""
+        self.__refresh()
+        if key not in self.__index:
+            self.__index[key] = func(zlib.decompress(self.__data).decode('utf-8'))
+        return self.__index[key]
+
+    def contains(self, *texts: str) -> bool:
+        """
+        Метод проверки наличия на странице хотя бы одной из подстрок
+        :param texts: str: искомые подстроки
+        :return: bool
+        """
+        return self.__lookup(('contains', texts), lambda source: any(text in source for text in texts))
+
+    def search(self, pattern: str | re.Pattern, flags: int = 0) -> Optional[str]:
+        """
+        Метод поиска на странице по регулярному выражению
+        :param pattern: str | re.Pattern: регулярное выражение
+        :param flags: int: флаги re (для pattern: str)
+        :return: str: первая группа совпадения (при отсутствии групп - все совпадение) или None
+        """
+        regex = re.compile(pattern, flags)
+
+        def _search(source: str) -> Optional[str]:
+            match = regex.search(source)
+            return (match.group(1) if regex.groups else match.group(0)) if match else None
+
+        return self.__lookup(('search', regex.pattern, regex.flags), _search)
+
+    def title(self) -> str:
+        """
+        Метод возвращает заголовок страницы из снимка (без отдельной команды WebDriver)
+        :return: str
+        """
+        return unescape(self.search(TITLE) or '').strip()
@@ -0,0 +1,249 @@
+import json
+import math
+import re
+from collections import Counter, defaultdict
+from functools import wraps
+from os import linesep
+from threading import get_ident
+from time import perf_counter
+from typing import Callable, NamedTuple, Optional
+
+SCRIPT_TAG = re.compile(r'^/\* (\w+) \*/')
+SELECTOR_SCRIPTS = ('pageObjectLookup', 'pageObjectWait')
+"""Скрипты, у которых второй аргумент - селектор"""
+
+
+def command_name(driver_command: str, params: Optional[dict]) -> tuple[str, Optional[str]]:
+    """
+    Функция получения имени исходящей команды WebDriver: для скриптов фреймворка имя дополняется меткой скрипта
+    :param driver_command: str: команда selenium (Command.*)
+    :param params: dict: параметры команды
+    :return: tuple: (имя, селектор | None)
+    """
+    name, selector = driver_command, None
+    params = params or {}
+    if 'using' in params:
+        selector = params.get('value')
+    elif 'script' in params:
+        tag = SCRIPT_TAG.match(params['script'])
+        if tag:
+            name = f"{driver_command}:{tag.group(1)}"
+            args = params.get('args') or []
+            selector = args[1] if tag.group(1) in SELECTOR_SCRIPTS and len(args) > 1 else None
+    return name, selector
+
+
+class Record(NamedTuple):
+    """Запись о длительности одной команды WebDriver или одного шага PageObject"""
+
+    test: str
+    kind: str
+    name: str
+    selector: Optional[str]
+    page: Optional[str]
+    duration: float
+    outcome: Optional[bool] = None
+
+
+class Recorder:
+    """
+    Класс записи длительности исходящих команд WebDriver и шагов поиска/ожидания WebBase и BaseMethods
+    - при выключенной записи накладные расходы: одна проверка флага на команду/шаг
+    - контекст записи: текущий тест (хуки pytest) и PageObject, из метода которого выполняется команда
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.test = '<session>'
+        """:type str: nodeid текущего теста"""
+        self.records: list[Record] = []
+        self.budgets: list[RoundTripBudget] = []
+        """Активные бюджеты команд WebDriver (RoundTripBudget): команды считаются независимо от enabled"""
+        self.__pages: list[str] = []
+
+    @property
+    def page(self) -> Optional[str]:
+        """
+        Свойство возвращает имя PageObject, из метода которого выполняется текущая команда
+        :return: str | None
+        """
+        return self.__pages[-1] if self.__pages else None
+
+    def record(
+        self, kind: str, name: str, duration: float, selector: Optional[str] = None, outcome: Optional[bool] = None
+    ) -> None:
+        """
+        Метод записи длительности команды или шага
+        :param kind: str: 'command' | 'step' | 'assert'
+        :param name: str: имя команды WebDriver, метода или проверяемого условия
+        :param duration: float: длительность (сек)
+        :param selector: str: селектор (если есть)
+        :param outcome: bool: для 'assert' - условие выполнено за отведенное время
+        """
+        self.records.append(Record(self.test, kind, name, selector, self.page, duration, outcome))
+
+    def record_command(self, driver_command: str, params: Optional[dict], duration: float) -> None:
+        """
+        Метод записи исходящей команды WebDriver: для скриптов фреймворка именем служит метка скрипта
+        """
+        name, selector = command_name(driver_command, params)
+        self.record('command', name, duration, selector)
+
+    def count_command(self, driver_command: str, params: Optional[dict]) -> None:
+        """
+        Метод учета исходящей команды WebDriver в активных бюджетах потока, из которого она отправлена
+        """
+        name = command_name(driver_command, params)[0]
+        thread = get_ident()
+        for budget in self.budgets:
+            if budget.thread == thread:
+                budget.commands[name] += 1
+
+    def push_page(self, page: str) -> None:
+        """Вход в метод PageObject"""
+        self.__pages.append(page)
+
+    def pop_page(self) -> None:
+        """Выход из метода PageObject"""
+        self.__pages.pop() if self.__pages else None
+
+    def report(self) -> dict:
+        """
+        Метод построения гистограмм по тестам: count, total, p50, p95, max для каждой команды, шага и проверки
+        (для проверок дополнительно - число невыполненных условий `failed`)
+        :return: dict
+        """
+        grouped: dict[str, dict[str, dict[str, list[float]]]] = defaultdict(
+            lambda: {'command': defaultdict(list), 'step': defaultdict(list), 'assert': defaultdict(list)}
+        )
+        failed: dict[tuple[str, str], int] = defaultdict(int)
+        for record in self.records:
+            grouped[record.test][record.kind][record.name].append(record.duration)
+            if record.outcome is False:
+                failed[record.test, record.name] += 1
+
+        tests = {}
+        for test, kinds in grouped.items():
+            tests[test] = {
+                'commands': {name: self.histogram(values) for name, values in sorted(kinds['command'].items())},
+                'steps': {name: self.histogram(values) for name, values in sorted(kinds['step'].items())},
+                'assertions': {
+                    name: self.histogram(values) | {'failed': failed[test, name]}
+                    for name, values in sorted(kinds['assert'].items())
+                },
+            }
+        slowest = sorted(self.records, key=lambda record: record.duration, reverse=True)[:20]
+        return {'tests': tests, 'slowest': [record._asdict() for record in slowest]}
+
+    def dump(self, report_path: str) -> None:
+        """
+        Метод записи отчета в JSON файл
+        :param report_path: str: путь к файлу отчета
+        """
+        with open(report_path, 'w', encoding='UTF-8') as file:
+            file.write(json.dumps(self.report(), indent=4, ensure_ascii=False))
+
+    @staticmethod
+    def histogram(values: list[float]) -> dict:
+        """
+        Метод расчета статистики длительностей (перцентили по ближайшему рангу)
+        :param values: list: длительности (сек)
+        :return: dict: count, total, p50, p95, max (мс)
+        """
+        ordered = sorted(values)
+
+        def _percentile(rank: float) -> float:
+            return ordered[max(0, math.ceil(rank * len(ordered)) - 1)]
+
+        return {
+            'count': len(ordered),
+            'total_ms': round(sum(ordered) * 1000, 3),
+            'p50_ms': round(_percentile(0.5) * 1000, 3),
+            'p95_ms': round(_percentile(0.95) * 1000, 3),
+            'max_ms': round(ordered[-1] * 1000, 3),
+        }
+
+
+class RoundTripBudget:
+    """
+    Контекстный менеджер бюджета команд WebDriver (round trip) на блок кода или тест
+    - считаются все команды сессий WebDriver, отправленные из потока, в котором бюджет открыт
+    - при выходе без исключения и превышении бюджета - AssertionError с разбивкой команд по именам
+    Использование:
+        with RoundTripBudget(40, 'LoginScreen.login'):
+            login.login(user)
+    или маркер теста `@pytest.mark.max_roundtrips(40)` (см. conftest.py)
+    """
+
+    def __init__(self, limit: int, name: str = '', check: bool = True) -> None:
+        """
+        :param limit: int: допустимое число команд
+        :param name: str: имя проверяемого сценария (для сообщения)
+        :param check: bool: проверять бюджет при выходе из контекста (False - проверка вызывающим, см. exceeded)
+        """
+        self.limit = limit
+        self.name = name
+        self.check = check
+        self.commands: Counter = Counter()
+        self.thread = get_ident()
+
+    @property
+    def total(self) -> int:
+        """Число команд, отправленных в бюджете"""
+        return sum(self.commands.values())
+
+    @property
+    def exceeded(self) -> bool:
+        """Бюджет превышен"""
+        return self.total > self.limit
+
+    def report(self) -> str:
+        """
+        Метод формирования отчета: итог и разбивка команд по именам (по убыванию числа)
+        :return: str
+        """
+        lines = [f"{self.name or 'RoundTripBudget'}: команд WebDriver {self.total} при бюджете {self.limit}"]
+        lines += [f"\t{count:>4}  {name}" for name, count in self.commands.most_common()]
+        return linesep.join(lines)
+
+    def __enter__(self) -> 'RoundTripBudget':
+        self.thread = get_ident()
+        RECORDER.budgets.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        __tracebackhide__ = True  # pylint: disable=unused-variable
+        RECORDER.budgets.remove(self)
+        if self.check and exc_type is None:
+            assert not self.exceeded, self.report()
+
+
+RECORDER = Recorder()
+"""Общий для процесса экземпляр Recorder"""
+
+
+def instrumented(method: Callable) -> Callable:
+    """
+    Декоратор шага поиска/ожидания: длительность вызова записывается в RECORDER
+    - для методов PageObject (BaseMethods) на время вызова устанавливается контекст страницы
+    - при выключенной записи метод вызывается напрямую
+    """
+    name = method.__qualname__
+
+    @wraps(method)
+    def _wrapper(self, *args, **kwargs):
+        __tracebackhide__ = True  # pylint: disable=unused-variable
+        if not RECORDER.enabled:
+            return method(self, *args, **kwargs)
+
+        page = getattr(self, 'SELECTORS', None) is not None
+        RECORDER.push_page(self.__class__.__name__) if page else None
+        started = perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            selector = args[0] if args and isinstance(args[0], str) else None
+            RECORDER.record('step', name, perf_counter() - started, selector)
+            RECORDER.pop_page() if page else None
+
+    return _wrapper
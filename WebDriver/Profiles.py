@@ -0,0 +1,58 @@
+import atexit
+import os
+import shutil
+import subprocess
+import tempfile
+from threading import Lock
+
+from selenium import webdriver
+
+from Utils import remove_local_dir
+
+_templates: dict[str, str] = {}
+_lock = Lock()
+
+
+def _build_template(browser: str) -> str:
+    """
+    Функция однократной (на запуск) подготовки профиля браузера
+    :param browser: str: 'firefox' | 'chrome'
+    :return: str: путь к каталогу-шаблону профиля
+    """
+    if browser == 'firefox':
+        profile = webdriver.FirefoxProfile()
+        profile.accept_untrusted_certs = True
+        profile.set_preference("app.update.auto", False)
+        profile.set_preference("app.update.enabled", False)
+        profile.update_preferences()
+        return profile.path
+
+    template = tempfile.mkdtemp(prefix=f"{browser}_profile_template_")
+    # Маркер первого запуска: chrome не тратит время на first-run инициализацию профиля
+    with open(os.path.join(template, 'First Run'), 'w', encoding='utf-8'):
+        pass
+    return template
+
+
+def profile_snapshot(browser: str) -> str:
+    """
+    Функция выдачи отдельной копии заранее подготовленного профиля браузера для новой сессии
+    - шаблон профиля строится один раз на процесс
+    - копия делается через `cp --reflink=auto` (copy-on-write на btrfs/xfs), иначе обычным копированием
+    :param browser: str: 'firefox' | 'chrome'
+    :return: str: путь к каталогу профиля сессии (удаляется WebDriver.quit)
+    """
+    with _lock:
+        if browser not in _templates:
+            _templates[browser] = _build_template(browser)
+            atexit.register(remove_local_dir, _templates[browser])
+        template = _templates[browser]
+
+    snapshot = tempfile.mkdtemp(prefix=f"{browser}_profile_")
+    os.rmdir(snapshot)
+    try:
+        subprocess.run(['cp', '-a', '--reflink=auto', template, snapshot], check=True, capture_output=True)
+    except (OSError, subprocess.CalledProcessError):
+        remove_local_dir(snapshot)
+        shutil.copytree(template, snapshot)
+    return snapshot
@@ -0,0 +1,91 @@
+from threading import Lock
+from typing import Optional
+from urllib import parse
+
+import urllib3
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+from Config import Config
+
+POOL_SIZE = 10
+"""Число keep-alive соединений на хост selenoid (по умолчанию)"""
+CONNECT_TIMEOUT = 10
+"""Таймаут установки TCP/TLS соединения (сек)"""
+READ_TIMEOUT = 120
+"""Таймаут ответа на команду WebDriver (сек), как у selenium RemoteConnection"""
+
+
+class PooledRemoteConnection(RemoteConnection):
+    """
+    Транспорт команд WebDriver к удаленному хосту (selenoid) через общий пул keep-alive соединений
+    - один urllib3.PoolManager на хост и набор параметров: все сессии процесса переиспользуют установленные
+      TCP/TLS соединения вместо рукопожатия на каждую новую сессию
+    - размер пула и таймауты задаются в Config.browser.selenoid
+    - при `compression` ответы запрашиваются сжатыми (gzip/deflate), urllib3 распаковывает их прозрачно
+    Транспорт опирается на приватные детали RemoteConnection selenium 4.15 (_get_connection_manager, _url, _proxy_url,
+    _ca_certs) и на вызов get_remote_connection_headers через экземпляр: версия selenium зафиксирована в
+    requirements.txt, при ее обновлении класс нужно сверить с RemoteConnection
+    """
+
+    __managers: dict[tuple, urllib3.PoolManager] = {}
+    __lock = Lock()
+
+    def __init__(
+        self,
+        remote_server_addr: str,
+        pool_size: int = POOL_SIZE,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
+        compression: bool = False,
+    ) -> None:
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.compression = compression
+        super().__init__(remote_server_addr, keep_alive=True)
+
+    def _get_connection_manager(self) -> urllib3.PoolManager:
+        if self._proxy_url:
+            return super()._get_connection_manager()
+
+        host = parse.urlparse(self._url).netloc
+        key = (host, self.pool_size, self.connect_timeout, self.read_timeout, self._ca_certs)
+        with self.__lock:
+            manager = self.__managers.get(key)
+            if manager is None:
+                tls = {'cert_reqs': 'CERT_REQUIRED', 'ca_certs': self._ca_certs} if self._ca_certs else {}
+                manager = self.__managers[key] = urllib3.PoolManager(
+                    maxsize=self.pool_size,
+                    timeout=urllib3.Timeout(connect=self.connect_timeout, read=self.read_timeout),
+                    retries=urllib3.Retry(total=2, connect=2, read=False, status=False, redirect=2),
+                    **tls,
+                )
+        return manager
+
+    # В selenium это classmethod, но RemoteConnection._request вызывает его через экземпляр: заголовок сжатия
+    # зависит от настроек экземпляра
+    def get_remote_connection_headers(self, parsed_url, keep_alive=False) -> dict:  # pylint: disable=arguments-renamed
+        headers = super().get_remote_connection_headers(parsed_url, keep_alive)
+        if self.compression:
+            headers['Accept-Encoding'] = 'gzip, deflate'
+        return headers
+
+    def close(self) -> None:
+        """Общий пул не закрывается вместе с сессией: соединения нужны следующим сессиям"""
+
+
+def remote_connection(config: Config, url: Optional[str] = None) -> PooledRemoteConnection:
+    """
+    Функция создания транспорта к selenoid с параметрами из Config.browser.selenoid
+    :param config: Config
+    :param url: str: адрес WebDriver (по умолчанию - selenoid_url)
+    :return: PooledRemoteConnection
+    """
+    selenoid = config.browser.selenoid
+    return PooledRemoteConnection(
+        url or selenoid.selenoid_url,
+        pool_size=selenoid.get('pool_size') or POOL_SIZE,
+        connect_timeout=selenoid.get('connect_timeout') or CONNECT_TIMEOUT,
+        read_timeout=selenoid.get('read_timeout') or READ_TIMEOUT,
+        compression=bool(selenoid.get('compression')),
+    )
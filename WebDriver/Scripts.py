@@ -0,0 +1,288 @@
+import pkgutil
+from functools import cache
+
+# Все скрипты, выполняемые в браузере, начинаются с комментария-метки `/* <имя> */` (как атомы Selenium):
+# по метке скрипт можно опознать в логах WebDriver и в перехватчиках команд
+
+OWN_SCRIPT_PREFIX = '/* pageObject'
+NOT_INSTALLED = 'pageObjectNotInstalled'
+MUTATING_SCRIPTS = (
+    '/* pageObjectFill */',
+    '/* pageObjectBatch */',
+    '/* pageObjectReset */',
+    '/* pageObjectRestoreStorage */',
+)
+"""Собственные скрипты, изменяющие состояние страницы (остальные собственные скрипты только читают DOM)"""
+
+LOOKUP = """/* pageObjectLookup */
+var isDisplayed = window.__pageObjectIsDisplayed;
+if (!isDisplayed) { return arguments[5]; }
+var by = arguments[0], value = arguments[1], root = arguments[2] || document;
+var visibility = arguments[3], single = arguments[4];
+var found = [], i;
+if (by === 'css selector') {
+    found = Array.prototype.slice.call(root.querySelectorAll(value));
+} else if (by === 'xpath') {
+    var snapshot = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (i = 0; i < snapshot.snapshotLength; i++) {
+        if (snapshot.snapshotItem(i).nodeType === 1) { found.push(snapshot.snapshotItem(i)); }
+    }
+} else if (by === 'link text') {
+    var anchors = root.querySelectorAll('a');
+    for (i = 0; i < anchors.length; i++) {
+        if ((anchors[i].innerText || '').trim() === value) { found.push(anchors[i]); }
+    }
+} else {
+    throw new Error('pageObjectLookup: unsupported locator strategy ' + by);
+}
+if (!found.length) { return null; }
+var result = [];
+for (i = 0; i < found.length; i++) {
+    if (isDisplayed(found[i])) {
+        if (single) { return [found[i]]; }
+        result.push(found[i]);
+        continue;
+    }
+    if (!visibility) {
+        if (single) { return [found[i]]; }
+        result.push(found[i]);
+        continue;
+    }
+    if (!single && !result.length) { return null; }
+}
+return result.length ? result : null;
+"""
+"""
+Поиск элементов и фильтр видимости за одну команду WebDriver
+arguments: by, value, root (WebElement | null), wait_element_visibility, single, NOT_INSTALLED
+:return: список найденных элементов | null | NOT_INSTALLED (если на странице не установлен isDisplayed)
+"""
+
+LOOKUP_STRATEGIES = ('css selector', 'xpath', 'link text')
+
+
+@cache
+def install_helpers() -> str:
+    """
+    Скрипт установки вспомогательных функций на страницу (один раз на документ)
+    - isDisplayed: атом Selenium, тот же, что использует WebElement.is_displayed()
+    :return: str: текст скрипта
+    """
+    is_displayed = pkgutil.get_data('selenium.webdriver.remote', 'isDisplayed.js').decode('utf8')
+    return f"/* pageObjectInstall */window.__pageObjectIsDisplayed = {is_displayed};"
+
+
+WAIT = """/* pageObjectWait */
+var done = arguments[arguments.length - 1];
+var by = arguments[0], value = arguments[1], state = arguments[2], element = arguments[3], timeout = arguments[4];
+var root = arguments[6] || document, beacon = arguments[7];
+var isDisplayed = window.__pageObjectIsDisplayed;
+if (!isDisplayed && (state === 'visible' || state === 'invisible')) { done(arguments[5]); return; }
+function query(single) {
+    if (by === 'xpath') {
+        var type = single ? XPathResult.FIRST_ORDERED_NODE_TYPE : XPathResult.ORDERED_NODE_SNAPSHOT_TYPE;
+        var res = document.evaluate(value, root, null, type, null), out = [];
+        if (single) { return res.singleNodeValue ? [res.singleNodeValue] : []; }
+        for (var j = 0; j < res.snapshotLength; j++) { out.push(res.snapshotItem(j)); }
+        return out;
+    }
+    if (single) { return [root.querySelector(value)].filter(Boolean); }
+    return Array.prototype.slice.call(root.querySelectorAll(value));
+}
+function check() {
+    var ready = document.readyState === 'interactive' || document.readyState === 'complete';
+    if (state === 'ready') { return ready; }
+    if (state === 'detached') { return !element || !element.isConnected; }
+    if (state === 'present') { return query(true).length > 0; }
+    if (state === 'invisible') { var first = query(true); return !first.length || !isDisplayed(first[0]); }
+    if (state === 'visible') { return query(false).some(function (el) { return isDisplayed(el); }); }
+    throw new Error('pageObjectWait: unsupported state ' + state);
+}
+var finished = false, observer = null, poll = null, timer = null;
+function finish(result) {
+    if (finished) { return; }
+    finished = true;
+    if (result && state === 'ready' && beacon !== null) { window.__pageObjectEpoch = beacon; }
+    if (observer) { observer.disconnect(); }
+    clearInterval(poll);
+    clearTimeout(timer);
+    document.removeEventListener('readystatechange', onChange);
+    done(result);
+}
+function onChange() {
+    try { if (check()) { finish(true); } } catch (e) { finish(false); }
+}
+if (check()) { finish(true); return; }
+observer = new MutationObserver(onChange);
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+document.addEventListener('readystatechange', onChange);
+poll = setInterval(onChange, 100);
+timer = setTimeout(function () { finish(false); }, timeout);
+"""
+"""
+Ожидание состояния DOM без поллинга со стороны WebDriver: MutationObserver + readystatechange (+ страховочный
+интервал 100 мс в браузере для CSS-анимаций), выполняется через execute_async_script
+arguments: by, value, state, element, timeout (мс), NOT_INSTALLED, root, beacon
+beacon: для state='ready' - значение маяка `window.__pageObjectEpoch`, устанавливаемого при готовности документа
+state: 'ready' | 'present' | 'visible' | 'invisible' | 'detached'
+:return: true - состояние достигнуто | false - истек timeout | NOT_INSTALLED
+"""
+
+READY_STATE = """/* pageObjectReadyState */
+var ready = document.readyState === 'interactive' || document.readyState === 'complete';
+if (ready && arguments[0] !== null) { window.__pageObjectEpoch = arguments[0]; }
+return ready;
+"""
+"""Синхронная проверка готовности документа (поллинг), arguments: beacon"""
+
+BEACON_PROBE = """/* pageObjectBeacon */
+var ready = document.readyState === 'interactive' || document.readyState === 'complete';
+return ready && window.__pageObjectEpoch === arguments[0];
+"""
+"""Проверка маяка: документ не сменился с момента установки маяка, arguments: beacon"""
+
+RESET_STORAGE = """/* pageObjectReset */
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+"""Очистка localStorage/sessionStorage текущего origin (сброс сессии браузера между арендами)"""
+
+CAPTURE_STORAGE = """/* pageObjectCaptureStorage */
+function dump(storage) {
+    var data = {};
+    for (var i = 0; i < storage.length; i++) { data[storage.key(i)] = storage.getItem(storage.key(i)); }
+    return data;
+}
+return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+"""Снимок localStorage/sessionStorage текущего origin"""
+
+RESTORE_STORAGE = """/* pageObjectRestoreStorage */
+var local = arguments[0] || {}, session = arguments[1] || {}, key;
+for (key in local) { window.localStorage.setItem(key, local[key]); }
+for (key in session) { window.sessionStorage.setItem(key, session[key]); }
+"""
+"""Восстановление localStorage/sessionStorage текущего origin, arguments: local, session"""
+
+SET_VALUE = """function setValue(element, text, clear) {
+    var tag = element.tagName.toLowerCase();
+    if ((tag !== 'input' && tag !== 'textarea') || element.readOnly || element.disabled) { return false; }
+    var prototype = tag === 'input' ? window.HTMLInputElement.prototype : window.HTMLTextAreaElement.prototype;
+    var setter = Object.getOwnPropertyDescriptor(prototype, 'value').set;
+    var value = clear ? text : element.value + text;
+    element.focus();
+    setter.call(element, value);
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    element.dispatchEvent(new KeyboardEvent('keyup', {bubbles: true}));
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+    return element.value === value;
+}
+"""
+"""Функция JS ввода значения в поле (общая для Scripts.FILL и Scripts.BATCH)"""
+
+FILL = f"""/* pageObjectFill */
+{SET_VALUE}return setValue(arguments[0], arguments[1], arguments[2]);
+"""
+"""
+Ввод значения в поле одной командой: нативный setter value (его отслеживают фреймворки) и события input/keyup/change
+arguments: element, text, clear
+:return: true - значение установлено | false - элемент не поле ввода (нужен ввод через send_keys)
+"""
+
+TABLE_SEARCH = """/* pageObjectTableSearch */
+var isDisplayed = window.__pageObjectIsDisplayed;
+if (!isDisplayed) { return arguments[6]; }
+var selector = arguments[0], needle = arguments[1], matchCase = arguments[2], matchWords = arguments[3];
+var root = arguments[4] || document, useIndex = arguments[5] && !arguments[4];
+var entry = null, rows, texts, i;
+if (useIndex) {
+    var indexes = window.__pageObjectTableIndex = window.__pageObjectTableIndex || {};
+    entry = indexes[selector];
+    if (!entry || entry.dirty) {
+        if (entry) { entry.observer.disconnect(); }
+        entry = indexes[selector] = {dirty: false, lower: null};
+        entry.rows = Array.prototype.slice.call(document.querySelectorAll(selector));
+        entry.texts = entry.rows.map(function (row) { return (row.innerText || '').trim(); });
+        entry.observer = new MutationObserver(function () { entry.dirty = true; });
+        entry.observer.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+    }
+    if (!matchCase && !entry.lower) {
+        entry.lower = entry.texts.map(function (text) { return text.toLowerCase(); });
+    }
+    rows = entry.rows;
+    texts = matchCase ? entry.texts : entry.lower;
+} else {
+    rows = Array.prototype.slice.call(root.querySelectorAll(selector));
+    texts = null;
+}
+needle = matchCase ? needle : needle.toLowerCase();
+for (i = 0; i < rows.length; i++) {
+    var text = texts ? texts[i] : (rows[i].innerText || '').trim();
+    if (!texts && !matchCase) { text = text.toLowerCase(); }
+    if ((matchWords ? text === needle : text.indexOf(needle) !== -1) && isDisplayed(rows[i])) { return rows[i]; }
+}
+return null;
+"""
+"""
+Поиск строки таблицы по тексту в браузере одной командой WebDriver: возвращается первый видимый подходящий элемент
+- при use_index тексты строк кэшируются на странице (по селектору) до первого изменения DOM (MutationObserver)
+arguments: selector, text, match_case, match_words, root (WebElement | null), use_index, NOT_INSTALLED
+:return: элемент | null | NOT_INSTALLED (если на странице не установлен isDisplayed)
+"""
+
+SNAPSHOT = """/* pageObjectSnapshot */
+var state = window.__pageObjectSnapshot;
+if (!state) {
+    state = window.__pageObjectSnapshot = {version: 1};
+    new MutationObserver(function () { state.version++; }).observe(
+        document.documentElement, {childList: true, subtree: true, characterData: true, attributes: true}
+    );
+}
+return [state.version, document.documentElement.outerHTML];
+"""
+"""
+Снимок DOM (outerHTML документа) и номер его версии: MutationObserver увеличивает версию при каждом изменении DOM
+:return: [version, html]
+"""
+
+SNAPSHOT_VERSION = """/* pageObjectSnapshotVersion */
+var state = window.__pageObjectSnapshot;
+return state ? state.version : null;
+"""
+"""Номер версии DOM, снятой Scripts.SNAPSHOT (null - документ сменился или снимок не снимался)"""
+
+BATCH = f"""/* pageObjectBatch */
+var isDisplayed = window.__pageObjectIsDisplayed;
+if (!isDisplayed) {{ return arguments[1]; }}
+{SET_VALUE}function visible(selector) {{
+    var found = document.querySelectorAll(selector);
+    for (var i = 0; i < found.length; i++) {{ if (isDisplayed(found[i])) {{ return found[i]; }} }}
+    return null;
+}}
+function disabled(element) {{
+    return element.hasAttribute('disabled') || (element.getAttribute('class') || '').indexOf('disabled') !== -1;
+}}
+var steps = arguments[0];
+for (var i = 0; i < steps.length; i++) {{
+    var action = steps[i][0], element = visible(steps[i][1]), ok;
+    if (!element) {{ return [i, null]; }}
+    if (action === 'fill') {{
+        ok = setValue(element, steps[i][2], steps[i][3]);
+    }} else if (action === 'text') {{
+        ok = (element.innerText || '').trim() === steps[i][2];
+    }} else if (action === 'enabled' || action === 'disabled') {{
+        ok = disabled(element) === (action === 'disabled');
+    }} else {{
+        return [i, element];
+    }}
+    if (!ok) {{ return [i, null]; }}
+}}
+return [steps.length, null];
+"""
+"""
+Выполнение группы шагов PageObject одной командой: поиск первого видимого элемента по css-селектору и действие/проверка
+- 'fill' (ввод значения), 'text' (проверка видимого текста), 'enabled' / 'disabled' (проверка доступности)
+- на любом другом шаге (click, посимвольный ввод) выполнение прерывается: элемент возвращается для действия WebDriver
+arguments: steps ([action, selector, text, clear]), NOT_INSTALLED
+:return: [число выполненных шагов, элемент для действия WebDriver | null] | NOT_INSTALLED
+"""
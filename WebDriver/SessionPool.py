@@ -0,0 +1,236 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Optional
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+from Config import Config
+from Utils import TMP_PATH, file_lock
+from WebDriver.RemoteTransport import remote_connection
+from WebDriver.WebDriver import WebDriver
+
+
+class AttachedRemote(webdriver.Remote):
+    """Подключение к уже запущенной сессии WebDriver (без команды NEW_SESSION)"""
+
+    def __init__(self, command_executor: str | RemoteConnection, session_id: str, capabilities: dict, options) -> None:
+        self.__session_id = session_id
+        self.__capabilities = capabilities
+        super().__init__(command_executor=command_executor, options=options)
+
+    def start_session(self, capabilities: dict) -> None:
+        """Вместо создания новой сессии используется существующая"""
+        self.session_id = self.__session_id
+        self.caps = self.__capabilities
+
+
+class SessionPool:
+    """
+    Пул прогретых сессий браузера
+    - сессии выдаются в аренду (lease) вместо запуска браузера на каждый тестовый класс
+    - между арендами сбрасываются cookies и localStorage/sessionStorage текущего origin (без перезапуска браузера)
+    - после `max_leases` аренд сессия закрывается и при следующей аренде заменяется новой
+    - удаленные (selenoid) сессии регистрируются в общем реестре и арендуются всеми процессами (pytest-xdist),
+      локальные сессии принадлежат процессу, запустившему драйвер, и переиспользуются только внутри него
+    - свободные сессии реестра закрывает последний завершающийся процесс: пока работает другой владелец или
+      арендатор сессий реестра, они остаются ему в аренду
+    """
+
+    def __init__(self, config: Config) -> None:
+        self.config = config
+        pool_config = config.browser.session_pool
+        self.size = pool_config.size
+        self.max_leases = pool_config.max_leases
+        self.registry_path = pool_config.registry_path or os.path.join(TMP_PATH, 'session_pool.json')
+        self.shared = bool(config.browser.selenoid.use_selenoid)
+        self.lessee = f"{os.getenv('PYTEST_XDIST_WORKER', 'main')}:{os.getpid()}"
+        self.__idle: list[WebDriver] = []
+        self.__leases: dict[str, int] = {}
+        self.__lock = Lock()
+
+    def warm_up(self) -> None:
+        """
+        Метод параллельного запуска недостающих до `size` свободных сессий
+        """
+        with self.__lock:
+            idle = len(self.__idle)
+        if self.shared:
+            with file_lock(self.registry_path):
+                idle = sum(1 for entry in self.__read_registry().values() if not entry['lessee'])
+
+        missing = self.size - idle
+        if missing <= 0:
+            return
+        with ThreadPoolExecutor(max_workers=missing) as executor:
+            drivers = list(executor.map(lambda _: WebDriver(self.config), range(missing)))
+        for driver in drivers:
+            self.__leases[driver.session_id] = 0
+            self.__park(driver)
+
+    def lease(self, name: Optional[str] = None) -> WebDriver:
+        """
+        Метод выдачи сессии в аренду: свободная сессия из пула или новая, если свободных нет
+        :param name: str: имя теста (для selenoid)
+        :return: WebDriver
+        """
+        if self.shared:
+            entry = self.__acquire_registered()
+            if entry:
+                session = self.__attach(entry)
+                self.__leases[session.session_id] = entry['leases']
+                return WebDriver(self.config, name, session=session)
+        else:
+            with self.__lock:
+                if self.__idle:
+                    return self.__idle.pop()
+
+        driver = WebDriver(self.config, name)
+        self.__leases[driver.session_id] = 0
+        if self.shared:
+            self.__register(driver, lessee=self.lessee)
+        return driver
+
+    def release(self, driver: WebDriver) -> None:
+        """
+        Метод возврата сессии в пул: сброс состояния браузера или закрытие после `max_leases` аренд
+        :param driver: WebDriver: арендованная сессия
+        """
+        session_id = driver.session_id
+        leases = self.__leases.pop(session_id, 0) + 1
+        if leases < self.max_leases:
+            try:
+                self.reset(driver)
+                self.__leases[session_id] = leases
+                self.__park(driver)
+                return
+            except WebDriverException:
+                pass
+
+        self.__unregister(session_id)
+        self.__quit(driver)
+
+    def close(self) -> None:
+        """
+        Метод закрытия свободных сессий пула (арендованные закрываются их арендаторами при release/close)
+        - свободные сессии общего реестра закрываются, только если других работающих процессов пула нет
+        - сессии, арендованные завершившимся процессом, закрываются всегда
+        """
+        with self.__lock:
+            idle, self.__idle = self.__idle, []
+        for driver in idle:
+            self.__quit(driver)
+
+        if not self.shared:
+            return
+        with file_lock(self.registry_path):
+            registry = self.__read_registry()
+            workers = {entry.get(key) for entry in registry.values() for key in ('owner', 'lessee')}
+            others = any(self.__lessee_alive(worker) for worker in workers - {None, self.lessee})
+            for session_id, entry in list(registry.items()):
+                if entry['lessee'] and self.__lessee_alive(entry['lessee']):
+                    continue
+                if others and not entry['lessee']:
+                    continue
+                registry.pop(session_id)
+                try:
+                    self.__attach(entry).quit()
+                except WebDriverException:
+                    pass
+            self.__write_registry(registry)
+
+    @staticmethod
+    def reset(driver: WebDriver) -> None:
+        """
+        Метод сброса состояния браузера между арендами: cookies, localStorage/sessionStorage, открытая страница
+        :param driver: WebDriver
+        """
+        driver.reset_state()
+
+    def __park(self, driver: WebDriver) -> None:
+        """Вернуть сессию в число свободных"""
+        if self.shared:
+            self.__register(driver, lessee=None)
+            return
+        with self.__lock:
+            self.__idle.append(driver)
+
+    def __attach(self, entry: dict) -> AttachedRemote:
+        """Подключиться к зарегистрированной удаленной сессии"""
+        options = (
+            webdriver.FirefoxOptions() if self.config.browser.browser_name == 'firefox' else webdriver.ChromeOptions()
+        )
+        executor = remote_connection(self.config, entry['executor'])
+        return AttachedRemote(executor, entry['session_id'], entry['capabilities'], options)
+
+    def __acquire_registered(self) -> Optional[dict]:
+        """Забрать из реестра свободную удаленную сессию"""
+        with file_lock(self.registry_path):
+            registry = self.__read_registry()
+            for entry in registry.values():
+                if not entry['lessee']:
+                    entry['lessee'] = self.lessee
+                    self.__write_registry(registry)
+                    return entry
+        return None
+
+    def __register(self, driver: WebDriver, lessee: Optional[str]) -> None:
+        """Записать удаленную сессию в реестр"""
+        with file_lock(self.registry_path):
+            registry = self.__read_registry()
+            registry[driver.session_id] = {
+                'session_id': driver.session_id,
+                'executor': driver.command_executor._url,  # pylint: disable=protected-access
+                'capabilities': driver.caps,
+                'leases': self.__leases.get(driver.session_id, 0),
+                'lessee': lessee,
+                'owner': registry.get(driver.session_id, {}).get('owner', self.lessee),
+            }
+            self.__write_registry(registry)
+
+    def __unregister(self, session_id: str) -> None:
+        """Удалить сессию из реестра"""
+        if not self.shared:
+            return
+        with file_lock(self.registry_path):
+            registry = self.__read_registry()
+            if registry.pop(session_id, None):
+                self.__write_registry(registry)
+
+    def __read_registry(self) -> dict:
+        """Прочитать реестр удаленных сессий (вызывать под file_lock)"""
+        if not os.path.exists(self.registry_path):
+            return {}
+        with open(self.registry_path, 'rt', encoding='utf-8') as file:
+            return json.load(file)
+
+    def __write_registry(self, registry: dict) -> None:
+        """Атомарно записать реестр удаленных сессий (вызывать под file_lock)"""
+        tmp_path = f"{self.registry_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(registry, file, indent=4, sort_keys=True)
+        os.replace(tmp_path, self.registry_path)
+
+    @staticmethod
+    def __lessee_alive(lessee: str) -> bool:
+        """Проверить, что процесс-арендатор (владелец) еще работает"""
+        if os.name != 'posix':
+            return True
+        try:
+            os.kill(int(lessee.rsplit(':', 1)[-1]), 0)
+        except (ValueError, ProcessLookupError):
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    @staticmethod
+    def __quit(driver: WebDriver) -> None:
+        """Закрыть сессию, не прерывая teardown при ошибке"""
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
@@ -0,0 +1,218 @@
+import json
+import math
+import os
+from collections import defaultdict
+from typing import Optional
+
+from Utils import file_lock
+from WebDriver.WebBase import BACKOFF_START, TIMEOUT_STEP
+
+HISTORY_SIZE = 200
+"""Число последних замеров ожидания, хранимых на ключ (PageObject, селектор)"""
+MIN_SAMPLES = 20
+"""Адаптивные пороги применяются, только когда по ключу накоплено не меньше MIN_SAMPLES успешных ожиданий"""
+HEADROOM = 3
+"""Ожидаемый порог ожидания: p99 успешных ожиданий * HEADROOM (но не больше таймаута, заданного в вызове)"""
+MIN_THRESHOLD = 0.2
+"""Нижняя граница ожидаемого порога (сек)"""
+CUTOFF_EXPLORE = 10
+"""Каждая CUTOFF_EXPLORE-я проба ключа идет до таймаута вызова: позднее срабатывание попадает в историю, порог растет"""
+FLAKY_RATIO = 5
+"""Ключ отмечается нестабильным, если ожидание превысило ожидаемый порог или p99 больше медианы в FLAKY_RATIO раз ..."""
+FLAKY_MIN_P99 = 1.0
+"""... и p99 больше FLAKY_MIN_P99 сек (медленный и нестабильный селектор)"""
+
+
+def percentile(values: list[float], rank: float) -> float:
+    """
+    Функция расчета перцентиля по ближайшему рангу
+    :param values: list: значения
+    :param rank: float: 0..1
+    :return: float
+    """
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(rank * len(ordered)) - 1)]
+
+
+class WaitHistory:
+    """
+    Класс истории длительности ожиданий PageObject по ключу (PageObject, селектор | условие) между запусками
+    - record: фактическая длительность ожидания и его исход (дождались / таймаут)
+    - limits: лимит ожидания и адаптивный интервал поллинга (из медианы)
+    - ожидание, результат которого проверяется (assert), по ожидаемому порогу (из p99 успешных ожиданий) не
+      прерывается: фактическая длительность записывается (порог растет вместе с медленным окружением), а превышение
+      отмечается в отчете
+    - проба (отрицательный исход допустим и обрабатывается вызывающим) прерывается на ожидаемом пороге; каждая
+      CUTOFF_EXPLORE-я проба ключа идет до таймаута вызова, чтобы порог мог вырасти; прерывания учитываются в отчете
+    - flaky: медленные нестабильные ключи (превышения порога, длинный хвост распределения) для отчета
+    История хранится в JSON файле (config: waits.history_path) и дописывается в конце сессии под file_lock
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        """Запись длительности ожиданий (config: waits.record)"""
+        self.adaptive = False
+        """Применение адаптивного интервала поллинга и учет превышений порога (config: waits.adaptive)"""
+        self.history_path: Optional[str] = None
+        self.__samples: dict[str, list[float]] = defaultdict(list)
+        self.__misses: dict[str, int] = defaultdict(int)
+        self.__new_samples: dict[str, list[float]] = defaultdict(list)
+        self.__new_misses: dict[str, int] = defaultdict(int)
+        self.__overruns: dict[str, int] = defaultdict(int)
+        self.__new_overruns: dict[str, int] = defaultdict(int)
+        self.__cutoffs: dict[str, int] = defaultdict(int)
+        self.__new_cutoffs: dict[str, int] = defaultdict(int)
+        self.__probes: dict[str, int] = defaultdict(int)
+
+    @staticmethod
+    def key(page: str, target: str) -> str:
+        """
+        Ключ истории
+        :param page: str: имя PageObject
+        :param target: str: селектор или условие (например, `title:<текст>`)
+        :return: str
+        """
+        return f"{page} {target}"
+
+    def configure(self, record: bool, adaptive: bool, history_path: str) -> None:
+        """
+        Метод включения истории: чтение накопленных замеров из файла
+        :param record: bool: записывать длительность ожиданий
+        :param adaptive: bool: применять адаптивные пороги (включает запись)
+        :param history_path: str: путь к JSON файлу истории
+        """
+        self.enabled = record or adaptive
+        self.adaptive = adaptive
+        self.history_path = history_path
+        if self.enabled and os.path.exists(history_path):
+            with file_lock(history_path):
+                data = self.__read()
+            for key, entry in data.items():
+                self.__samples[key] = entry.get('samples', [])[-HISTORY_SIZE:]
+                self.__misses[key] = entry.get('misses', 0)
+                self.__overruns[key] = entry.get('overruns', 0)
+                self.__cutoffs[key] = entry.get('cutoffs', 0)
+
+    def record(self, key: str, duration: float, found: bool, cutoff: bool = False) -> None:
+        """
+        Метод записи ожидания
+        :param key: str: ключ (см. key)
+        :param duration: float: длительность (сек)
+        :param found: bool: условие выполнено (False - ожидание закончилось по таймауту)
+        :param cutoff: bool: проба прервана на ожидаемом пороге (учитывается отдельно от таймаутов)
+        """
+        if not self.enabled:
+            return
+        if cutoff and not found:
+            self.__cutoffs[key] += 1
+            self.__new_cutoffs[key] += 1
+            return
+        threshold = self.__threshold(key)
+        if found and threshold is not None and duration > threshold:
+            self.__overruns[key] += 1
+            self.__new_overruns[key] += 1
+        if found:
+            self.__samples[key].append(round(duration, 4))
+            del self.__samples[key][:-HISTORY_SIZE]
+            self.__new_samples[key].append(round(duration, 4))
+        else:
+            self.__misses[key] += 1
+            self.__new_misses[key] += 1
+
+    def limits(self, key: str, timeout: float | int, probe: bool = False) -> tuple[float | int, float]:
+        """
+        Метод расчета лимитов ожидания по истории ключа
+        - лимит: таймаут вызова; для пробы - ожидаемый порог p99 * HEADROOM (не меньше MIN_THRESHOLD), кроме каждой
+          CUTOFF_EXPLORE-й пробы ключа
+        - интервал поллинга: половина медианы (от BACKOFF_START до TIMEOUT_STEP)
+        :param key: str: ключ (см. key)
+        :param timeout: float | int: таймаут, заданный в вызове
+        :param probe: bool: отрицательный исход ожидания допустим (обрабатывается вызывающим)
+        :return: tuple: (лимит, интервал поллинга); без истории - (timeout, TIMEOUT_STEP)
+        """
+        threshold = self.__threshold(key)
+        if threshold is None:
+            return timeout, TIMEOUT_STEP
+        poll = min(TIMEOUT_STEP, max(BACKOFF_START, percentile(self.__samples[key], 0.5) / 2))
+        if not probe or threshold >= timeout:
+            return timeout, poll
+        self.__probes[key] += 1
+        return (timeout if self.__probes[key] % CUTOFF_EXPLORE == 0 else threshold), poll
+
+    def __threshold(self, key: str) -> Optional[float]:
+        """Ожидаемый порог ключа (None - адаптивный режим выключен или истории недостаточно)"""
+        samples = self.__samples.get(key) if self.adaptive else None
+        if not samples or len(samples) < MIN_SAMPLES:
+            return None
+        return max(MIN_THRESHOLD, percentile(samples, 0.99) * HEADROOM)
+
+    def report(self) -> dict:
+        """
+        Метод построения статистики по ключам: число ожиданий, таймаутов, превышений ожидаемого порога, прерванных
+        проб, p50/p99 (мс), признак нестабильности
+        :return: dict
+        """
+        report = {}
+        for key in sorted(set(self.__samples) | set(self.__misses) | set(self.__cutoffs)):
+            samples = self.__samples.get(key) or []
+            entry = {
+                'count': len(samples),
+                'misses': self.__misses.get(key, 0),
+                'overruns': self.__overruns.get(key, 0),
+                'cutoffs': self.__cutoffs.get(key, 0),
+            }
+            if samples:
+                p50, p99 = percentile(samples, 0.5), percentile(samples, 0.99)
+                entry |= {
+                    'p50_ms': round(p50 * 1000, 1),
+                    'p99_ms': round(p99 * 1000, 1),
+                    'flaky': entry['overruns'] > 0 or (p99 > FLAKY_MIN_P99 and p99 > p50 * FLAKY_RATIO),
+                }
+            report[key] = entry
+        return report
+
+    def flaky(self) -> list[str]:
+        """
+        Метод отбора медленных нестабильных ключей
+        :return: list: описания ключей
+        """
+        return [
+            f"{key}: p50 {entry['p50_ms']} мс, p99 {entry['p99_ms']} мс, таймаутов {entry['misses']}, "
+            f"превышений порога {entry['overruns']}, прерванных проб {entry['cutoffs']}"
+            for key, entry in self.report().items()
+            if entry.get('flaky')
+        ]
+
+    def save(self) -> None:
+        """
+        Метод дописывания замеров текущего процесса в файл истории (параллельные процессы не теряют замеры друг друга)
+        """
+        if not self.enabled or not (self.__new_samples or self.__new_misses or self.__new_cutoffs):
+            return
+        with file_lock(self.history_path):
+            data = self.__read()
+            for key in set(self.__new_samples) | set(self.__new_misses) | set(self.__new_cutoffs):
+                entry = data.setdefault(key, {'samples': [], 'misses': 0})
+                entry['samples'] = (entry['samples'] + self.__new_samples.get(key, []))[-HISTORY_SIZE:]
+                entry['misses'] += self.__new_misses.get(key, 0)
+                entry['overruns'] = entry.get('overruns', 0) + self.__new_overruns.get(key, 0)
+                entry['cutoffs'] = entry.get('cutoffs', 0) + self.__new_cutoffs.get(key, 0)
+            tmp_path = f"{self.history_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='UTF-8') as file:
+                file.write(json.dumps(data, indent=1, sort_keys=True))
+            os.replace(tmp_path, self.history_path)
+        self.__new_samples.clear()
+        self.__new_misses.clear()
+        self.__new_overruns.clear()
+        self.__new_cutoffs.clear()
+
+    def __read(self) -> dict:
+        """Прочитать файл истории (вызывать под file_lock)"""
+        if not os.path.exists(self.history_path):
+            return {}
+        with open(self.history_path, 'rt', encoding='UTF-8') as file:
+            return json.load(file)
+
+
+WAIT_HISTORY = WaitHistory()
+"""Общий для процесса экземпляр WaitHistory"""
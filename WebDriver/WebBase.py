@@ -1,9 +1,12 @@
 from os import linesep
-from time import sleep
+from time import monotonic, sleep
+from typing import Any, Callable, Optional
 
 from selenium.common.exceptions import (
+    JavascriptException,
     NoSuchElementException,
     NoSuchWindowException,
+    StaleElementReferenceException,
     TimeoutException,
     UnexpectedAlertPresentException,
     WebDriverException,
@@ -13,8 +16,42 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as ec
 from selenium.webdriver.support.wait import WebDriverWait
 
+from WebDriver import Scripts
+from WebDriver.Instrumentation import instrumented
+
 TIMEOUT_STEP = 0.5
 MAX_TIMEOUT = 5
+OBSERVER_CHUNK = 20
+BATCHED_LOOKUP = True
+"""Поиск, фильтр видимости и выбор элемента выполняются в браузере одним `execute_script`"""
+IN_BROWSER_TABLE_SEARCH = True
+"""Поиск строки таблицы по тексту выполняется в браузере одним `execute_script` вместо чтения текста каждой строки"""
+BACKOFF_START = 0.05
+"""Первая пауза поллинга условий (сек): далее удваивается до TIMEOUT_STEP"""
+ABSENCE_WINDOW = 0.5
+"""Окно стабильности проверки отсутствия элемента (сек, см. WebBase.absent_within)"""
+
+
+def poll_until(probe: Callable[[], Any], predicate: Callable[[Any], bool], timeout: float | int) -> tuple[bool, Any]:
+    """
+    Функция ожидания условия: поллинг с экспоненциальной паузой от BACKOFF_START до TIMEOUT_STEP
+    - первая проверка выполняется сразу, выход - как только условие выполнено
+    :param probe: callable: получение текущего значения (одна команда WebDriver)
+    :param predicate: callable: условие над значением
+    :param timeout: максимальное время ожидания (сек)
+    :return: tuple: (условие выполнено, последнее полученное значение)
+    """
+    deadline = monotonic() + timeout
+    step = BACKOFF_START
+    while True:
+        actual = probe()
+        if predicate(actual):
+            return True, actual
+        remaining = deadline - monotonic()
+        if remaining <= 0:
+            return False, actual
+        sleep(min(step, remaining))
+        step = min(step * 2, TIMEOUT_STEP)
 
 
 class WebBase:
@@ -24,7 +61,15 @@ class WebBase:
         self.driver = None
         self.elem = None
 
-    def __custom_find_by(self, by_method: str, value: str, timeout: float | int, wait_element_visibility=True):
+    def __custom_find_by(
+        self,
+        by_method: str,
+        value: str,
+        timeout: float | int,
+        wait_element_visibility=True,
+        observer=False,
+        poll_frequency: float = TIMEOUT_STEP,
+    ):
         """
         Кастомная обертка методов поиска WebElement с поддержкой таймаутов и поиска невидимых элементов
         """
@@ -35,12 +80,19 @@ class WebBase:
         if not isinstance(self, WebElement):
             self.wait_interactive_ready_state()
 
+        if observer and not self.__wait_appearance(by_method, value, timeout, wait_element_visibility):
+            return None
+
         def _expected_condition(_driver):
             """
             Функция поиска для метода until
             :param _driver: экземпляр WebDriver
             :return: первый найденный WbElement или NoSuchElementException
             """
+            batched = self.__batched_lookup(by_method, value, wait_element_visibility, single=True)
+            if batched is not None:
+                return batched[0]
+
             prop = getattr(_driver, 'find_elements')
 
             # Получаем список элементов
@@ -62,7 +114,7 @@ class WebBase:
         wait = WebDriverWait(
             driver,
             timeout,
-            TIMEOUT_STEP,
+            poll_frequency,
             ignored_exceptions=[
                 NoSuchElementException,
             ],
@@ -70,19 +122,18 @@ class WebBase:
 
         try:
             return WebElement(
-                wait.until(
-                    _expected_condition,
-                    message=f"INFO:\tНа странице с PageTitle: `{driver.title}` WebElement с селектором `{value}`"
-                    f" не найден за {timeout} сек",
-                ),
+                wait.until(_expected_condition),
                 driver,
+                locator=(self, by_method, value, wait_element_visibility),
             )
 
-        except TimeoutException as e:
-            print(str(e))
+        except TimeoutException:
+            self.__report_not_found(value, timeout)
             return None
 
-    def __custom_finds_by(self, by_method: str, value: str, timeout: float | int, wait_element_visibility=True):
+    def __custom_finds_by(
+        self, by_method: str, value: str, timeout: float | int, wait_element_visibility=True, observer=False
+    ):
         """
         Кастомная обертка методов поиска WebElements с поддержкой таймаутов и поиска невидимых элементов
         """
@@ -93,12 +144,19 @@ class WebBase:
         if not isinstance(self, WebElement):
             self.wait_interactive_ready_state()
 
+        if observer and not self.__wait_appearance(by_method, value, timeout, wait_element_visibility):
+            return []
+
         def _expected_condition(_driver):
             """
             Функция поиска для метода until
             :param _driver: экземпляр WebDriver
             :return: список найденных WbElement или NoSuchElementException
             """
+            batched = self.__batched_lookup(by_method, value, wait_element_visibility, single=False)
+            if batched is not None:
+                return batched
+
             result = []
             prop = getattr(_driver, 'find_elements')
             elems = prop(by_method, value)
@@ -131,54 +189,193 @@ class WebBase:
 
         try:
             ret_results = []
-            elements = wait.until(
-                _expected_condition,
-                message=f"INFO:\tНа странице с PageTitle: `{driver.title}` WebElement с селектором `{value}` "
-                f"не найден за {timeout} сек",
-            )
+            elements = wait.until(_expected_condition)
             for element in elements:
                 ret_results.append(WebElement(element, driver))
             return ret_results
-        except TimeoutException as e:
-            print(str(e))
+        except TimeoutException:
+            self.__report_not_found(value, timeout)
             return []
 
-    def wait_interactive_ready_state(self):
+    def __report_not_found(self, value: str, timeout: float | int) -> None:
+        """
+        Сообщение о ненайденном элементе: заголовок страницы запрашивается только после неудачного поиска
+        (а не при формировании сообщения для until на каждом поиске - лишняя команда WebDriver)
+        """
+        try:
+            title = self.driver.title
+        except WebDriverException:
+            title = None
+        print(f"INFO:\tНа странице с PageTitle: `{title}` WebElement с селектором `{value}` не найден за {timeout} сек")
+
+    def __batched_lookup(self, by_method: str, value: str, wait_element_visibility: bool, single: bool):
+        """
+        Поиск элементов одной командой WebDriver: запрос, фильтр видимости и выбор первого видимого в браузере
+        :param by_method: str: стратегия поиска (By.CSS_SELECTOR | By.XPATH | By.LINK_TEXT)
+        :param value: str: значение локатора
+        :param wait_element_visibility: bool: признак видимости элемента
+        :param single: bool: вернуть только первый подходящий элемент
+        :return: list: найденные selenium WebElement | None: режим недоступен (нужен поиск через find_elements)
+        :raise NoSuchElementException: подходящих элементов нет (until повторит попытку)
+        """
+        from WebDriver.WebElement import WebElement  # isort:skip
+
+        if not BATCHED_LOOKUP or by_method not in Scripts.LOOKUP_STRATEGIES:
+            return None
+
+        root = self.elem if isinstance(self, WebElement) else None
+        args = (by_method, value, root, wait_element_visibility, single, Scripts.NOT_INSTALLED)
+        try:
+            found = self.driver.execute_script(Scripts.LOOKUP, *args)
+            if found == Scripts.NOT_INSTALLED:
+                self.driver.execute_script(Scripts.install_helpers())
+                found = self.driver.execute_script(Scripts.LOOKUP, *args)
+        except JavascriptException:
+            # Невалидный селектор или запрет скриптов на странице: поиск через find_elements выдаст штатную ошибку
+            return None
+
+        if not found or found == Scripts.NOT_INSTALLED:
+            raise NoSuchElementException
+
+        return found
+
+    def __wait_appearance(self, by_method: str, value: str, timeout: float | int, wait_element_visibility: bool):
+        """
+        Событийное ожидание появления элемента перед поиском (см. wait_for_dom_state)
+        :return: bool: False - элемент не появился за timeout, True - появился или ожидание недоступно
+        """
+        from WebDriver.WebElement import WebElement  # isort:skip
+
+        state = 'visible' if wait_element_visibility else 'present'
+        root = self.elem if isinstance(self, WebElement) else None
+        appeared = self.wait_for_dom_state(value, state, timeout, by_method=by_method, root=root)
+        if appeared is False:
+            print(f"INFO:\tWebElement с селектором `{value}` не появился за {timeout} сек")
+            return False
+        return True
+
+    @instrumented
+    def wait_for_dom_state(
+        self,
+        value: Optional[str],
+        state: str,
+        timeout: float | int,
+        by_method=By.CSS_SELECTOR,
+        element=None,
+        root=None,
+        beacon: Optional[int] = None,
+    ) -> Optional[bool]:
+        """
+        Событийное ожидание состояния DOM: в страницу устанавливается MutationObserver/readystatechange listener,
+        ответ приходит сразу, как только условие выполнено (execute_async_script), без поллинга с шагом TIMEOUT_STEP
+        :param value: str: селектор элемента (не нужен для state='ready'/'detached')
+        :param state: str: 'ready' | 'present' | 'visible' | 'invisible' | 'detached'
+        :param timeout: максимальное время ожидания
+        :param by_method: str: стратегия поиска (By.CSS_SELECTOR | By.XPATH)
+        :param element: WebElement для state='detached'
+        :param root: selenium WebElement, внутри которого выполняется поиск (по умолчанию весь документ)
+        :param beacon: int: для state='ready' - маяк документа (см. WebDriver.wait_interactive_ready_state)
+        :return: bool: True - состояние достигнуто, False - нет за timeout
+                 None - внедрение скрипта на страницу невозможно (нужен поллинг)
+        """
+        if by_method not in (By.CSS_SELECTOR, By.XPATH):
+            return None
+
+        element = getattr(element, 'elem', element)
+        deadline = monotonic() + timeout
+        installed = False
+        while True:
+            # Длинные ожидания делятся на части, чтобы не упираться в script timeout сессии WebDriver
+            chunk = max(0.0, min(deadline - monotonic(), OBSERVER_CHUNK))
+            try:
+                result = self.driver.execute_async_script(
+                    Scripts.WAIT,
+                    by_method,
+                    value,
+                    state,
+                    element,
+                    int(chunk * 1000),
+                    Scripts.NOT_INSTALLED,
+                    root,
+                    beacon,
+                )
+            except StaleElementReferenceException:
+                return state == 'detached' or None
+            except WebDriverException:
+                return None
+
+            if result == Scripts.NOT_INSTALLED:
+                if installed:
+                    return None
+                self.driver.execute_script(Scripts.install_helpers())
+                installed = True
+                continue
+            if result is True:
+                return True
+            if deadline - monotonic() <= 0:
+                return False
+
+    @instrumented
+    def wait_interactive_ready_state(self, observer=True, beacon: Optional[int] = None) -> bool:
         """
         Ждет пока у страницы document.readyState станет interactive
+        :param observer: bool: ждать событие readystatechange в браузере (поллинг - только если скрипты запрещены)
+        :param beacon: int: маяк, устанавливаемый на страницу при готовности документа
+        :return: bool: True - готовность документа подтверждена
         """
 
         def _interactive_ready_state(driver):
-            sleep(TIMEOUT_STEP)
-            ready_state = driver.execute_script("return document.readyState")
-            return bool(any(["interactive", "complete"]) in ready_state)
+            return driver.execute_script(Scripts.READY_STATE, beacon)
 
         try:
-            WebDriverWait(self.driver, timeout=MAX_TIMEOUT).until(
+            if observer:
+                ready = self.wait_for_dom_state(None, 'ready', MAX_TIMEOUT, beacon=beacon)
+                if ready is not None:
+                    return ready
+
+            return WebDriverWait(self.driver, timeout=MAX_TIMEOUT, poll_frequency=TIMEOUT_STEP).until(
                 _interactive_ready_state,
-                message=f"ERROR:\tСтраница с PageTitle: `{self.driver.title}` "
-                f"не загрузилась за {MAX_TIMEOUT} сек{linesep}",
+                message=f"ERROR:\tСтраница не загрузилась за {MAX_TIMEOUT} сек{linesep}",
             )
 
         except (NoSuchWindowException, UnexpectedAlertPresentException, WebDriverException, TypeError):
-            return
+            return False
 
-    def find_element_by_css_selector(self, value, timeout=MAX_TIMEOUT, wait_element_visibility=True):
-        """find_element_by_css_selector method"""
-        return self.__custom_find_by(By.CSS_SELECTOR, value, timeout, wait_element_visibility)
+    @instrumented
+    def locate(self, by_method: str, value: str, timeout=MAX_TIMEOUT, wait_element_visibility=True):
+        """
+        Поиск первого подходящего элемента по локатору (повторный поиск устаревшего WebElement, см. WebElement.relocate)
+        :param by_method: str: стратегия поиска (By.CSS_SELECTOR | By.XPATH | By.LINK_TEXT)
+        :param value: str: значение локатора
+        :param timeout: максимальное время ожидания появления элемента
+        :param wait_element_visibility: признак видимости элемента
+        :return: WebElement или None
+        """
+        return self.__custom_find_by(by_method, value, timeout, wait_element_visibility)
 
-    def find_elements_by_css_selector(self, value, timeout=MAX_TIMEOUT, wait_element_visibility=True):
+    @instrumented
+    def find_element_by_css_selector(
+        self, value, timeout=MAX_TIMEOUT, wait_element_visibility=True, observer=False, poll_frequency=TIMEOUT_STEP
+    ):
+        """find_element_by_css_selector method (poll_frequency - интервал поллинга, сек)"""
+        return self.__custom_find_by(By.CSS_SELECTOR, value, timeout, wait_element_visibility, observer, poll_frequency)
+
+    @instrumented
+    def find_elements_by_css_selector(self, value, timeout=MAX_TIMEOUT, wait_element_visibility=True, observer=False):
         """find_elements_by_css_selector method"""
-        return self.__custom_finds_by(By.CSS_SELECTOR, value, timeout, wait_element_visibility)
+        return self.__custom_finds_by(By.CSS_SELECTOR, value, timeout, wait_element_visibility, observer)
 
-    def find_element_by_xpath(self, value, timeout=MAX_TIMEOUT, wait_element_visibility=True):
+    @instrumented
+    def find_element_by_xpath(self, value, timeout=MAX_TIMEOUT, wait_element_visibility=True, observer=False):
         """find_element_by_xpath method"""
-        return self.__custom_find_by(By.XPATH, value, timeout, wait_element_visibility)
+        return self.__custom_find_by(By.XPATH, value, timeout, wait_element_visibility, observer)
 
-    def find_elements_by_xpath(self, value, timeout=MAX_TIMEOUT, wait_element_visibility=True):
+    @instrumented
+    def find_elements_by_xpath(self, value, timeout=MAX_TIMEOUT, wait_element_visibility=True, observer=False):
         """find_elements_by_xpath method"""
-        return self.__custom_finds_by(By.XPATH, value, timeout, wait_element_visibility)
+        return self.__custom_finds_by(By.XPATH, value, timeout, wait_element_visibility, observer)
 
+    @instrumented
     def find_element_by_link_text(self, value, timeout=MAX_TIMEOUT, wait_element_visibility=True):
         """
         Метод поиска элемента по текстовой ссылке (href#)
@@ -188,18 +385,86 @@ class WebBase:
         :param wait_element_visibility: признак видимости элемента
         :return: WebElement или None
         """
-        return self.__custom_find_by('find_elements_by_link_text', value, timeout, wait_element_visibility)
+        return self.__custom_find_by(By.LINK_TEXT, value, timeout, wait_element_visibility)
 
-    def wait_for_element_to_disappear(self, selector, timeout=MAX_TIMEOUT):
+    @instrumented
+    def exists_now(self, value: str, wait_element_visibility=True, by_method=By.CSS_SELECTOR):
+        """
+        Проверка наличия элемента без ожидания: один запрос к DOM (Scripts.LOOKUP) вместо поллинга WebDriverWait
+        :param value: str: значение локатора
+        :param wait_element_visibility: bool: учитывать только видимые элементы
+        :param by_method: str: стратегия поиска (By.CSS_SELECTOR | By.XPATH | By.LINK_TEXT)
+        :return: WebElement или None
+        """
+        from WebDriver.WebElement import WebElement  # isort:skip
+
+        driver = self.driver if not isinstance(self, WebElement) else self.elem
+
+        if not isinstance(self, WebElement):
+            self.wait_interactive_ready_state()
+
+        try:
+            found = self.__batched_lookup(by_method, value, wait_element_visibility, single=True)
+            if found is None:
+                elems = driver.find_elements(by_method, value)
+                found = [next((el for el in elems if not wait_element_visibility or el.is_displayed()), None)]
+        except (NoSuchElementException, StaleElementReferenceException):
+            return None
+
+        if found[0] is None:
+            return None
+        return WebElement(found[0], driver, locator=(self, by_method, value, wait_element_visibility))
+
+    @instrumented
+    def absent_within(
+        self, value: str, window: float | int = ABSENCE_WINDOW, wait_element_visibility=True, by_method=By.CSS_SELECTOR
+    ) -> bool:
+        """
+        Проверка отсутствия элемента в течение окна стабильности (элемент не появился за window сек):
+         - событийное ожидание появления в браузере (wait_for_dom_state): одна команда WebDriver на окно
+         - скрипты на странице недоступны: поллинг exists_now с экспоненциальной паузой (poll_until)
+         - window=0: одна проверка exists_now
+        Появившийся элемент дает ответ сразу, без ожидания конца окна
+        :param value: str: значение локатора
+        :param window: float | int: окно стабильности (сек)
+        :param wait_element_visibility: bool: учитывать только видимые элементы
+        :param by_method: str: стратегия поиска (By.CSS_SELECTOR | By.XPATH | By.LINK_TEXT)
+        :return: bool: True - элемент отсутствует, False - элемент есть на странице
+        """
+        from WebDriver.WebElement import WebElement  # isort:skip
+
+        if window <= 0:
+            return not self.exists_now(value, wait_element_visibility, by_method)
+
+        if not isinstance(self, WebElement):
+            self.wait_interactive_ready_state()
+
+        state = 'visible' if wait_element_visibility else 'present'
+        root = self.elem if isinstance(self, WebElement) else None
+        appeared = self.wait_for_dom_state(value, state, window, by_method=by_method, root=root)
+        if appeared is None:
+            appeared, _ = poll_until(lambda: self.exists_now(value, wait_element_visibility, by_method), bool, window)
+        return not appeared
+
+    @instrumented
+    def wait_for_element_to_disappear(self, selector, timeout=MAX_TIMEOUT, observer=False, poll_frequency=TIMEOUT_STEP):
         """
         Ждать, когда элемент с указанным селектором исчезнет
         Ошибки ожидания метод не генерит!
         :param selector: Селектор элемента
         :param timeout: максимальное время ожидания исчезновения элемента
+        :param observer: bool: событийное ожидание в браузере вместо поллинга (см. wait_for_dom_state)
+        :param poll_frequency: float: интервал поллинга (сек)
         :return: bool: True - элемент исчез, False - нет
         """
+        if observer:
+            result = self.wait_for_dom_state(selector, 'invisible', timeout)
+            if result is not None:
+                print(f"WebElement с селектором: `{selector}` не исчез за {timeout} секунд") if not result else None
+                return result
+
         try:
-            WebDriverWait(self.driver, timeout).until(
+            WebDriverWait(self.driver, timeout, poll_frequency).until(
                 ec.invisibility_of_element_located((By.CSS_SELECTOR, selector)),
                 message=f"WebElement с селектором: `{selector}` не исчез за {timeout} секунд",
             )
@@ -208,8 +473,16 @@ class WebBase:
             return False
         return True
 
+    @instrumented
     def find_element_in_table_by_text(
-        self, table_items, text, match_case=False, match_words=False, timeout=MAX_TIMEOUT, check_elements=True
+        self,
+        table_items,
+        text,
+        match_case=False,
+        match_words=False,
+        timeout=MAX_TIMEOUT,
+        check_elements=True,
+        index=False,
     ):
         """
         Ищет указанный текст во всех элементах таблицы и возвращает первый элемент в котором был найден текст
@@ -219,15 +492,21 @@ class WebBase:
         :param match_words: учитывать полное совпадение по словам
         :param int timeout: сколько секунд нужно ждать появления таблицы
         :param check_elements: нужна ли проверка найденных элементов таблицы по селектору
+        :param index: кэшировать тексты строк на странице для повторных поисков по неизменной таблице
         :return: WebElement или None
         """
+        if IN_BROWSER_TABLE_SEARCH:
+            found = self.__table_search(table_items, text, match_case, match_words, timeout, check_elements, index)
+            if found is not NotImplemented:
+                return found
+
         elements = self.find_elements_by_css_selector(table_items, timeout)
         if check_elements:
             assert elements, f"Не найдены элементы таблицы по селектору `{table_items}`"
 
+        text = text if match_case else text.lower()
         for el in elements:
             el_text = el.text if match_case else el.text.lower()
-            text = text if match_case else text.lower()
             if match_words and text == el_text:
                 return el
             if not match_words and text in el_text:
@@ -235,6 +514,33 @@ class WebBase:
 
         return None
 
+    def __table_search(self, table_items, text, match_case, match_words, timeout, check_elements, index):
+        """
+        Поиск строки таблицы по тексту в браузере одной командой (Scripts.TABLE_SEARCH)
+        :return: WebElement | None | NotImplemented (скрипты на странице недоступны: нужен поиск по строкам)
+        """
+        from WebDriver.WebElement import WebElement  # isort:skip
+
+        first = self.find_element_by_css_selector(table_items, timeout)
+        if check_elements:
+            assert first, f"Не найдены элементы таблицы по селектору `{table_items}`"
+        if not first:
+            return None
+
+        root = self.elem if isinstance(self, WebElement) else None
+        args = (table_items, str(text), match_case, match_words, root, index, Scripts.NOT_INSTALLED)
+        try:
+            found = self.driver.execute_script(Scripts.TABLE_SEARCH, *args)
+            if found == Scripts.NOT_INSTALLED:
+                self.driver.execute_script(Scripts.install_helpers())
+                found = self.driver.execute_script(Scripts.TABLE_SEARCH, *args)
+        except JavascriptException:
+            return NotImplemented
+
+        if found == Scripts.NOT_INSTALLED:
+            return NotImplemented
+        return WebElement(found, self.driver) if found else None
+
     def move_to_element(self, element=None):
         """
         Навести курсор на указанный элемент. Если элемент не указан, то попытается навести на тот элемент у которого
@@ -1,17 +1,66 @@
+import json
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from time import perf_counter
 from typing import Optional
 from uuid import uuid4
 
 from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.webdriver.firefox.service import Service as FirefoxService
+from selenium.webdriver.remote.command import Command
 
 from Config import Config
+from Utils import remove_local_dir
+from WebDriver import Scripts
+from WebDriver.DomSnapshot import DomSnapshot
+from WebDriver.Instrumentation import RECORDER
+from WebDriver.Profiles import profile_snapshot
+from WebDriver.RemoteTransport import remote_connection
 from WebDriver.WebBase import WebBase
 
+NAVIGATION_COMMANDS = frozenset(
+    {
+        Command.GET,
+        Command.GO_BACK,
+        Command.GO_FORWARD,
+        Command.REFRESH,
+        Command.SWITCH_TO_WINDOW,
+        Command.SWITCH_TO_FRAME,
+        Command.SWITCH_TO_PARENT_FRAME,
+        Command.NEW_WINDOW,
+        Command.CLOSE,
+    }
+)
+"""Команды, после которых документ гарантированно сменился"""
+
+INTERACTION_COMMANDS = frozenset(
+    {
+        Command.CLICK_ELEMENT,
+        Command.SEND_KEYS_TO_ELEMENT,
+        Command.W3C_ACTIONS,
+        Command.W3C_ACCEPT_ALERT,
+        Command.W3C_DISMISS_ALERT,
+        Command.W3C_EXECUTE_SCRIPT,
+        Command.W3C_EXECUTE_SCRIPT_ASYNC,
+    }
+)
+"""Команды, которые могут вызвать unload документа (клик по ссылке, submit формы, location.href = ...)"""
+
+
+def logs_path() -> os.path:
+    """
+    Function to provide path for project Logs directory (created if missing)
+    :return: path: Logs directory
+    """
+    base_logs_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Logs")
+    os.mkdir(base_logs_path) if not os.path.exists(base_logs_path) else None
+    return base_logs_path
+
 
 def log_file_path(log_path: Optional[str]) -> os.path:
     """
@@ -22,9 +71,7 @@ def log_file_path(log_path: Optional[str]) -> os.path:
     log_name = datetime.now().strftime('%Y-%m-%d_T_%H_%M_%S') + ".log"
 
     if not log_path:
-        base_logs_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Logs")
-        os.mkdir(base_logs_path) if not os.path.exists(base_logs_path) else None
-        log_path = os.path.join(base_logs_path, log_name)
+        log_path = os.path.join(logs_path(), log_name)
     else:
         log_path = os.path.join(log_path, log_name)
 
@@ -34,26 +81,125 @@ def log_file_path(log_path: Optional[str]) -> os.path:
 class WebDriver(WebBase):
     """Класс инициализирующий WebDriver с требуемыми параметрами"""
 
-    def __init__(self, config: Config, name: str = None):
-        """:type name: selenium.webdriver.WebDriver"""
+    def __init__(self, config: Config, name: str = None, session: Optional[webdriver.Remote] = None):
+        """
+        :type name: selenium.webdriver.WebDriver
+        :param session: уже запущенная сессия браузера (из пула сессий) - новая сессия не создается
+        """
         super().__init__()
         self.config = config
         self.name = config.browser.selenoid.executor_id.format(name) if config.browser.selenoid.executor_id else None
-        self.driver = (
+        self.epoch = 0
+        """Счетчик навигаций: увеличивается при каждой смене документа в окне браузера"""
+        self.generation = 0
+        """Счетчик действий: растет при навигации и каждой команде, способной изменить DOM (click, ввод, скрипт)"""
+        self.__ready_epoch = None
+        self.__unload_suspected = False
+        self.__profile_path = None
+        self.startup_metrics = {}
+        """Время холодного старта (сек): service_spawn, session_create, first_get"""
+        self.snapshot = DomSnapshot(self)
+        """Кэш снимка DOM текущей страницы для проверок наличия текста без повторного чтения page_source"""
+        started = perf_counter()
+        self.driver = session or (
             self.__local_driver_init()
             if not self.config.browser.selenoid.use_selenoid
             else self.__remote_driver_init(name)
         )
+        if not session:
+            self.startup_metrics['session_create'] = (
+                perf_counter() - started - self.startup_metrics.get('service_spawn', 0.0)
+            )
+        self.__install_command_hook()
 
     def __getattr__(self, item):
         return getattr(self.driver, item)
 
+    def __install_command_hook(self) -> None:
+        """
+        Перехват всех исходящих команд WebDriver (в т.ч. команд WebElement: они идут через execute родителя)
+        """
+        execute = self.driver.execute
+
+        def _execute(driver_command: str, params: dict = None) -> dict:
+            self.__track_navigation(driver_command, params)
+            RECORDER.count_command(driver_command, params) if RECORDER.budgets else None
+            if not RECORDER.enabled:
+                return execute(driver_command, params)
+
+            started = perf_counter()
+            try:
+                return execute(driver_command, params)
+            finally:
+                RECORDER.record_command(driver_command, params, perf_counter() - started)
+
+        self.driver.execute = _execute
+
+    def __track_navigation(self, driver_command: str, params: Optional[dict]) -> None:
+        """
+        Учет навигации по исходящей команде: смена документа -> новая эпоха, возможный unload -> проверка маяка,
+        любое действие, способное изменить DOM -> новое поколение (сброс кэша элементов страниц BaseMethods)
+        """
+        if driver_command in NAVIGATION_COMMANDS:
+            self.epoch += 1
+            self.generation += 1
+        elif driver_command in INTERACTION_COMMANDS:
+            script = (params or {}).get('script', '')
+            if not script.startswith(Scripts.OWN_SCRIPT_PREFIX):
+                self.__unload_suspected = True
+                self.generation += 1
+            elif script.startswith(Scripts.MUTATING_SCRIPTS):
+                self.generation += 1
+        elif driver_command == Command.CLEAR_ELEMENT:
+            self.generation += 1
+
+    def wait_interactive_ready_state(self, observer=True, beacon: Optional[int] = None) -> bool:
+        """
+        Ждет пока у страницы document.readyState станет interactive - только если документ сменился
+        с момента предыдущей проверки:
+         - эпоха не менялась и не было действий, способных вызвать unload: проверка не нужна
+         - было действие (click, send_keys, скрипт): маяк `window.__pageObjectEpoch` на странице
+           за одну команду подтверждает, что документ прежний
+        """
+        if self.__ready_epoch == self.epoch and self.__unload_suspected:
+            self.__unload_suspected = False
+            try:
+                if self.driver.execute_script(Scripts.BEACON_PROBE, self.epoch):
+                    return True
+            except WebDriverException:
+                pass
+            self.epoch += 1
+
+        if self.__ready_epoch == self.epoch:
+            return True
+
+        epoch = self.epoch
+        ready = super().wait_interactive_ready_state(observer, beacon=epoch if beacon is None else beacon)
+        self.__ready_epoch = epoch if ready else None
+        return ready
+
+    def __timed_service(self, service: ChromeService | FirefoxService) -> ChromeService | FirefoxService:
+        """
+        Замер времени запуска процесса драйвера (chromedriver/geckodriver) в startup_metrics['service_spawn']
+        """
+        start = service.start
+
+        def _start() -> None:
+            started = perf_counter()
+            start()
+            self.startup_metrics['service_spawn'] = perf_counter() - started
+
+        service.start = _start
+        return service
+
     def __local_driver_init(self) -> webdriver.Chrome | webdriver.Firefox:
         """
         Создает локальный экземпляр WebDriver для управления браузером
         """
         config = self.config.browser
         browser = config.browser_name
+        profile_cache = config.get('startup', {}).get('profile_cache')
+        self.__profile_path = profile_snapshot(browser) if profile_cache and browser in ('firefox', 'chrome') else None
 
         if browser == 'firefox':
             path = config.firefox.driver_path or 'geckodriver'
@@ -64,13 +210,17 @@ class WebDriver(WebBase):
             if config.headless:
                 options.add_argument("--headless")
 
-            profile = webdriver.FirefoxProfile()
-            profile.accept_untrusted_certs = True
-            profile.set_preference("app.update.auto", False)
-            profile.set_preference("app.update.enabled", False)
-            profile.update_preferences()
+            if self.__profile_path:
+                options.add_argument("-profile")
+                options.add_argument(self.__profile_path)
+            else:
+                profile = webdriver.FirefoxProfile()
+                profile.accept_untrusted_certs = True
+                profile.set_preference("app.update.auto", False)
+                profile.set_preference("app.update.enabled", False)
+                profile.update_preferences()
 
-            service = FirefoxService(executable_path=path, log_output=log_path)
+            service = self.__timed_service(FirefoxService(executable_path=path, log_output=log_path))
             driver = webdriver.Firefox(service=service, options=options)
 
         elif browser == 'chrome':
@@ -81,8 +231,10 @@ class WebDriver(WebBase):
                 options.binary_location = config.chrome.binary_path
             if config.headless:
                 options.add_argument("--headless=new")
+            if self.__profile_path:
+                options.add_argument(f"--user-data-dir={self.__profile_path}")
 
-            service = ChromeService(executable_path=path, log_output=log_path)
+            service = self.__timed_service(ChromeService(executable_path=path, log_output=log_path))
             driver = webdriver.Chrome(service=service, options=options)
 
         else:
@@ -98,39 +250,141 @@ class WebDriver(WebBase):
     def __remote_driver_init(self, name) -> webdriver.Remote:
         """
         Создает удаленный экземпляр webdriver (в selenoid) для управления браузером
+        - команды идут через общий пул keep-alive соединений к хосту selenoid (см. RemoteTransport)
         """
         config = self.config.browser
+        selenoid = config.selenoid
         if config.browser_name == 'firefox':
-            options = webdriver.FirefoxOptions()
-            options.headless = config.headless
-            capabilities = options.to_capabilities()
-            capabilities['sessionTimeout'] = "5m"
-            name = (
-                f"Браузер зарезервирован {config.selenoid.executor_id} для теста: "
-                f"{name if name else config.selenoid.executor_id + ' ' + str(uuid4())}"
-            )
-            capabilities['name'] = name
-            capabilities['pageLoadStrategy'] = "eager"
-            capabilities['acceptSslCerts'] = True
-            capabilities['enableVNC'] = True
-            capabilities['version'] = "72.0"
-            desired_capabilities = capabilities
-            driver = webdriver.Remote(command_executor=config.selenoid_url)
-
-            if config.window.maximize:
-                driver.maximize_window()
-            else:
-                driver.set_window_size(config.window.size.width, config.window.size.height)
-            return driver
+            options = FirefoxOptions()
+            options.add_argument("-headless") if config.headless else None
+        elif config.browser_name == 'chrome':
+            options = ChromeOptions()
+            options.add_argument("--headless=new") if config.headless else None
+        else:
+            raise NotImplementedError("Браузер не поддерживается")
+
+        name = (
+            f"Браузер зарезервирован {selenoid.executor_id} для теста: "
+            f"{name if name else f'{selenoid.executor_id} {uuid4()}'}"
+        )
+        options.page_load_strategy = 'eager'
+        options.accept_insecure_certs = True
+        if selenoid.get('browser_version'):
+            options.browser_version = selenoid.browser_version
+        options.set_capability(
+            'selenoid:options',
+            {
+                'name': name,
+                'sessionTimeout': selenoid.get('session_timeout') or "5m",
+                'enableVNC': bool(selenoid.get('enable_vnc', True)),
+            },
+        )
+        driver = webdriver.Remote(command_executor=remote_connection(self.config), options=options)
 
-        raise NotImplementedError("Браузер не поддерживается")
+        if config.window.maximize:
+            driver.maximize_window()
+        else:
+            driver.set_window_size(config.window.size.width, config.window.size.height)
+        return driver
 
     def open_page(self, url):
         """
         Метод для проверки загрузки страницы полностью
         """
+        started = perf_counter()
         try:
             self.driver.get(url)
             self.wait_interactive_ready_state()
         except Exception as e:
             raise TimeoutError(f"Страница {url} не загрузилась!") from e
+
+        if self.startup_metrics and 'first_get' not in self.startup_metrics:
+            self.startup_metrics['first_get'] = perf_counter() - started
+            self.__write_startup_metrics()
+
+    def reset_state(self) -> None:
+        """
+        Метод сброса состояния браузера без перезапуска: cookies, localStorage/sessionStorage, открытая страница
+        """
+        self.driver.delete_all_cookies()
+        self.driver.execute_script(Scripts.RESET_STORAGE)
+        self.driver.get('about:blank')
+
+    def quit(self) -> None:
+        """
+        Метод закрытия сессии браузера и удаления копии профиля сессии
+        """
+        try:
+            self.driver.quit()
+        finally:
+            remove_local_dir(self.__profile_path) if self.__profile_path else None
+
+    def __write_startup_metrics(self) -> None:
+        """
+        Метод дописывает метрики холодного старта сессии в JSON Lines файл (browser.startup.metrics_path)
+        """
+        metrics_path = self.config.browser.get('startup', {}).get('metrics_path') or os.path.join(
+            logs_path(), 'startup_metrics.jsonl'
+        )
+        record = {
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'browser': self.config.browser.browser_name,
+            'profile_cache': bool(self.__profile_path),
+            **{key: round(value, 3) for key, value in self.startup_metrics.items()},
+        }
+        with open(metrics_path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(record) + os.linesep)
+
+
+class DriverLauncher:
+    """
+    Класс запуска WebDriver в фоновом потоке
+    - браузер стартует, пока фикстуры загружают Config и Locale
+    - после закрытия сессии следующая запускается заранее, до того как ее запросит следующий тестовый класс
+    """
+
+    __executor: Optional[ThreadPoolExecutor] = None
+
+    def __init__(self, config: Config) -> None:
+        self.config = config
+        self.__pending: Optional[Future] = None
+
+    def prestart(self) -> None:
+        """
+        Метод запуска новой сессии в фоне (если еще не запущена)
+        """
+        if self.__pending is None:
+            if DriverLauncher.__executor is None:
+                DriverLauncher.__executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='DriverLauncher')
+            self.__pending = DriverLauncher.__executor.submit(WebDriver, self.config)
+
+    def acquire(self) -> WebDriver:
+        """
+        Метод получения запущенной сессии (ожидает завершения фонового запуска)
+        :return: WebDriver
+        """
+        self.prestart()
+        pending, self.__pending = self.__pending, None
+        return pending.result()
+
+    def close(self) -> None:
+        """
+        Метод закрытия сессии, запущенной заранее, но так и не востребованной (без ожидания холодного старта):
+         - запуск, который еще не начался, отменяется
+         - начавшийся запуск закрывается в фоне, как только завершится
+        """
+        pending, self.__pending = self.__pending, None
+        if pending is not None and not pending.cancel():
+            pending.add_done_callback(DriverLauncher.__quit)
+
+    @staticmethod
+    def __quit(pending: Future) -> None:
+        """
+        Закрыть сессию завершившегося фонового запуска (ошибка запуска, в т.ч. конфигурации, здесь уже не важна)
+        """
+        if pending.cancelled() or pending.exception() is not None:
+            return
+        try:
+            pending.result().quit()
+        except (OSError, WebDriverException):
+            pass
@@ -1,81 +1,239 @@
 import random
-from time import sleep
+from time import perf_counter
+from typing import Any, Callable, Optional
 
+from selenium.common.exceptions import JavascriptException, StaleElementReferenceException
+from selenium.webdriver import ActionChains
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.remote.webelement import WebElement as SeleniumWebElement
 
-from WebDriver.WebBase import WebBase
+from WebDriver import Scripts
+from WebDriver.Instrumentation import RECORDER
+from WebDriver.WebBase import MAX_TIMEOUT, WebBase, poll_until
+
+FAST_FILL = False
+"""
+Блочный ввод текста одной командой WebDriver по умолчанию: значение и события input/keyup/change устанавливаются
+скриптом (keydown/keypress не генерируются - обработчики нажатий клавиш не проверяются), включается явно: бенчмарки,
+вызовы с fast=True
+"""
+
+RELOCATE_ATTEMPTS = 2
+"""Число повторных поисков устаревшего (stale) элемента по его локатору перед тем, как отдать ошибку"""
+RELOCATE_TIMEOUT = 1
+"""Время ожидания элемента при повторном поиске (сек): перерисованный элемент появляется в DOM сразу"""
+
+STALE = object()
+"""Маркер: элемент удален из DOM во время ожидания условия"""
+
+CONDITIONS: dict[str, tuple[Callable[['WebElement', Optional[str]], Any], Callable[[Any, Any], bool]]] = {
+    'value': (
+        lambda element, _: element.elem.get_attribute('value'),
+        lambda actual, expected: str(actual) == str(expected),
+    ),
+    'text': (lambda element, _: element.elem.text, lambda actual, expected: str(actual) == str(expected)),
+    'attribute': (
+        lambda element, attribute: element.elem.get_attribute(attribute),
+        lambda actual, expected: str(actual) == str(expected),
+    ),
+    'class': (
+        lambda element, _: (element.elem.get_attribute('class') or '').split(),
+        lambda actual, expected: expected in actual,
+    ),
+    'enabled': (lambda element, _: element.is_disabled(), lambda actual, _: not actual),
+    'disabled': (lambda element, _: element.is_disabled(), lambda actual, _: actual),
+}
+"""Условия wait_for_condition: (получение фактического значения, сравнение с ожидаемым)"""
+
+
+def fast_fill(fast: Optional[bool] = None) -> bool:
+    """
+    Функция выбора режима ввода текста
+    :param fast: bool | None: явный режим (None - по умолчанию FAST_FILL на момент вызова)
+    :return: bool: True - блочный ввод скриптом, False - ввод с клавиатуры (send_keys)
+    """
+    return FAST_FILL if fast is None else fast
 
 
 class WebElement(WebBase):
-    """Класс методов взаимодействия с WebElement"""
+    """
+    Класс методов взаимодействия с WebElement
+    - элемент, найденный по локатору, хранит его: при StaleElementReferenceException (DOM перерисован)
+      элемент прозрачно ищется заново и действие повторяется (не более RELOCATE_ATTEMPTS раз)
+    """
 
-    def __init__(self, element: SeleniumWebElement, driver):
+    def __init__(self, element: SeleniumWebElement, driver, locator: Optional[tuple] = None):
+        """
+        :param locator: tuple: (owner: WebBase, by_method, value, wait_element_visibility) - где и как элемент найден
+        """
         super().__init__()
         self.elem = element
         self.driver = driver
         """:type WebDriver.WebDriver.WebDriver"""
+        self.locator = locator
 
     def __getattr__(self, item):
-        return getattr(self.elem, item)
+        value = self.retry(lambda elem: getattr(elem, item))
+        if not callable(value) or self.locator is None:
+            return value
+
+        def _call(*args, **kwargs):
+            return self.retry(lambda elem: getattr(elem, item)(*args, **kwargs))
+
+        return _call
+
+    def relocate(self) -> bool:
+        """
+        Повторный поиск элемента по локатору (у того же владельца: WebDriver или родительского WebElement)
+        :return: bool: True - элемент найден заново, False - локатор неизвестен или элемент не найден
+        """
+        if self.locator is None:
+            return False
+        owner, by_method, value, wait_element_visibility = self.locator
+        args = (by_method, value, RELOCATE_TIMEOUT, wait_element_visibility)
+        if isinstance(owner, WebElement):
+            found = owner.retry(lambda _: owner.locate(*args))
+        else:
+            found = owner.locate(*args)
+        if found is None:
+            return False
+        self.elem = found.elem
+        return True
+
+    def retry(self, action: Callable[[SeleniumWebElement], Any]) -> Any:
+        """
+        Выполнить действие над элементом, при StaleElementReferenceException - найти элемент заново и повторить
+        :param action: callable: действие над selenium WebElement
+        :return: результат действия
+        """
+        for attempt in range(RELOCATE_ATTEMPTS + 1):
+            try:
+                return action(self.elem)
+            except StaleElementReferenceException:
+                if attempt == RELOCATE_ATTEMPTS or not self.relocate():
+                    raise
+        return None
 
-    def fill(self, text, clear=True, typing_speed_delay=None, min_delay=0.05, max_delay=0.25):
+    def fill(self, text, clear=True, typing_speed_delay=None, min_delay=0.05, max_delay=0.25, fast=None):
         """
         Ввести в текстовое поле значение
+        :param text: str: текст для ввода
+        :param clear: bool: очистить поле перед вводом
+        :param typing_speed_delay: None | int | float | str | bool
+            - None/False: ввод текста блоком
+            - int/float: посимвольный ввод (эмуляция набора) с фиксированной задержкой в секундах
+            - str/True: посимвольный ввод с переменной задержкой от min_delay до max_delay
+        :param fast: bool: блочный ввод одной командой (Scripts.FILL) вместо click + clear + send_keys
+            (None - по умолчанию FAST_FILL)
         """
+        fast = fast_fill(fast)
+        return self.retry(lambda _: self.__fill(text, clear, typing_speed_delay, min_delay, max_delay, fast))
+
+    def __fill(self, text, clear: bool, typing_speed_delay, min_delay: float, max_delay: float, fast: bool):
+        """
+        Ввод текста в текущий selenium WebElement (см. fill)
+        """
+        if typing_speed_delay:
+            return self.__type(str(text), clear, typing_speed_delay, min_delay, max_delay)
+
+        if fast:
+            try:
+                if self.driver.execute_script(Scripts.FILL, self.elem, str(text), clear):
+                    return self
+            except JavascriptException:
+                pass
+
         self.elem.click()
 
         if clear:
             self.elem.clear()
             self.clear()
 
-        if typing_speed_delay:
-            for character in list(text):
-                sleep(typing_speed_delay) if isinstance(typing_speed_delay, int) else sleep(
-                    random.uniform(min_delay, max_delay)
-                )
-                self.elem.send_keys(character)
-            return self
-
         self.elem.send_keys(text)
 
         return self
 
+    def __type(self, text: str, clear: bool, typing_speed_delay, min_delay: float, max_delay: float):
+        """
+        Эмуляция набора текста человеком: клик, очистка и посимвольный ввод с паузами - одной командой Actions
+        """
+        fixed = isinstance(typing_speed_delay, (int, float)) and not isinstance(typing_speed_delay, bool)
+        actions = ActionChains(self.driver).click(self.elem)
+        if clear:
+            actions.key_down(Keys.CONTROL).send_keys('a').key_up(Keys.CONTROL).send_keys(Keys.DELETE)
+        for character in text:
+            actions.pause(typing_speed_delay if fixed else random.uniform(min_delay, max_delay))
+            actions.send_keys(character)
+        actions.perform()
+        return self
+
     def clear(self):
         """
         Принудительно очистить поле
         """
-        self.elem.send_keys(Keys.CONTROL + "a")
-        self.elem.send_keys(Keys.DELETE)
 
-    def verify_text(self, text):
+        def _clear(elem: SeleniumWebElement) -> None:
+            elem.send_keys(Keys.CONTROL + "a")
+            elem.send_keys(Keys.DELETE)
+
+        self.retry(_clear)
+
+    def verify_text(self, text, timeout=0):
         """
         Сравнить текст указанного элемента с ожидаемым
+        :param timeout: int | float: время ожидания совпадения (сек), 0 - однократная проверка
         """
-        element = self.elem
-        assert element, "Не найден ожидаемый элемент."
-        text = str(text)
-        real_text = str(element.text)
-        assert text == real_text, (
-            f"Текст элемента не соответствует ожидаемому. Ожидаемый текст: {text} Имеющийся " f"текст: {real_text}"
-        )
-        return self
+        assert self.elem, "Не найден ожидаемый элемент."
+        return self.verify_condition('text', text, timeout=timeout)
 
     def verify_value(self, value, timeout=5):
         """
-        Сравнить value указанного элемента с ожидаемым
-        """
-        element = self.elem
-        assert element, "Не найден ожидаемый элемент."
-        value = str(value)
-        real_value = None
-        for _ in range(timeout):
-            sleep(1)
-            real_value = str(element.get_attribute('value'))
-        if value == real_value:
-            return self
-        assert value == real_value, (
-            f"value элемента не соответствует ожидаемому. " f"Ожидаемый value: {value} Имеющийся value: {real_value}"
+        Сравнить value указанного элемента с ожидаемым (ожидание совпадения до timeout сек)
+        """
+        assert self.elem, "Не найден ожидаемый элемент."
+        return self.verify_condition('value', value, timeout=timeout)
+
+    def wait_for_condition(self, condition: str, expected=None, attribute: Optional[str] = None, timeout=MAX_TIMEOUT):
+        """
+        Ожидание условия над элементом: проверка сразу, далее поллинг с нарастающей паузой (см. poll_until)
+        :param condition: str: 'value' | 'text' | 'attribute' | 'class' | 'enabled' | 'disabled'
+        :param expected: ожидаемое значение ('value', 'text', 'attribute') или имя класса ('class')
+        :param attribute: str: имя атрибута для condition='attribute'
+        :param timeout: int | float: время ожидания (сек)
+        :return: tuple: (условие выполнено, фактическое значение)
+        """
+        if condition not in CONDITIONS:
+            raise NameError(f"Условие `{condition}` не поддерживается: {list(CONDITIONS)}")
+        probe, predicate = CONDITIONS[condition]
+
+        def _probe():
+            try:
+                return self.retry(lambda _: probe(self, attribute))
+            except StaleElementReferenceException:
+                return STALE
+
+        def _predicate(actual) -> bool:
+            return actual is STALE or predicate(actual, expected)
+
+        started = perf_counter()
+        satisfied, actual = poll_until(_probe, _predicate, timeout)
+        satisfied = satisfied and actual is not STALE
+        if RECORDER.enabled:
+            RECORDER.record('assert', f"WebElement.{condition}", perf_counter() - started, outcome=satisfied)
+        return satisfied, actual
+
+    def verify_condition(self, condition: str, expected=None, attribute: Optional[str] = None, timeout=MAX_TIMEOUT):
+        """
+        Проверка условия над элементом с ожиданием (см. wait_for_condition)
+        :return: self или AssertionError
+        """
+        __tracebackhide__ = True  # pylint: disable=unused-variable
+        satisfied, actual = self.wait_for_condition(condition, expected, attribute=attribute, timeout=timeout)
+        subject = f"{condition} `{attribute}`" if attribute else condition
+        actual = 'элемент удален из DOM' if actual is STALE else actual
+        assert satisfied, (
+            f"{subject} элемента не соответствует ожидаемому за {timeout} сек. "
+            f"Ожидаемый {subject}: {expected} Имеющийся {subject}: {actual}"
         )
         return self
 
@@ -86,4 +244,6 @@ class WebElement(WebBase):
          - атрибут элемента `class` на наличие класса с текстом 'disabled'
         :return: bool
         """
-        return bool(any([self.elem.get_attribute('disabled'), 'disabled' in self.elem.get_attribute('class')]))
+        return self.retry(
+            lambda elem: bool(any([elem.get_attribute('disabled'), 'disabled' in elem.get_attribute('class')]))
+        )
@@ -1,36 +1,137 @@
-from typing import Callable
+import os
+from typing import Callable, Optional
 
 import pytest
 
 from Config import Config
 from Locales import Locale
 from PageObject import PageObject
-from WebDriver.WebDriver import WebDriver
+from PageObject.SessionState import SessionState
+from WebDriver.Instrumentation import RECORDER, RoundTripBudget
+from WebDriver.SessionPool import SessionPool
+from WebDriver.WaitHistory import WAIT_HISTORY
+from WebDriver.WebDriver import DriverLauncher, WebDriver, logs_path
+
+LAUNCHER: Optional[DriverLauncher] = None
+"""Фоновый запуск WebDriver (config: browser.startup.prestart), стартует в pytest_sessionstart"""
+NEXT_ITEM: Optional[pytest.Item] = None
+"""Тест, который будет выполнен после текущего (None - текущий тест последний)"""
+
+
+def driver_needed(item: Optional[pytest.Item]) -> bool:
+    """
+    Функция проверки, что тесту нужна сессия браузера (фикстура driver)
+    :param item: pytest.Item | None
+    :return: bool
+    """
+    return item is not None and 'driver' in getattr(item, 'fixturenames', ())
+
+
+def pytest_sessionstart(session: pytest.Session) -> None:  # pylint: disable=unused-argument
+    """
+    Хук начала сессии pytest: запуск браузера в фоне, пока идет сбор тестов и загрузка фикстур
+    """
+    global LAUNCHER  # pylint: disable=global-statement
+    config = Config()
+    RECORDER.enabled = bool(config.get('instrumentation', {}).get('enabled'))
+    waits = config.get('waits', {})
+    if waits.get('record') or waits.get('adaptive'):
+        WAIT_HISTORY.configure(
+            bool(waits.get('record')),
+            bool(waits.get('adaptive')),
+            waits.get('history_path') or os.path.join(logs_path(), 'wait_history.json'),
+        )
+    if config.browser.get('startup', {}).get('prestart') and not config.browser.get('session_pool', {}).get('enabled'):
+        LAUNCHER = DriverLauncher(config)
+        LAUNCHER.prestart()
+
+
+def pytest_collection_finish(session: pytest.Session) -> None:
+    """
+    Хук завершения сбора тестов: браузер, запущенный заранее, закрывается, если ни одному тесту он не нужен
+    """
+    if LAUNCHER and not any(driver_needed(item) for item in session.items):
+        LAUNCHER.close()
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:  # pylint: disable=unused-argument
+    """
+    Хук завершения сессии pytest:
+        - закрытие заранее запущенного и не востребованного браузера
+        - запись гистограмм длительности команд WebDriver по тестам (config: instrumentation)
+        - дописывание истории длительности ожиданий и список медленных нестабильных селекторов (config: waits)
+    """
+    LAUNCHER.close() if LAUNCHER else None
+    if WAIT_HISTORY.enabled:
+        WAIT_HISTORY.save()
+        for flaky in WAIT_HISTORY.flaky():
+            print(f"{os.linesep}WARNING:\tНестабильное ожидание {flaky}")
+    if RECORDER.enabled:
+        report_path = Config().get('instrumentation', {}).get('report_path')
+        RECORDER.dump(report_path or os.path.join(logs_path(), 'instrumentation_report.json'))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item: pytest.Item, nextitem: Optional[pytest.Item]):
+    """
+    Хук выполнения теста: команды WebDriver (включая setup/teardown фикстур) записываются на nodeid теста
+    """
+    global NEXT_ITEM  # pylint: disable=global-statement
+    NEXT_ITEM = nextitem
+    RECORDER.test = item.nodeid
+    yield
+    RECORDER.test = '<session>'
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item: pytest.Item):
+    """
+    Хук вызова теста: бюджет команд WebDriver по маркеру `@pytest.mark.max_roundtrips(n)` (без setup/teardown фикстур)
+        - при превышении тест падает с разбивкой команд по именам
+        - разбивка команд пишется в user_properties теста (попадает в junitxml отчет)
+    """
+    marker = item.get_closest_marker('max_roundtrips')
+    if marker is None:
+        yield
+        return
+
+    with RoundTripBudget(marker.args[0], name=item.nodeid, check=False) as budget:
+        outcome = yield
+    item.user_properties.append(('webdriver_commands', dict(budget.commands)))
+    if outcome.excinfo is None and budget.exceeded:
+        outcome.force_exception(AssertionError(budget.report()))
 
 
 @pytest.fixture(scope='function', name='test_data')
-def preconditions_teardown(config, driver, locale, page_object) -> Callable:
+def preconditions_teardown(config, driver, locale, page_object, session_state) -> Callable:
     """
     Фикстура выполняет следующие действия для подготовки и очищения тестового окружения:
     preconditions:
         - Осуществляет `ВХОД` в SAYMON UI как администратор
+          (или восстанавливает сохраненную авторизованную сессию, config: saymon.session_cache)
         - Изменяет язык интерфейса на требуемый в тесте
         - Обновляет пароль (при первом входе)
         - Валидирует переход в основной интерфейс SAYMON UI
     teardown:
-        - Валидирует `ВЫХОД` из SAYMON UI
+        - Валидирует `ВЫХОД` из SAYMON UI (или сбрасывает состояние браузера, сохраняя сессию на сервере)
     """
 
     def _preconditions_teardown(language) -> None:
         locale(language).update_locale(language)
+        if session_state and session_state.restore(config.saymon_admin_user, language):
+            return
         driver.open_page(config.browser.base_url)
         login = page_object.login_screen
         login.set_ui_language(language)
         login.login(config.saymon_admin_user)
+        session_state.capture(config.saymon_admin_user, language) if session_state else None
 
     yield _preconditions_teardown
 
-    page_object.main_menu_toolbar.logout()
+    if session_state:
+        driver.reset_state()
+    else:
+        page_object.main_menu_toolbar.logout()
 
 
 @pytest.fixture(scope='session')
@@ -56,14 +157,51 @@ def locale() -> Callable[[property | str], Locale]:
     return _locale
 
 
+@pytest.fixture(scope='session')
+def session_pool(config: Config) -> Optional[SessionPool]:
+    """
+    Фикстура пула прогретых сессий браузера (config: browser.session_pool.enabled)
+    :return: SessionPool | None: пул выключен
+    """
+    if not config.browser.get('session_pool', {}).get('enabled'):
+        yield None
+        return
+
+    pool = SessionPool(config)
+    pool.warm_up()
+
+    yield pool
+
+    pool.close()
+
+
 @pytest.fixture(scope='class')
-def driver(config: Config) -> WebDriver:
-    """Фикстура инициализации и закрытия WebDriver"""
-    webdriver = WebDriver(config)
+def driver(config: Config, session_pool: Optional[SessionPool]) -> WebDriver:
+    """Фикстура инициализации и закрытия WebDriver (или аренды и возврата сессии из пула)"""
+    if session_pool:
+        webdriver = session_pool.lease()
+
+        yield webdriver
+
+        session_pool.release(webdriver)
+        return
+
+    webdriver = LAUNCHER.acquire() if LAUNCHER else WebDriver(config)
 
     yield webdriver
 
     webdriver.quit()
+    # Следующая сессия запускается заранее, только если следующему тесту понадобится новый браузер
+    LAUNCHER.prestart() if LAUNCHER and driver_needed(NEXT_ITEM) else None
+
+
+@pytest.fixture(scope='class')
+def session_state(config: Config, driver: WebDriver) -> Optional[SessionState]:
+    """
+    Фикстура кэша авторизованного состояния браузера (config: saymon.session_cache)
+    :return: SessionState | None: кэш выключен
+    """
+    return SessionState(driver, config.browser.base_url) if config.saymon.get('session_cache') else None
 
 
 @pytest.fixture(scope='class')
@@ -0,0 +1,81 @@
+from collections import OrderedDict
+from collections.abc import ItemsView, ValuesView
+
+import pytest
+
+from Config import Config, ConfigSection
+from Locales import Locale
+from Utils.DotDict import DotDict
+
+
+class TestDotDict:
+    """
+    Секция: ленивая обертка вложенных словарей DotDict (Utils.DotDict)
+    """
+
+    DATA = {'browser': {'selenoid': {'use_selenoid': False}, 'name': 'chrome'}, 'headless': True}
+
+    def test_nested_wrapped_lazily(self):
+        """
+        Тест ленивой обертки: вложенный словарь оборачивается при первом обращении и кэшируется на месте
+        """
+        ddict = DotDict(self.DATA)
+        assert type(dict.__getitem__(ddict, 'browser')) is dict  # pylint: disable=unidiomatic-typecheck
+        assert ddict.browser.selenoid.use_selenoid is False
+        assert isinstance(dict.__getitem__(ddict, 'browser'), DotDict)
+        assert ddict.browser is ddict['browser'] is ddict.get('browser')
+        assert type(self.DATA['browser']) is dict  # pylint: disable=unidiomatic-typecheck
+
+    def test_mapping_wrapped(self):
+        """
+        Тест обертки любого вложенного отображения (объект с `keys`), в т.ч. наследников dict
+        """
+        ddict = DotDict({'ordered': OrderedDict(a=1), 'nested': DotDict({'b': 2})})
+        assert isinstance(ddict.ordered, DotDict) and ddict.ordered.a == 1
+        assert ddict.nested is dict.__getitem__(ddict, 'nested')
+
+    def test_subclass_children_cached(self):
+        """
+        Тест кэширования обернутых вложенных словарей в наследниках: Config, ConfigSection, Locale
+        """
+        config = Config()
+        assert config.browser is Config().browser is config['browser']
+        assert isinstance(config.browser, ConfigSection)
+        assert config.browser.window.size is config.browser.window.size
+
+        locale = Locale('en')
+        key = next(key for key, value in dict.items(locale) if hasattr(value, 'keys'))
+        assert locale[key] is locale[key] is getattr(locale, key)
+
+    def test_views(self):
+        """
+        Тест values() / items(): живые представления, вложенные словари при обходе обернуты
+        """
+        ddict = DotDict(self.DATA)
+        values, items = ddict.values(), ddict.items()
+        assert isinstance(values, ValuesView) and isinstance(items, ItemsView)
+        assert all(isinstance(value, DotDict) for value in values if hasattr(value, 'keys'))
+        ddict.timeout = 5
+        assert len(values) == len(items) == 3
+        assert ('timeout', 5) in items and 5 in values
+        assert dict(items) == ddict
+
+    def test_missing_key(self):
+        """
+        Тест отсутствующего ключа: AttributeError для hasattr/getattr и KeyError для совместимости
+        """
+        ddict = DotDict(self.DATA)
+        assert not hasattr(ddict, 'missing') and getattr(ddict, 'missing', None) is None
+        with pytest.raises(KeyError):
+            ddict.missing  # pylint: disable=pointless-statement
+
+    def test_freeze(self):
+        """
+        Тест неизменяемой записи freeze(): вложенные словари преобразуются рекурсивно
+        """
+        record = DotDict(self.DATA).freeze()
+        assert record.browser.selenoid.use_selenoid is False and record.headless is True
+        with pytest.raises(AttributeError):
+            record.headless = False  # pylint: disable=assigning-non-slot
+        with pytest.raises(TypeError):
+            DotDict({'not valid': 1}).freeze()
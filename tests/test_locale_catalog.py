@@ -0,0 +1,45 @@
+import json
+from os import path
+
+import pytest
+
+import Utils
+from Utils import LOCALES_PATH, read_compiled_locale, read_file
+
+
+class TestLocaleCatalog:
+    """
+    Секция: скомпилированный каталог файлов локализации (Utils.read_compiled_locale)
+    """
+
+    LOCALE_PATH = path.join(LOCALES_PATH, 'en', 'saymon_en.yaml')
+
+    @pytest.fixture(scope='function', name='catalog')
+    def catalog_path(self, monkeypatch, tmp_path):
+        """
+        Фикстура пустого каталога во временной папке и пустого кэша процесса
+        """
+        monkeypatch.setattr(Utils, 'CATALOG_PATH', str(tmp_path))
+        monkeypatch.setattr(Utils, '_catalog', {})
+        return tmp_path / 'saymon_en.yaml.json'
+
+    def test_compiled_to_json(self, catalog):
+        """
+        Тест компиляции: каталог - JSON с заголовком sha256, повторное чтение возвращает независимую копию
+        """
+        locale_data = read_compiled_locale(self.LOCALE_PATH)
+        header, payload = catalog.read_text(encoding='utf-8').split('\n', 1)
+        assert len(header) == 64 and json.loads(payload) == locale_data == read_file(self.LOCALE_PATH, 'yaml')
+
+        Utils._catalog.clear()  # pylint: disable=protected-access
+        restored = read_compiled_locale(self.LOCALE_PATH)
+        assert restored == locale_data and restored is not read_compiled_locale(self.LOCALE_PATH)
+
+    @pytest.mark.parametrize('content', [b'garbage', b'\xff\xfe\x00', b''], ids=['text', 'binary', 'empty'])
+    def test_corrupt_catalog_recompiled(self, catalog, content):
+        """
+        Тест поврежденного или подмененного файла каталога: файл компилируется заново из .yaml
+        """
+        catalog.write_bytes(content)
+        assert read_compiled_locale(self.LOCALE_PATH) == read_file(self.LOCALE_PATH, 'yaml')
+        assert json.loads(catalog.read_text(encoding='utf-8').split('\n', 1)[1])
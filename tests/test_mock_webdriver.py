@@ -0,0 +1,394 @@
+import asyncio
+import json
+import os
+from time import monotonic
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+
+import Locales
+from Benchmarks.FakeSaymon import mock_saymon
+from Benchmarks.MockWebDriver import MockWebDriver, Node
+from Config import Config, ConfigSection
+from PageObject import BaseMethods, PageObject
+from PageObject.Login import AsyncLoginScreen
+from WebDriver.AsyncWebDriver import AsyncWebDriver
+from WebDriver.Instrumentation import RoundTripBudget
+from WebDriver.SessionPool import SessionPool
+from WebDriver.WaitHistory import MIN_SAMPLES, MIN_THRESHOLD, WaitHistory
+from WebDriver.WebDriver import WebDriver
+
+pytestmark = [pytest.mark.mock_webdriver]
+
+
+class TestMockWebDriver:
+    """
+    Секция: WebDriver без браузера
+    Число команд WebDriver (round trip) на операции WebBase/PageObject на модели DOM Benchmarks.MockWebDriver
+    """
+
+    URL = 'http://saymon.mock/'
+    LOOKUP = 'POST /execute/sync:pageObjectLookup'
+
+    @pytest.fixture(scope='function', name='isolated', autouse=True)
+    def preconditions_isolation(self, monkeypatch, tmp_path):
+        """
+        Фикстура изоляции тестов от рабочего дерева проекта: копия Config (в нее пишется язык ОС), файлы _backup
+        Locale и метрики старта WebDriver - во временной папке теста; язык ОС задан явно (LANG)
+        """
+        monkeypatch.setenv('LANG', 'en_US.UTF-8')
+        data = json.loads(json.dumps(Config()))
+        data['browser']['startup']['metrics_path'] = str(tmp_path / 'startup_metrics.jsonl')
+        config_path = tmp_path / 'config.json'
+        config_path.write_text(json.dumps(data, indent=4, sort_keys=True), encoding='UTF-8')
+        monkeypatch.setattr(Config, '_Config__locate', staticmethod(lambda: str(config_path)))
+        monkeypatch.setattr(Locales, 'LOCALES_PATH', str(tmp_path))
+        monkeypatch.setattr(Locales.Locale, '_Locale__backup_digest', None)
+
+    @pytest.fixture(scope='class', name='mock')
+    def mock_webdriver(self):
+        """
+        Фикстура запуска MockWebDriver с подменным SAYMON UI
+        """
+        with mock_saymon(MockWebDriver()) as mock:
+            yield mock
+
+    @pytest.fixture(scope='function', name='mock_driver')
+    def preconditions_teardown(self, mock):
+        """
+        Фикстура сессии WebDriver в удаленном режиме на MockWebDriver с открытой страницей авторизации
+        """
+        driver = WebDriver(mock.config())
+        driver.open_page(self.URL)
+        mock.reset()
+
+        yield driver
+
+        driver.quit()
+
+    @pytest.fixture(scope='function', name='locale_en')
+    def preconditions_locale(self, locale):
+        """
+        Фикстура локализации PageObject (язык `en`)
+        """
+        locale('en').update_locale('en')
+
+    def test_find_element_round_trips(self, mock, mock_driver):
+        """
+        Тест поиска элемента: на странице с установленными помощниками - один скрипт Scripts.LOOKUP
+        """
+        selector = PageObject(mock_driver).login_screen.SELECTORS['INPUT_FIELD_LOGIN']
+        mock_driver.find_element_by_css_selector(selector)
+        assert mock.commands['POST /execute/sync:pageObjectInstall'] == 1
+        mock.reset()
+        for _ in range(3):
+            mock_driver.find_element_by_css_selector(selector)
+        assert mock.commands[self.LOOKUP] == 3, dict(mock.commands)
+        assert sum(mock.commands.values()) == 3, dict(mock.commands)
+
+    def test_round_trip_budget_report(self, mock_driver):
+        """
+        Тест бюджета команд: при превышении - AssertionError с разбивкой команд по именам
+        """
+        selector = PageObject(mock_driver).login_screen.SELECTORS['INPUT_FIELD_LOGIN']
+        with pytest.raises(AssertionError, match=r'find_login: команд WebDriver \d+ при бюджете 1'):
+            with RoundTripBudget(1, 'find_login'):
+                mock_driver.find_element_by_css_selector(selector)
+                mock_driver.find_element_by_css_selector(selector)
+
+    @pytest.mark.max_roundtrips(20)
+    @pytest.mark.usefixtures('locale_en')
+    def test_set_ui_language_round_trips(self, mock, mock_driver):
+        """
+        Тест бюджета команд LoginScreen.set_ui_language
+        """
+        PageObject(mock_driver).login_screen.set_ui_language('ru')
+        assert mock.storage['local']['lang'] == 'ru'
+
+    @pytest.mark.max_roundtrips(40)
+    @pytest.mark.usefixtures('locale_en')
+    def test_login_logout_round_trips(self, mock_driver):
+        """
+        Тест бюджета команд LoginScreen.login и MainMenuToolbar.logout (логин и пароль вводятся с клавиатуры)
+        """
+        page_object = PageObject(mock_driver)
+        page_object.login_screen.login(Config().saymon_admin_user)
+        assert mock_driver.current_url == f"{self.URL}main"
+        page_object.main_menu_toolbar.logout()
+        assert mock_driver.current_url == self.URL
+
+    def test_stale_element_relocated(self, mock, mock_driver):
+        """
+        Тест WebElement после перезагрузки страницы: ссылка устарела, элемент находится повторно по локатору
+        """
+        login = PageObject(mock_driver).login_screen
+        element = mock_driver.find_element_by_css_selector(login.SELECTORS['INPUT_FIELD_LOGIN'])
+        mock.load(self.URL)
+        element.fill('admin')
+        assert mock.document.first(login.SELECTORS['INPUT_FIELD_LOGIN']).value == 'admin'
+
+    @pytest.mark.parametrize('fast', [None, True], ids=['native', 'fast'])
+    def test_fill_modes(self, mock, mock_driver, fast):
+        """
+        Тест ввода текста: по умолчанию - с клавиатуры (send_keys), fast=True - одним скриптом Scripts.FILL
+        """
+        login = PageObject(mock_driver).login_screen
+        login.fill_text_input_field(login.SELECTORS['INPUT_FIELD_LOGIN'], 'admin', fast=fast)
+        assert mock.document.first(login.SELECTORS['INPUT_FIELD_LOGIN']).value == 'admin'
+        assert bool(mock.commands['POST /execute/sync:pageObjectFill']) is bool(fast), dict(mock.commands)
+        assert bool(mock.commands['POST /element/value']) is not bool(fast), dict(mock.commands)
+
+    def test_typing_after_clear(self, mock, mock_driver):
+        """
+        Тест посимвольного ввода: модификатор CONTROL из очистки поля (Ctrl+A, Delete) отпущен до ввода текста
+        """
+        selector = PageObject(mock_driver).login_screen.SELECTORS['INPUT_FIELD_LOGIN']
+        mock_driver.find_element_by_css_selector(selector).fill('abc', typing_speed_delay=0.001)
+        assert mock.document.first(selector).value == 'abc'
+
+    @pytest.mark.usefixtures('locale_en')
+    @pytest.mark.parametrize('rerender', [False, True], ids=['removed', 'rerendered'])
+    def test_element_disappeared_not_relocated(self, mock, mock_driver, rerender, capsys):
+        """
+        Тест ожидания исчезновения: удаленный или перерисованный под тем же селектором элемент исчез за один шаг
+        поллинга (устаревшая ссылка не ищется заново по локатору); сообщение об ошибке при успехе не формируется
+        """
+        login = PageObject(mock_driver).login_screen
+        selector = login.SELECTORS['INPUT_FIELD_LOGIN']
+
+        def _change(document):
+            node = document.first(selector)
+            if rerender:
+                node.parent.children.insert(
+                    node.parent.children.index(node), Node(node.tag, dict(node.attrs), node.parent)
+                )
+            node.remove()
+
+        mock_driver.find_element_by_css_selector(selector)
+        mock.document.later(0.3, _change)
+        started = monotonic()
+        assert login.wait_until_element_disappeared(selector, timeout=5)
+        assert monotonic() - started < 1
+        assert bool(mock.document.first(selector)) is rerender
+        assert mock.commands['GET /url'] == 0 and 'ДАННЫЕ ОБ ОШИБКЕ' not in capsys.readouterr().out
+
+    @pytest.mark.usefixtures('locale_en')
+    def test_element_disappeared_timeout(self, mock, mock_driver):
+        """
+        Тест ожидания исчезновения по таймауту: сообщение об ошибке с адресом страницы формируется после таймаута
+        """
+        login = PageObject(mock_driver).login_screen
+        with pytest.raises(TimeoutException, match='не исчез за 0.5 секунд'):
+            login.wait_until_element_disappeared(login.SELECTORS['INPUT_FIELD_LOGIN'], timeout=0.5)
+        assert mock.commands['GET /url'] == 1
+
+    def test_adaptive_wait_overrun(self, mock, mock_driver, monkeypatch, tmp_path):
+        """
+        Тест адаптивного ожидания через BaseMethods: элемент, появившийся позже ожидаемого порога из истории, найден
+        (ожидание идет до таймаута вызова), фактическая длительность записана, превышение порога - в отчете
+        """
+        login = PageObject(mock_driver).login_screen
+        selector = '.lang-menu'
+        history = WaitHistory()
+        history.configure(record=True, adaptive=True, history_path=str(tmp_path / 'wait_history.json'))
+        monkeypatch.setattr(BaseMethods, 'WAIT_HISTORY', history)
+        key = history.key(login.__class__.__name__, selector)
+        for _ in range(MIN_SAMPLES):
+            history.record(key, 0.01, found=True)
+
+        mock.document.later(MIN_THRESHOLD * 3, lambda document: document.toggle(selector, state=False))
+        assert login.find_element(selector, timeout=5)
+        entry = history.report()[key]
+        assert (entry['count'], entry['misses'], entry['overruns'], entry['flaky']) == (MIN_SAMPLES + 1, 0, 1, True)
+        assert entry['p99_ms'] >= MIN_THRESHOLD * 3 * 1000
+
+    def test_adaptive_probe_cutoff(self, mock_driver, monkeypatch, tmp_path):
+        """
+        Тест адаптивной пробы через BaseMethods: проверка заголовка без assert прерывается на ожидаемом пороге из
+        истории вместо таймаута вызова, прерывание учтено в отчете отдельно от таймаутов
+        """
+        login = PageObject(mock_driver).login_screen
+        history = WaitHistory()
+        history.configure(record=True, adaptive=True, history_path=str(tmp_path / 'wait_history.json'))
+        monkeypatch.setattr(BaseMethods, 'WAIT_HISTORY', history)
+        key = history.key(login.__class__.__name__, 'title:missing title')
+        for _ in range(MIN_SAMPLES):
+            history.record(key, 0.01, found=True)
+
+        started = monotonic()
+        assert login.check_page_title_exists('missing title', timeout=5, message=' ', alert=False) is False
+        assert monotonic() - started < 1
+        entry = history.report()[key]
+        assert (entry['count'], entry['misses'], entry['cutoffs']) == (MIN_SAMPLES, 0, 1)
+
+    def test_batch_login_form(self, mock, mock_driver):
+        """
+        Тест пакета действий: блочный ввод в поля - один скрипт Scripts.BATCH, клик - команда WebDriver, затем навигация
+        """
+        login = PageObject(mock_driver).login_screen
+        mock_driver.find_element_by_css_selector(login.SELECTORS['INPUT_FIELD_LOGIN'])
+        mock.reset()
+        with login.batch() as batch:
+            batch.fill(login.SELECTORS['INPUT_FIELD_LOGIN'], 'admin', fast=True)
+            batch.fill(login.SELECTORS['INPUT_FIELD_PASSWORD'], 'saymon', fast=True)
+            batch.click(login.SELECTORS['BUTTON_LOGIN'])
+        assert mock.commands['POST /execute/sync:pageObjectBatch'] == 1, dict(mock.commands)
+        assert mock.commands['POST /element/click'] == 1, dict(mock.commands)
+        assert mock_driver.wait_for_element_to_disappear(login.SELECTORS['INPUT_FIELD_LOGIN'])
+        assert mock_driver.current_url == f"{self.URL}main"
+
+    def test_batch_native_fill(self, mock, mock_driver):
+        """
+        Тест пакета действий при выключенном блочном вводе: поля заполняются с клавиатуры командами WebDriver
+        """
+        login = PageObject(mock_driver).login_screen
+        fields = {login.SELECTORS['INPUT_FIELD_LOGIN']: 'admin', login.SELECTORS['INPUT_FIELD_PASSWORD']: 'saymon'}
+        with login.batch() as batch:
+            for selector, text in fields.items():
+                batch.fill(selector, text)
+        assert {selector: mock.document.first(selector).value for selector in fields} == fields
+        assert mock.commands['POST /element/value'] >= len(fields), dict(mock.commands)
+        assert not mock.commands['POST /execute/sync:pageObjectFill'], dict(mock.commands)
+
+    def test_shared_pool_close(self, mock, tmp_path):
+        """
+        Тест закрытия общего пула удаленных сессий: свободные сессии работающего процесса-владельца не закрываются
+        другим процессом, последний процесс закрывает их
+        """
+        data = json.loads(json.dumps(mock.config()))
+        data['browser']['session_pool'].update({'size': 1, 'registry_path': str(tmp_path / 'session_pool.json')})
+        config = ConfigSection(data)
+        worker = SessionPool(config)
+        worker.lessee = f"gw1:{os.getppid()}"
+        worker.warm_up()
+        mock.reset()
+
+        SessionPool(config).close()
+        assert not mock.commands['DELETE /'], dict(mock.commands)
+        worker.close()
+        assert mock.commands['DELETE /'] == 1, dict(mock.commands)
+        with open(config.browser.session_pool.registry_path, 'rt', encoding='utf-8') as file:
+            assert not json.load(file)
+
+    def test_absence_probes(self, mock, mock_driver):
+        """
+        Тест проверок отсутствия: exists_now - одна команда WebDriver, absent_within - одна команда на окно
+        стабильности, появившийся в окне элемент дает ответ сразу
+        """
+        missing, dropdown = '.errors-info', '.lang-menu'
+        mock_driver.find_element_by_css_selector(PageObject(mock_driver).login_screen.SELECTORS['INPUT_FIELD_LOGIN'])
+        mock.reset()
+        assert mock_driver.exists_now(missing) is None
+        assert sum(mock.commands.values()) == 1, dict(mock.commands)
+        assert mock_driver.absent_within(missing, window=0.2)
+        assert sum(mock.commands.values()) == 2, dict(mock.commands)
+
+        mock.document.later(0.1, lambda document: document.toggle(dropdown, state=False))
+        started = monotonic()
+        assert not mock_driver.absent_within(dropdown, window=5)
+        assert monotonic() - started < 1
+
+    @pytest.mark.usefixtures('locale_en')
+    def test_async_login(self, mock, mock_driver):
+        """
+        Тест AsyncLoginScreen на сессии, подключенной к WebDriver (AsyncWebDriver.attach): поиск, ввод, клик,
+        ожидание заголовка и исчезновения элемента
+        """
+        driver = AsyncWebDriver.attach(mock_driver)
+        login = AsyncLoginScreen(driver)
+        selector = login.SELECTORS['INPUT_FIELD_LOGIN']
+
+        async def _flow():
+            await login.fill_text_input_field(selector, 'draft')
+            assert await (await login.find_element(selector)).get_attribute('value') == 'draft'
+            mock.document.later(0.3, lambda document: document.first(selector).remove())
+            assert await login.wait_until_element_disappeared(selector, timeout=5)
+            await driver.open_page(self.URL)
+            await login.login(Config().saymon_admin_user)
+            return await driver.current_url()
+
+        assert asyncio.run(_flow()) == f"{self.URL}main"
+        assert mock.commands['POST /element/click'] and mock.commands['POST /element/value'], dict(mock.commands)
+
+    def test_async_error_response(self, mock_driver):
+        """
+        Тест ответа WebDriver с ошибкой: код ошибки W3C преобразуется в исключение selenium
+        """
+        driver = AsyncWebDriver.attach(mock_driver)
+        with pytest.raises(NoSuchElementException):
+            asyncio.run(driver.execute('POST', '/element', {'using': 'css selector', 'value': '.missing'}))
+        with pytest.raises(StaleElementReferenceException):
+            asyncio.run(driver.execute('GET', '/element/missing/text'))
+
+    def test_async_sessions_concurrent(self, mock, monkeypatch):
+        """
+        Тест двух сессий в одном event loop: команды сессий выполняются параллельно (время - как у одной сессии)
+        """
+        latency, steps = 0.1, 4
+
+        async def _steps(driver: AsyncWebDriver) -> list[str]:
+            return [await driver.title() for _ in range(steps)]
+
+        async def _flow():
+            drivers = await asyncio.gather(*(AsyncWebDriver.new_session(mock.url, {}) for _ in range(2)))
+            await drivers[0].open_page(self.URL)
+            monkeypatch.setattr(mock, 'latency', latency)
+            started = monotonic()
+            titles = await asyncio.gather(*(_steps(driver) for driver in drivers))
+            elapsed = monotonic() - started
+            monkeypatch.setattr(mock, 'latency', 0.0)
+            await asyncio.gather(*(driver.quit() for driver in drivers))
+            return drivers, titles, elapsed
+
+        drivers, titles, elapsed = asyncio.run(_flow())
+        assert drivers[0].session_id != drivers[1].session_id
+        assert titles[0] == titles[1] == [mock.document.title] * steps
+        assert elapsed < latency * steps * 1.5
+
+    @pytest.mark.parametrize(
+        'text, match_case, match_words, expected',
+        [
+            ('OBJECT-3 ok', False, False, 'object-3 OK 21%'),
+            ('OBJECT-3 ok', True, False, None),
+            ('object-3 OK', False, True, None),
+            ('object-3 ok 21%', False, True, 'object-3 OK 21%'),
+        ],
+        ids=['contains', 'case', 'words-partial', 'words'],
+    )
+    def test_table_search_match_modes(self, mock, mock_driver, text, match_case, match_words, expected):
+        """
+        Тест поиска строки таблицы в браузере: учет регистра и полного совпадения - одной командой WebDriver
+        """
+        mock_driver.open_page(f"{self.URL}main")
+        mock.reset()
+        found = mock_driver.find_element_in_table_by_text('table.objects tr', text, match_case, match_words)
+        assert (found.text if found else None) == expected
+        assert mock.commands['POST /execute/sync:pageObjectTableSearch'] == 1, dict(mock.commands)
+
+    def test_table_search_in_element(self, mock_driver):
+        """
+        Тест поиска строки таблицы внутри WebElement: ищутся только потомки элемента
+        """
+        mock_driver.open_page(f"{self.URL}main")
+        row = mock_driver.find_element_in_table_by_text('table.objects tr', 'object-5 OK')
+        assert row.find_element_in_table_by_text('td', 'ok', match_words=True).text == 'OK'
+        assert row.find_element_in_table_by_text('td', 'object-5').text == 'object-5'
+        assert row.find_element_in_table_by_text('td', 'object-6') is None
+        assert mock_driver.find_element_in_table_by_text('td', 'object-6').text == 'object-6'
+
+    def test_table_search_index_invalidated(self, mock, mock_driver):
+        """
+        Тест индекса строк таблицы: тексты строк кэшируются до изменения DOM, после изменения индекс строится заново
+        """
+        selector = 'table.objects tr'
+        mock_driver.open_page(f"{self.URL}main")
+        assert mock_driver.find_element_in_table_by_text(selector, 'object-7 OK', index=True)
+        entry = mock.document.table_index[selector]
+        assert mock_driver.find_element_in_table_by_text(selector, 'object-8 OK', index=True)
+        assert mock.document.table_index[selector] is entry
+
+        mock.document.select(selector)[7].elements[0].set_text('renamed')
+        mock.document.changed()
+        assert mock_driver.find_element_in_table_by_text(selector, 'renamed OK', index=True).text == 'renamed OK 49%'
+        assert mock.document.table_index[selector] is not entry
+        assert mock_driver.find_element_in_table_by_text(selector, 'object-7 OK', index=True) is None
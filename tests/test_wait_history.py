@@ -0,0 +1,66 @@
+import pytest
+
+from WebDriver.WaitHistory import CUTOFF_EXPLORE, HEADROOM, MIN_SAMPLES, MIN_THRESHOLD, WaitHistory
+from WebDriver.WebBase import BACKOFF_START, TIMEOUT_STEP
+
+
+class TestWaitHistory:
+    """
+    Секция: адаптивные таймауты ожиданий по истории их длительности (WebDriver.WaitHistory)
+    """
+
+    KEY = WaitHistory.key('LoginScreen', 'div.bounce')
+
+    @pytest.fixture(scope='function', name='history')
+    def wait_history(self, tmp_path):
+        """
+        Фикстура истории ожиданий в пустом временном файле (запись и адаптивные пороги включены)
+        """
+        history = WaitHistory()
+        history.configure(record=True, adaptive=True, history_path=str(tmp_path / 'wait_history.json'))
+        return history
+
+    def test_limits_from_history(self, history):
+        """
+        Тест лимитов: без истории - таймаут вызова, с историей - поллинг из медианы, ранний отказ из p99 только для проб
+        """
+        assert history.limits(self.KEY, 0.5, probe=True) == (0.5, TIMEOUT_STEP)
+        for _ in range(MIN_SAMPLES):
+            history.record(self.KEY, 0.02, found=True)
+        assert history.limits(self.KEY, 15) == (15, BACKOFF_START)
+        assert history.limits(self.KEY, 15, probe=True) == (MIN_THRESHOLD, BACKOFF_START)
+        assert history.limits(self.KEY, 0.1, probe=True) == (0.1, BACKOFF_START)
+
+    def test_probe_cutoff_explores(self, history):
+        """
+        Тест роста порога проб: каждая CUTOFF_EXPLORE-я проба идет до таймаута вызова, позднее срабатывание
+        поднимает порог
+        """
+        for _ in range(MIN_SAMPLES):
+            history.record(self.KEY, 0.02, found=True)
+        limits = [history.limits(self.KEY, 15, probe=True)[0] for _ in range(CUTOFF_EXPLORE)]
+        assert limits == [MIN_THRESHOLD] * (CUTOFF_EXPLORE - 1) + [15]
+        for _ in limits[:-1]:
+            history.record(self.KEY, MIN_THRESHOLD, found=False, cutoff=True)
+        history.record(self.KEY, 1.0, found=True)
+
+        entry = history.report()[self.KEY]
+        assert (entry['misses'], entry['cutoffs'], entry['overruns']) == (0, CUTOFF_EXPLORE - 1, 1)
+        assert history.limits(self.KEY, 15, probe=True)[0] == 1.0 * HEADROOM
+
+    def test_history_persisted_and_flaky(self, history):
+        """
+        Тест сохранения истории между запусками и отметки медленного нестабильного ключа
+        """
+        samples = [0.1] * MIN_SAMPLES + [3.0]
+        for duration in samples:
+            history.record(self.KEY, duration, found=True)
+        history.record(self.KEY, 15, found=False)
+        history.save()
+
+        restored = WaitHistory()
+        restored.configure(record=True, adaptive=False, history_path=history.history_path)
+        entry = restored.report()[self.KEY]
+        assert (entry['count'], entry['misses'], entry['flaky']) == (len(samples), 1, True)
+        assert restored.flaky()[0].startswith(self.KEY)
+        assert restored.limits(self.KEY, 15) == (15, TIMEOUT_STEP)